@@ -1,3 +1,4 @@
 """__init__.py."""
 from .api.osoenergy_async_api import OSOEnergyApiAsync as API  # noqa: F401
 from .osoenergy import OSOEnergy  # noqa: F401
+from .sync_client import OSOEnergySyncClient  # noqa: F401
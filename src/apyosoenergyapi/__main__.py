@@ -0,0 +1,207 @@
+"""OSO Energy command line poller and benchmarks.
+
+Usage:
+    python -m apyosoenergyapi --key KEY poll --interval 30 --changes
+    python -m apyosoenergyapi --key KEY poll --profile collapsed --profile-cycles 20
+    python -m apyosoenergyapi bench latency --stand-in 100 --duration 10
+    python -m apyosoenergyapi --key KEY proxy --port 8080
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import timedelta
+
+from aiohttp import ClientSession
+
+from . import benchmark
+from .osoenergy import OSOEnergy
+from .proxy import OSOEnergyProxy
+
+
+def _emit(record: dict):
+    """Write one NDJSON record to stdout."""
+    sys.stdout.write(json.dumps(record, separators=(",", ":"), default=str) + "\n")
+    sys.stdout.flush()
+
+
+async def poll(args: argparse.Namespace) -> int:
+    """Poll the API and stream device payloads as NDJSON.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+
+    Returns:
+        int: Exit code.
+    """
+    async with ClientSession() as websession:
+        session = OSOEnergy(args.key, websession)
+        if args.base_url:
+            session.api.update_base_url(args.base_url)
+
+        if args.profile:
+            session.profiler.directory = args.profile_dir
+            session.profiler.start(cycles=args.profile_cycles, mode=args.profile)
+
+        previous = {}
+        cycle = 0
+        while args.count is None or cycle < args.count:
+            started = time.perf_counter()
+            successful = await session.get_devices()
+            elapsed = time.perf_counter() - started
+
+            if not successful:
+                _emit({"time": time.time(), "event": "poll_failed", "latency_ms": elapsed * 1000})
+            else:
+                devices = session.data.devices
+                for device_id, device in devices.items():
+                    if not args.changes or previous.get(device_id) != device:
+                        _emit({"time": time.time(), "event": "device", "device_id": device_id, "device": device})
+                for device_id in previous.keys() - devices.keys():
+                    _emit({"time": time.time(), "event": "removed", "device_id": device_id})
+                previous = devices
+
+            cycle += 1
+            if args.count is None or cycle < args.count:
+                await asyncio.sleep(max(0.0, args.interval - elapsed))
+
+        if session.profiler.active:
+            session.profiler.stop()
+
+    return 0
+
+
+async def bench(args: argparse.Namespace) -> int:
+    """Run a fixed benchmark and print the result as JSON.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+
+    Returns:
+        int: Exit code.
+    """
+    server = None
+    base_url = args.base_url
+    if args.stand_in is not None and args.mode != "projection":
+        server = benchmark.StandInServer(device_count=args.stand_in, latency=args.latency)
+        base_url = await server.start()
+
+    try:
+        if args.mode == "startup":
+            result = await benchmark.startup_latency(base_url, args.key, rounds=args.rounds)
+        elif args.mode == "projection":
+            result = await benchmark.attribute_projection(args.devices, rounds=args.rounds)
+        elif args.mode == "poll":
+            result = await benchmark.poll_cost(base_url, args.key, rounds=args.rounds)
+        else:
+            result = await benchmark.request_latency(
+                base_url,
+                args.key,
+                duration=args.duration,
+                concurrency=1 if args.mode == "latency" else args.concurrency,
+            )
+    finally:
+        if server is not None:
+            await server.stop()
+
+    result.update({"mode": args.mode, "base_url": base_url})
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+async def proxy(args: argparse.Namespace) -> int:
+    """Serve a caching proxy until interrupted.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+
+    Returns:
+        int: Exit code.
+    """
+    async with ClientSession() as websession:
+        session = OSOEnergy(args.key, websession)
+        if args.base_url:
+            session.api.update_base_url(args.base_url)
+        await session.update_interval(timedelta(seconds=args.interval))
+
+        server = OSOEnergyProxy(session, host=args.host, port=args.port)
+        base_url = await server.start()
+        _emit({"time": time.time(), "event": "proxy_started", "base_url": base_url})
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop()
+
+    return 0
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    """Parse command line arguments.
+
+    Args:
+        argv (list[str], optional): Arguments to parse. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(prog="python -m apyosoenergyapi")
+    parser.add_argument(
+        "--key",
+        default=os.environ.get("OSO_SUBSCRIPTION_KEY", "benchmark"),
+        help="Subscription key, defaults to $OSO_SUBSCRIPTION_KEY",
+    )
+    parser.add_argument("--base-url", default=None, help="Override the API base url")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    poll_parser = commands.add_parser("poll", help="Stream device payloads as NDJSON")
+    poll_parser.add_argument("--interval", type=float, default=30.0, help="Seconds between polls")
+    poll_parser.add_argument("--count", type=int, default=None, help="Stop after this many polls")
+    poll_parser.add_argument("--changes", action="store_true", help="Only emit changed devices")
+    poll_parser.add_argument("--profile", choices=["pstats", "collapsed"], default=None, help="Profile the poll cycles")
+    poll_parser.add_argument("--profile-cycles", type=int, default=10, help="Poll cycles to profile")
+    poll_parser.add_argument("--profile-dir", default=".", help="Directory for profile files")
+    poll_parser.set_defaults(handler=poll)
+
+    bench_parser = commands.add_parser("bench", help="Run a benchmark and print JSON")
+    bench_parser.add_argument("mode", choices=["latency", "load", "startup", "poll", "projection"])
+    bench_parser.add_argument("--duration", type=float, default=10.0, help="Seconds for latency/load")
+    bench_parser.add_argument("--concurrency", type=int, default=10, help="Requests in flight for load")
+    bench_parser.add_argument("--rounds", type=int, default=20, help="Rounds for startup/poll")
+    bench_parser.add_argument(
+        "--stand-in", type=int, default=None, metavar="DEVICES",
+        help="Serve DEVICES heaters from a local stand-in instead of --base-url",
+    )
+    bench_parser.add_argument("--latency", type=float, default=0.0, help="Stand-in response delay")
+    bench_parser.add_argument("--devices", type=int, default=100, help="Heaters for projection")
+    bench_parser.set_defaults(handler=bench)
+
+    proxy_parser = commands.add_parser("proxy", help="Serve cached devices to local consumers")
+    proxy_parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    proxy_parser.add_argument("--port", type=int, default=8080, help="Port to bind")
+    proxy_parser.add_argument("--interval", type=float, default=30.0, help="Seconds between upstream polls")
+    proxy_parser.set_defaults(handler=proxy)
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] = None) -> int:
+    """Run the command line interface.
+
+    Args:
+        argv (list[str], optional): Arguments to parse. Defaults to sys.argv.
+
+    Returns:
+        int: Exit code.
+    """
+    args = parse_args(argv)
+    try:
+        return asyncio.run(args.handler(args))
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,30 @@
 """OSO Energy API Module."""
 
+import asyncio
+import json
 import operator
 from typing import Optional
 from numpy import number
 
 import urllib3
-from aiohttp import ClientResponse, ClientSession
+from aiohttp import ClientSession, ClientTimeout
 from aiohttp.web_exceptions import HTTPError
 
 from ..helper.const import HTTP_UNAUTHORIZED, HTTP_FORBIDDEN
+from ..helper.deadline import deadline, remaining
+from ..helper.offload import decode_json
 from ..helper.osoenergy_exceptions import NoSubscriptionKey
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
+def _to_list(value):
+    """Serialise arrays and profiles in request bodies."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
 class OSOEnergyApiAsync:
     """OSO Energy API Code."""
 
@@ -23,32 +34,85 @@ class OSOEnergyApiAsync:
             websession: Optional[ClientSession] = None):
         """Init the api."""
         self.base_url = "https://api.osoenergy.no/water-heater-api"
-        self.urls = {
-            "devices": self.base_url + "/1/Device/All",
-            "turn_on": self.base_url + "/1/Device/{0}/TurnOn?fullUtilizationParam={1}",
-            "turn_off": self.base_url + "/1/Device/{0}/TurnOff?fullUtilizationParam={1}",
-            "profile": self.base_url + "/1/Device/{0}/Profile",
-            "optimization_mode": self.base_url + "/1/Device/{0}/OptimizationMode",
-            "set_v40_min": self.base_url + "/1/Device/{0}/V40Min/{1}",
-            "enable_holiday_mode": self.base_url + "/1/Device/{0}/HolidayMode/{1}/{2}",
-            "disable_holiday_mode": self.base_url + "/1/Device/{0}/HolidayMode",
-            "user": self.base_url + "/1/User/Details"
+        self.paths = {
+            "devices": "/1/Device/All",
+            "turn_on": "/1/Device/{0}/TurnOn?fullUtilizationParam={1}",
+            "turn_off": "/1/Device/{0}/TurnOff?fullUtilizationParam={1}",
+            "profile": "/1/Device/{0}/Profile",
+            "optimization_mode": "/1/Device/{0}/OptimizationMode",
+            "set_v40_min": "/1/Device/{0}/V40Min/{1}",
+            "enable_holiday_mode": "/1/Device/{0}/HolidayMode/{1}/{2}",
+            "disable_holiday_mode": "/1/Device/{0}/HolidayMode",
+            "user": "/1/User/Details"
         }
+        self.urls = {}
+        self.update_base_url(self.base_url)
         self.headers = {
             "content-type": "application/json",
             "Accept": "*/*"
         }
         self.timeout = 10
+        self.connect_timeout = 5
+        # Endpoint name to (connect, read) seconds, overriding the defaults.
+        self.timeouts = {}
         self.json_return = {
             "original": "No response to OSO Energy API request",
             "parsed": "No response to OSO Energy API request",
         }
         self.session = osoenergy_session
+        self.owns_websession = websession is None
         self.websession = ClientSession() if websession is None else websession
 
-    async def request(self, method: str, url: str, **kwargs) -> ClientResponse:
-        """Make a request."""
+    def update_base_url(self, base_url: str):
+        """Point the api at a different host, e.g. a local stand-in or proxy.
+
+        Args:
+            base_url (str): Base url without a trailing slash.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.urls = {name: self.base_url + path for name, path in self.paths.items()}
+
+    def deadline(self, seconds: float = None):
+        """Limit every call made inside the block to a latency budget.
+
+        Args:
+            seconds (float, optional): Budget in seconds. Defaults to None.
+
+        Returns:
+            contextmanager: Deadline context, see `helper.deadline`.
+        """
+        return deadline(seconds)
+
+    def client_timeout(self, endpoint: str = None) -> ClientTimeout:
+        """Build the aiohttp timeout for a call.
+
+        Args:
+            endpoint (str, optional): Name of the endpoint in `paths`. Defaults to None.
+
+        Raises:
+            asyncio.TimeoutError: The current deadline has already passed.
+
+        Returns:
+            ClientTimeout: Connect and read timeouts, capped by the deadline.
+        """
+        connect, read = self.timeouts.get(endpoint, (self.connect_timeout, self.timeout))
+        total = connect + read
+        left = remaining()
+        if left is not None:
+            if left <= 0:
+                raise asyncio.TimeoutError
+            total = min(total, left)
+
+        return ClientTimeout(total=total, sock_connect=connect, sock_read=read)
+
+    async def request(self, method: str, url: str, **kwargs) -> dict:
+        """Make a request.
+
+        Each call gets its own result so requests can run concurrently;
+        `json_return` always holds the most recent one.
+        """
         data = kwargs.get("data", None)
+        timeout = self.client_timeout(kwargs.get("endpoint", None))
 
         if not self.session.subscription_key:
             raise NoSubscriptionKey
@@ -58,15 +122,25 @@ class OSOEnergyApiAsync:
         )
 
         async with self.websession.request(
-            method, url, headers=self.headers, data=data
+            method, url, headers=self.headers, data=data, timeout=timeout
         ) as resp:
-            await resp.json(content_type=None)
-
-            self.json_return.update({"original": resp.status})
-            self.json_return.update({"parsed": await resp.json(content_type=None)})
+            body = await resp.read()
+
+        threshold = self.session.config.offload_threshold
+        if threshold is not None and len(body) >= threshold:
+            parsed = await self.session.offload(decode_json, body, size=len(body))
+        else:
+            parsed = decode_json(body)
+
+        json_return = {
+            "original": resp.status,
+            "parsed": parsed,
+            "size": len(body),
+        }
+        self.json_return = json_return
 
         if operator.contains(str(resp.status), "20"):
-            return True
+            return json_return
 
         if resp.status == HTTP_UNAUTHORIZED:
             self.session.logger.error(
@@ -84,65 +158,64 @@ class OSOEnergyApiAsync:
                 f"HTTP status is - {resp.status}"
             )
 
-        return False
+        return json_return
 
     async def get_user_details(self):
         """Get user details."""
         url = self.urls["user"]
         try:
-            await self.request("get", url)
-        except (OSError, RuntimeError, ZeroDivisionError) as exception:
+            json_return = await self.request("get", url, endpoint="user")
+        except (OSError, RuntimeError, ZeroDivisionError, asyncio.TimeoutError) as exception:
             raise HTTPError from exception
 
-        return self.json_return
+        return json_return
 
     async def get_devices(self):
         """Call the get devices endpoint."""
         url = self.urls["devices"]
         try:
-            await self.request("get", url)
-        except (OSError, RuntimeError, ZeroDivisionError) as exception:
+            json_return = await self.request("get", url, endpoint="devices")
+        except (OSError, RuntimeError, ZeroDivisionError, asyncio.TimeoutError) as exception:
             raise HTTPError from exception
 
-        return self.json_return
+        return json_return
 
     async def turn_on(self, device_id: str, full_utilization: bool):
         """Call the get V40 Min endpoint."""
         url = self.urls["turn_on"].format(device_id, full_utilization)
         try:
-            await self.request("post", url)
-        except (OSError, RuntimeError, ZeroDivisionError) as exception:
+            json_return = await self.request("post", url, endpoint="turn_on")
+        except (OSError, RuntimeError, ZeroDivisionError, asyncio.TimeoutError) as exception:
             raise HTTPError from exception
 
-        return self.json_return
+        return json_return
 
     async def turn_off(self, device_id: str, full_utilization: bool):
         """Call the get V40 Min endpoint."""
         url = self.urls["turn_off"].format(device_id, full_utilization)
         try:
-            await self.request("post", url)
-        except (OSError, RuntimeError, ZeroDivisionError) as exception:
+            json_return = await self.request("post", url, endpoint="turn_off")
+        except (OSError, RuntimeError, ZeroDivisionError, asyncio.TimeoutError) as exception:
             raise HTTPError from exception
 
-        return self.json_return
+        return json_return
 
-    async def set_profile(self, device_id: str, **kwargs):
-        """Call the get V40 Min endpoint."""
-        jsc = (
-            "{"
-            + ",".join(
-                ('"' + str(i) + '": ' + str(t) for i, t in kwargs.items())
-            )
-            + "}"
-        )
+    async def set_profile(self, device_id: str, data: str = None, **kwargs):
+        """Call the set profile endpoint.
+
+        Args:
+            device_id (str): The id of the device.
+            data (str, optional): Pre-serialised request body. Defaults to None.
+        """
+        jsc = data if data is not None else json.dumps(kwargs, default=_to_list)
 
         url = self.urls["profile"].format(device_id)
         try:
-            await self.request("put", url, data=jsc)
-        except (OSError, RuntimeError, ZeroDivisionError) as exception:
+            json_return = await self.request("put", url, data=jsc, endpoint="profile")
+        except (OSError, RuntimeError, ZeroDivisionError, asyncio.TimeoutError) as exception:
             raise HTTPError from exception
 
-        return self.json_return
+        return json_return
 
     async def set_optimization_mode(self, device_id: str, **kwargs):
         """Call the get V40 Min endpoint."""
@@ -155,38 +228,38 @@ class OSOEnergyApiAsync:
         )
         url = self.urls["optimization_mode"].format(device_id)
         try:
-            await self.request("put", url, data=jsc)
-        except (OSError, RuntimeError, ZeroDivisionError) as exception:
+            json_return = await self.request("put", url, data=jsc, endpoint="optimization_mode")
+        except (OSError, RuntimeError, ZeroDivisionError, asyncio.TimeoutError) as exception:
             raise HTTPError from exception
 
-        return self.json_return
+        return json_return
 
     async def set_v40_min(self, device_id: str, v40_min: number):
         """Call the get V40 Min endpoint."""
         url = self.urls["set_v40_min"].format(device_id, v40_min)
         try:
-            await self.request("put", url)
-        except (OSError, RuntimeError, ZeroDivisionError) as exception:
+            json_return = await self.request("put", url, endpoint="set_v40_min")
+        except (OSError, RuntimeError, ZeroDivisionError, asyncio.TimeoutError) as exception:
             raise HTTPError from exception
 
-        return self.json_return
+        return json_return
 
     async def enable_holiday_mode(self, device_id: str, start_date: str, end_date: str):
         """Enable holiday mode."""
         url = self.urls["enable_holiday_mode"].format(device_id, start_date, end_date)
         try:
-            await self.request("post", url)
-        except (OSError, RuntimeError, ZeroDivisionError) as exception:
+            json_return = await self.request("post", url, endpoint="enable_holiday_mode")
+        except (OSError, RuntimeError, ZeroDivisionError, asyncio.TimeoutError) as exception:
             raise HTTPError from exception
 
-        return self.json_return
+        return json_return
     
     async def disable_holiday_mode(self, device_id: str):
         """Disable holiday mode."""
         url = self.urls["disable_holiday_mode"].format(device_id)
         try:
-            await self.request("delete", url)
-        except (OSError, RuntimeError, ZeroDivisionError) as exception:
+            json_return = await self.request("delete", url, endpoint="disable_holiday_mode")
+        except (OSError, RuntimeError, ZeroDivisionError, asyncio.TimeoutError) as exception:
             raise HTTPError from exception
 
-        return self.json_return
\ No newline at end of file
+        return json_return
\ No newline at end of file
@@ -0,0 +1,331 @@
+"""OSO Energy Benchmark Module."""
+
+import asyncio
+import statistics
+import time
+
+from aiohttp import ClientSession, web
+
+from .osoenergy import OSOEnergy
+
+
+def make_devices(count: int) -> list[dict]:
+    """Build synthetic `/1/Device/All` payloads.
+
+    Args:
+        count (int): Number of water heaters to generate.
+
+    Returns:
+        list: Device payloads shaped like the OSO Energy API.
+    """
+    devices = []
+    for index in range(count):
+        devices.append({
+            "deviceId": f"bench-{index:05d}",
+            "deviceName": f"Heater {index}",
+            "deviceType": "SAGA S300",
+            "connectionState": {"connectionState": "Connected"},
+            "control": {
+                "heater": "on",
+                "mode": "auto",
+                "currentTemperature": 60.0,
+                "targetTemperature": 65.0,
+                "targetTemperatureLow": 10.0,
+                "targetTemperatureHigh": 75.0,
+                "minTemperature": 10.0,
+                "maxTemperature": 75.0,
+                "currentTemperatureLow": 40.0,
+                "currentTemperatureTop": 62.0,
+            },
+            "data": {
+                "tappingCapacitykWh": 8.5,
+                "capacityMixedWater40": 250.0,
+                "actualLoadKwh": 2.9,
+            },
+            "powerConsumption": 3.0,
+            "volume": 300.0,
+            "v40Min": 200.0,
+            "v40LevelMin": 150.0,
+            "v40LevelMax": 350.0,
+            "profile": [60.0] * 24,
+            "optimizationOption": "off",
+            "optimizationSubOption": None,
+            "isInPowerSave": False,
+            "isInExtraEnergy": False,
+        })
+    return devices
+
+
+class StandInServer:
+    """Local stand-in for the OSO Energy API.
+
+    Serves the same paths and JSON shapes as the real service so sessions
+    can be benchmarked without touching production.
+    """
+
+    def __init__(
+        self,
+        device_count: int = 1,
+        latency: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """Initialise the stand-in server.
+
+        Args:
+            device_count (int, optional): Number of heaters to serve. Defaults to 1.
+            latency (float, optional): Seconds to delay every response. Defaults to 0.0.
+            host (str, optional): Interface to bind. Defaults to "127.0.0.1".
+            port (int, optional): Port to bind, 0 picks a free one. Defaults to 0.
+        """
+        self.devices = make_devices(device_count)
+        self.latency = latency
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self.runner = None
+        self.base_url = None
+
+    async def _respond(self, payload) -> web.Response:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return web.json_response(payload)
+
+    async def _devices(self, request: web.Request) -> web.Response:
+        return await self._respond(self.devices)
+
+    async def _user(self, request: web.Request) -> web.Response:
+        return await self._respond({"email": "benchmark@example.com"})
+
+    async def _command(self, request: web.Request) -> web.Response:
+        return await self._respond({})
+
+    async def start(self) -> str:
+        """Start serving.
+
+        Returns:
+            str: Base url to pass to `API.update_base_url`.
+        """
+        app = web.Application()
+        app.router.add_get("/1/Device/All", self._devices)
+        app.router.add_get("/1/User/Details", self._user)
+        app.router.add_route("*", "/1/Device/{tail:.*}", self._command)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, self.host, self.port)
+        await site.start()
+        port = self.runner.addresses[0][1]
+        self.base_url = f"http://{self.host}:{port}"
+        return self.base_url
+
+    async def stop(self):
+        """Stop serving."""
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+
+def summarize(samples: list[float]) -> dict:
+    """Summarise latency samples.
+
+    Args:
+        samples (list[float]): Durations in seconds.
+
+    Returns:
+        dict: Count and millisecond percentiles.
+    """
+    if not samples:
+        return {"count": 0}
+
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "min_ms": ordered[0] * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": ordered[int(0.50 * (len(ordered) - 1))] * 1000,
+        "p95_ms": ordered[int(0.95 * (len(ordered) - 1))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def _new_session(websession: ClientSession, base_url: str, subscription_key: str) -> OSOEnergy:
+    """Create a session pointed at a base url."""
+    session = OSOEnergy(subscription_key, websession)
+    if base_url:
+        session.api.update_base_url(base_url)
+    return session
+
+
+async def startup_latency(
+    base_url: str,
+    subscription_key: str = "benchmark",
+    rounds: int = 20,
+    config: dict = None,
+) -> dict:
+    """Measure `start_session` latency against a base url.
+
+    Args:
+        base_url (str): API base url, e.g. a `StandInServer`.
+        subscription_key (str, optional): Key to send. Defaults to "benchmark".
+        rounds (int, optional): Number of sessions to start. Defaults to 20.
+        config (dict, optional): Extra `start_session` configuration. Defaults to None.
+
+    Returns:
+        dict: Latency summary.
+    """
+    samples = []
+    async with ClientSession() as websession:
+        for _ in range(rounds):
+            session = _new_session(websession, base_url, subscription_key)
+            started = time.perf_counter()
+            await session.start_session({"api_key": subscription_key, **(config or {})})
+            samples.append(time.perf_counter() - started)
+
+    return summarize(samples)
+
+
+async def request_latency(
+    base_url: str,
+    subscription_key: str = "benchmark",
+    duration: float = 10.0,
+    concurrency: int = 1,
+) -> dict:
+    """Measure `/1/Device/All` latency and throughput for a fixed duration.
+
+    With a concurrency of 1 this is a latency benchmark, higher values turn it
+    into a load benchmark.
+
+    Args:
+        base_url (str): API base url, e.g. a `StandInServer`.
+        subscription_key (str, optional): Key to send. Defaults to "benchmark".
+        duration (float, optional): Seconds to run for. Defaults to 10.0.
+        concurrency (int, optional): Requests in flight. Defaults to 1.
+
+    Returns:
+        dict: Latency summary, throughput and failures.
+    """
+    samples = []
+    failures = 0
+
+    async with ClientSession() as websession:
+        session = _new_session(websession, base_url, subscription_key)
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            nonlocal failures
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                if await session.get_devices():
+                    samples.append(time.perf_counter() - started)
+                else:
+                    failures += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    result = summarize(samples)
+    result.update({
+        "concurrency": concurrency,
+        "duration_s": elapsed,
+        "requests_per_s": len(samples) / elapsed if elapsed else 0.0,
+        "failures": failures,
+    })
+    return result
+
+
+async def poll_cost(
+    base_url: str,
+    subscription_key: str = "benchmark",
+    rounds: int = 20,
+) -> dict:
+    """Measure the cost of one poll cycle split into fetch and entity build.
+
+    Args:
+        base_url (str): API base url, e.g. a `StandInServer`.
+        subscription_key (str, optional): Key to send. Defaults to "benchmark".
+        rounds (int, optional): Number of poll cycles. Defaults to 20.
+
+    Returns:
+        dict: Latency summaries for `get_devices` and `create_devices`.
+    """
+    fetch = []
+    build = []
+
+    async with ClientSession() as websession:
+        session = _new_session(websession, base_url, subscription_key)
+        for _ in range(rounds):
+            started = time.perf_counter()
+            await session.get_devices()
+            fetched = time.perf_counter()
+            await session.create_devices()
+            fetch.append(fetched - started)
+            build.append(time.perf_counter() - fetched)
+
+    return {
+        "devices": len(session.data.devices),
+        "get_devices": summarize(fetch),
+        "create_devices": summarize(build),
+    }
+
+
+LEGACY_GETTERS = {
+    "available": "online_offline",
+    "power_load": "get_power_consumption",
+    "volume": "get_volume",
+    "tapping_capacity": "get_tapping_capacity",
+    "capacity_mixed_water_40": "get_capacity_mixed_water_40",
+    "actual_load_kwh": "get_actual_load_kwh",
+    "heater_state": "get_heater_state",
+    "heater_mode": "get_heater_mode",
+    "current_temperature": "get_current_temperature",
+    "target_temperature": "get_target_temperature",
+    "target_temperature_low": "get_target_temperature_low",
+    "target_temperature_high": "get_target_temperature_high",
+    "min_temperature": "get_min_temperature",
+    "max_temperature": "get_max_temperature",
+    "optimization_mode": "get_optimization_mode",
+    "v40_min": "get_v40_min",
+    "v40_level_min": "get_v40_level_min",
+    "v40_level_max": "get_v40_level_max",
+    "profile": "get_profile",
+    "isInPowerSave": "get_power_save_bool",
+}
+
+
+async def attribute_projection(device_count: int = 100, rounds: int = 20) -> dict:
+    """Compare the per-getter attribute path with the compiled projection.
+
+    Args:
+        device_count (int, optional): Number of heaters to project. Defaults to 100.
+        rounds (int, optional): Passes over the fleet. Defaults to 20.
+
+    Returns:
+        dict: Latency summaries per fleet pass and the mean speedup.
+    """
+    getters_samples = []
+    projection_samples = []
+
+    async with ClientSession() as websession:
+        session = _new_session(websession, None, "benchmark")
+        session.data.devices = {device["deviceId"]: device for device in make_devices(device_count)}
+        getters = {name: getattr(session.attr, method) for name, method in LEGACY_GETTERS.items()}
+
+        for _ in range(rounds):
+            started = time.perf_counter()
+            for device_id in session.data.devices:
+                {name: await getter(device_id) for name, getter in getters.items()}
+            getters_samples.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            for device_id in session.data.devices:
+                await session.attr.state_attributes(device_id)
+            projection_samples.append(time.perf_counter() - started)
+
+    return {
+        "devices": device_count,
+        "getters": summarize(getters_samples),
+        "projection": summarize(projection_samples),
+        "speedup": statistics.fmean(getters_samples) / statistics.fmean(projection_samples),
+    }
@@ -1,6 +1,6 @@
 """OSO Energy Sensor Module."""
 
-from .helper.const import binary_sensor_commands, OSOEnergyBinarySensorData
+from .helper.const import binary_sensor_fields, OSOEnergyBinarySensorData
 
 
 class OSOEnergyBinarySensor:
@@ -26,17 +26,20 @@ class BinarySensor(OSOEnergyBinarySensor):
         """
         self.session = session
 
-    async def get_sensor(self, device: OSOEnergyBinarySensorData) -> OSOEnergyBinarySensorData:
-        # pylint: disable=eval-used
-        """Get updated sensor data.
+    def read_sensor(self, device: OSOEnergyBinarySensorData) -> OSOEnergyBinarySensorData:
+        """Get updated sensor data from the cached devices without awaiting.
 
         Args:
-            device (OSOEnergySensorData): Device to update.
+            device (OSOEnergyBinarySensorData): Device to update.
 
         Returns:
-            OSOEnergySensorData: Updated device.
+            OSOEnergyBinarySensorData: Updated device.
         """
-        device.online = await self.session.attr.online_offline(device.device_id)
+        field = binary_sensor_fields.get(device.osoEnergyType)
+        values = self.session.attr.project(
+            device.device_id, ("available", field) if field else ("available",)
+        )
+        device.online = values[0] if values is not None else False
         if device.online:
             self.session.helper.device_recovered(device.device_id)
             dev_data = OSOEnergyBinarySensorData()
@@ -47,16 +50,24 @@ class BinarySensor(OSOEnergyBinarySensor):
             dev_data.device_id = device.device_id
             dev_data.device_type = device.device_type
             dev_data.device_name = device.device_name
-            dev_data.available = await self.session.attr.online_offline(device.device_id)
+            dev_data.available = device.online
 
-            if dev_data.osoEnergyType in binary_sensor_commands:
-                code = binary_sensor_commands.get(dev_data.osoEnergyType)
-                dev_data.state = await eval(code)
+            if field:
+                dev_data.state = values[1]
 
             self.session.binary_sensors.update({device.device_id: dev_data})
             return self.session.binary_sensors[device.device_id]
 
-        await self.session.log.error_check(
-            device.device_id, device.online
-        )
+        self.session.log.record_error(device.device_id, device.online)
         return device
+
+    async def get_sensor(self, device: OSOEnergyBinarySensorData) -> OSOEnergyBinarySensorData:
+        """Get updated sensor data.
+
+        Args:
+            device (OSOEnergyBinarySensorData): Device to update.
+
+        Returns:
+            OSOEnergyBinarySensorData: Updated device.
+        """
+        return self.read_sensor(device)
@@ -0,0 +1,286 @@
+"""OSO Energy Bulk Command Module."""
+
+import asyncio
+import operator
+from array import array
+from datetime import datetime, timezone, timedelta
+from numbers import Number
+
+from .helper.const import OSOEnergyWaterHeaterData
+from .helper.map import Map
+from .helper.osoenergy_exceptions import OSOEnergyInvalidCommand, OSOEnergyInvalidProfile
+from .profile import OSOEnergyProfile, changed_profiles, serialize_profiles
+
+
+class OSOEnergyBulk:
+    """OSO Energy bulk command code.
+
+    Applies one command to many devices with bounded concurrency and a single
+    device refresh once every command has completed.
+    """
+
+    def __init__(self, session: object = None, concurrency: int = 10):
+        """Initialise bulk commands.
+
+        Args:
+            session (object, optional): Session to interact with OSO Energy. Defaults to None.
+            concurrency (int, optional): Default number of commands in flight. Defaults to 10.
+        """
+        self.session = session
+        self.concurrency = concurrency
+
+    async def run(
+        self,
+        devices: list[OSOEnergyWaterHeaterData | str],
+        command: str,
+        *args,
+        concurrency: int = None,
+        refresh: bool = True,
+        timeout: float = None,
+        **kwargs,
+    ) -> Map:
+        """Run an API command against a list of devices.
+
+        Args:
+            devices (list): Devices or device ids to send the command to.
+            command (str): Name of the `API` method to call.
+            concurrency (int, optional): Commands in flight. Defaults to `self.concurrency`.
+            refresh (bool, optional): Refresh devices once at the end. Defaults to True.
+            timeout (float, optional): Seconds for all commands and the refresh together. Defaults to None.
+
+        Returns:
+            Map: `results` of device id to True/False and `errors` of device id to exception.
+        """
+        device_ids = [getattr(device, "device_id", device) for device in devices]
+        return await self.run_many(
+            command,
+            {device_id: (args, kwargs) for device_id in device_ids},
+            concurrency=concurrency,
+            refresh=refresh,
+            timeout=timeout,
+        )
+
+    async def run_many(
+        self,
+        command: str,
+        calls: dict[str, tuple[tuple, dict]],
+        concurrency: int = None,
+        refresh: bool = True,
+        timeout: float = None,
+    ) -> Map:
+        """Run an API command with different arguments per device.
+
+        Args:
+            command (str): Name of the `API` method to call.
+            calls (dict): Device id to the (args, kwargs) to call it with.
+            concurrency (int, optional): Commands in flight. Defaults to `self.concurrency`.
+            refresh (bool, optional): Refresh devices once at the end. Defaults to True.
+            timeout (float, optional): Seconds for all commands and the refresh together. Defaults to None.
+
+        Returns:
+            Map: `results` of device id to True/False and `errors` of device id to exception.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+        api_call = getattr(self.session.api, command)
+        results = {}
+        errors = {}
+
+        async def send(device_id: str, args: tuple, kwargs: dict):
+            async with semaphore:
+                try:
+                    resp = await api_call(device_id, *args, **kwargs)
+                    results[device_id] = operator.contains(str(resp["original"]), "20")
+                except Exception as exception:  # pylint: disable=broad-except
+                    # One device failing in any way must not cost the others their results.
+                    results[device_id] = False
+                    errors[device_id] = exception
+
+        with self.session.api.deadline(timeout):
+            await asyncio.gather(
+                *(send(device_id, args, kwargs) for device_id, (args, kwargs) in calls.items())
+            )
+
+            if refresh and any(results.values()):
+                try:
+                    await self.session.get_devices()
+                except Exception as exception:  # pylint: disable=broad-except
+                    await self.session.log.error(exception)
+
+        return Map({"results": results, "errors": errors})
+
+    async def run_checked(self, devices: list, command: str, check_args: tuple, *args, **kwargs) -> Map:
+        """Run an API command, deciding it locally where `WaterHeater.check_command` can.
+
+        Devices already in the target state are reported as successful and
+        values outside a device's limits as failed, without sending either.
+
+        Args:
+            devices (list): Devices or device ids to send the command to.
+            command (str): Name of the `API` and `WaterHeater` method.
+            check_args (tuple): Arguments of the `WaterHeater` command.
+
+        Returns:
+            Map: `results` of device id to True/False and `errors` of device id to exception.
+        """
+        send = []
+        decided = {}
+        for device in devices:
+            if isinstance(device, str):
+                device_id = device
+                device = OSOEnergyWaterHeaterData()
+                device.device_id = device_id
+            local = await self.session.hotwater.check_command(device, command, *check_args)
+            if local is None:
+                send.append(device.device_id)
+            else:
+                decided[device.device_id] = local
+
+        result = await self.run(send, command, *args, **kwargs)
+        for device_id, local in decided.items():
+            result.results[device_id] = local
+            if local is False:
+                result.errors[device_id] = OSOEnergyInvalidCommand(
+                    f"{command} is outside the limits of {device_id}"
+                )
+        return result
+
+    async def turn_on(self, devices: list, full_utilization: bool, **kwargs) -> Map:
+        """Turn devices on.
+
+        Args:
+            devices (list): Devices or device ids to turn on.
+            full_utilization (bool): Fully utilize device.
+
+        Returns:
+            Map: Per device results and errors.
+        """
+        return await self.run(devices, "turn_on", full_utilization, **kwargs)
+
+    async def turn_off(self, devices: list, full_utilization: bool, **kwargs) -> Map:
+        """Turn devices off.
+
+        Args:
+            devices (list): Devices or device ids to turn off.
+            full_utilization (bool): Fully utilize device.
+
+        Returns:
+            Map: Per device results and errors.
+        """
+        return await self.run(devices, "turn_off", full_utilization, **kwargs)
+
+    async def set_v40_min(self, devices: list, v40min: float, **kwargs) -> Map:
+        """Set V40 Min levels for devices.
+
+        Args:
+            devices (list): Devices or device ids to update.
+            v40min (float): quantity of water at 40°C.
+
+        Returns:
+            Map: Per device results and errors.
+        """
+        return await self.run_checked(devices, "set_v40_min", (v40min,), v40min, **kwargs)
+
+    async def set_optimization_mode(self, devices: list, option: Number, sub_option: Number, **kwargs) -> Map:
+        """Set heater optimization mode for devices.
+
+        Args:
+            devices (list): Devices or device ids to update.
+            option (Number): heater optimization option.
+            sub_option (Number): heater optimization sub option.
+
+        Returns:
+            Map: Per device results and errors.
+        """
+        return await self.run_checked(
+            devices,
+            "set_optimization_mode",
+            (option, sub_option),
+            optimizationOptions=option,
+            optimizationSubOptions=sub_option,
+            **kwargs
+        )
+
+    async def set_profile(self, devices: list, profile: array, **kwargs) -> Map:
+        """Set heater profile for devices.
+
+        An invalid profile is not sent and fails every device.
+
+        Args:
+            devices (list): Devices or device ids to update.
+            profile (array): array of temperatures for 24 hours (UTC).
+
+        Returns:
+            Map: Per device results and errors.
+        """
+        try:
+            OSOEnergyProfile(profile).validate()
+        except OSOEnergyInvalidProfile as exception:
+            await self.session.log.error(exception)
+            device_ids = [getattr(device, "device_id", device) for device in devices]
+            return Map(
+                {
+                    "results": dict.fromkeys(device_ids, False),
+                    "errors": dict.fromkeys(device_ids, exception),
+                }
+            )
+        return await self.run_checked(devices, "set_profile", (profile,), hours=profile, **kwargs)
+
+    async def set_profiles(self, profiles: dict, **kwargs) -> Map:
+        """Set a different profile per device, skipping unchanged ones.
+
+        Profiles equal to the cached device profile are not sent and are
+        reported as successful. Invalid profiles are not sent and fail.
+
+        Args:
+            profiles (dict): Device id to array of temperatures for 24 hours (UTC).
+
+        Returns:
+            Map: Per device results and errors.
+        """
+        invalid = {}
+        for device_id, profile in profiles.items():
+            try:
+                OSOEnergyProfile(profile).validate()
+            except OSOEnergyInvalidProfile as exception:
+                invalid[device_id] = exception
+        valid = {device_id: profile for device_id, profile in profiles.items() if device_id not in invalid}
+
+        bodies = serialize_profiles(changed_profiles(self.session, valid))
+        result = await self.run_many(
+            "set_profile",
+            {device_id: ((), {"data": body}) for device_id, body in bodies.items()},
+            **kwargs
+        )
+        for device_id, exception in invalid.items():
+            result.results[device_id] = False
+            result.errors[device_id] = exception
+        for device_id in valid:
+            result.results.setdefault(device_id, True)
+        return result
+
+    async def enable_holiday_mode(self, devices: list, period_days: int = 365, **kwargs) -> Map:
+        """Enable holiday mode for devices.
+
+        Args:
+            devices (list): Devices or device ids to update.
+            period_days (int, optional): Number of days to enable holiday mode for. Defaults to 365.
+
+        Returns:
+            Map: Per device results and errors.
+        """
+        start_date = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        end_date = (datetime.now(timezone.utc) + timedelta(days=period_days)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        return await self.run_checked(
+            devices, "enable_holiday_mode", (period_days,), start_date, end_date, **kwargs
+        )
+
+    async def disable_holiday_mode(self, devices: list, **kwargs) -> Map:
+        """Disable holiday mode for devices.
+
+        Args:
+            devices (list): Devices or device ids to update.
+
+        Returns:
+            Map: Per device results and errors.
+        """
+        return await self.run_checked(devices, "disable_holiday_mode", (), **kwargs)
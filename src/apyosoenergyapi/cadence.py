@@ -0,0 +1,176 @@
+"""OSO Energy Upstream Cadence Module."""
+
+import math
+import time
+from collections import deque
+from statistics import median
+
+from .helper.map import Map
+
+# `control` keys that follow commands such as turn_on and turn_off rather
+# than backend updates.
+COMMAND_CONTROL_KEYS = frozenset({"heater", "mode"})
+
+
+class OSOEnergyCadence:
+    """Estimate when the backend refreshes telemetry and poll just after.
+
+    Every scheduled poll is compared with the previous one, device by
+    device. A changed update timestamp, or changed telemetry readings when
+    the payload has no timestamp, means the backend updated between the two
+    polls, so each change brackets one update time. Settings that commands
+    change are ignored, and refreshes outside the schedule are never
+    observed, so neither skews the estimate. Projecting recent brackets forward by the
+    period gives a window for the next update. While that window is wider
+    than `margin` one poll per cycle probes its middle to narrow it; after
+    that a single poll lands just after each expected update.
+    """
+
+    def __init__(
+        self,
+        session: object = None,
+        period: float = None,
+        margin: float = 1.0,
+        min_changes: int = 4,
+        history_size: int = 16,
+        timestamp_path: tuple[str, ...] = None,
+    ):
+        """Initialise the estimator.
+
+        Args:
+            session (object, optional): Session to interact with OSO Energy. Defaults to None.
+            period (float, optional): Known upstream period in seconds. Defaults to estimating it.
+            margin (float, optional): Seconds to poll after the expected update. Defaults to 1.0.
+            min_changes (int, optional): Changes to observe before locking on. Defaults to 4.
+            history_size (int, optional): Changes kept for the estimate. Defaults to 16.
+            timestamp_path (tuple, optional): Keys leading to a device's update timestamp. Defaults to
+                comparing the `control` and `data` readings.
+        """
+        self.session = session
+        self.fixed_period = period
+        self.margin = margin
+        self.min_changes = min_changes
+        self.timestamp_path = timestamp_path
+        self.changes = deque(maxlen=history_size)
+        self.previous = None
+        self.last_poll = None
+        self.stats = Map({"polls": 0, "changed": 0, "unchanged": 0})
+
+    def marker(self, device: dict):
+        """Get what identifies the telemetry a device last reported.
+
+        Args:
+            device (dict): Device payload.
+
+        Returns:
+            Any: Update timestamp, or the `control` and `data` readings without one,
+                leaving out the `control` settings that commands change.
+        """
+        if self.timestamp_path:
+            value = device
+            for key in self.timestamp_path:
+                value = value.get(key) if isinstance(value, dict) else None
+            if value is not None:
+                return value
+        control = device.get("control") or {}
+        readings = {key: value for key, value in control.items() if key not in COMMAND_CONTROL_KEYS}
+        return (readings, device.get("data"))
+
+    def observe(self, devices: dict, now: float = None):
+        """Record the result of a scheduled poll.
+
+        Args:
+            devices (dict): Device id to device payload.
+            now (float, optional): Monotonic time of the poll. Defaults to now.
+        """
+        now = time.monotonic() if now is None else now
+        self.stats.polls += 1
+        markers = {device_id: self.marker(device) for device_id, device in devices.items()}
+
+        if self.previous is not None:
+            if any(
+                device_id in self.previous and self.previous[device_id] != marker
+                for device_id, marker in markers.items()
+            ):
+                self.changes.append((self.last_poll, now))
+                self.stats.changed += 1
+            else:
+                self.stats.unchanged += 1
+
+        self.previous = markers
+        self.last_poll = now
+
+    @property
+    def period(self) -> float | None:
+        """Upstream update period in seconds, None until enough consistent changes were seen."""
+        if self.fixed_period is not None:
+            return self.fixed_period
+        if len(self.changes) < self.min_changes:
+            return None
+
+        changes = list(self.changes)
+        rough = median(later[1] - earlier[1] for earlier, later in zip(changes, changes[1:]))
+        if rough <= 0:
+            return None
+
+        # Two changes k periods apart bound k * period by the gap between
+        # their brackets; pairs far apart pin the period down closely.
+        low, high = 0.0, math.inf
+        for index, (first_lower, first_upper) in enumerate(changes):
+            for lower, upper in changes[index + 1:]:
+                cycles = round((upper - first_upper) / rough)
+                if cycles >= 1:
+                    low = max(low, (lower - first_upper) / cycles)
+                    high = min(high, (upper - first_lower) / cycles)
+
+        if high == math.inf:
+            return rough
+        if low > high:
+            # Polls were too sparse to tell how many updates fell between
+            # them; stay unlocked until fresh changes agree again.
+            return None
+        return (low + high) / 2
+
+    def window(self) -> tuple[float, float] | None:
+        """Get the window the next update is expected in.
+
+        Returns:
+            tuple: Earliest and latest monotonic time of the update, None when unknown.
+        """
+        period = self.period
+        if period is None or period <= 0 or len(self.changes) < self.min_changes:
+            return None
+
+        latest = self.changes[-1][1]
+        low, high = -math.inf, math.inf
+        for lower, upper in reversed(self.changes):
+            cycles = round((latest - upper) / period) + 1
+            new_low = max(low, lower + cycles * period)
+            new_high = min(high, upper + cycles * period)
+            if new_low > new_high:
+                break
+            low, high = new_low, new_high
+
+        # Polls since the latest change saw nothing, so the update is later.
+        return max(low, self.last_poll), high
+
+    def next_delay(self, now: float = None) -> float | None:
+        """Get the seconds to wait before the next poll.
+
+        Returns:
+            float: Seconds until the next poll, None until locked on.
+        """
+        now = time.monotonic() if now is None else now
+        window = self.window()
+        if window is None:
+            return None
+
+        low, high = window
+        if high < low:
+            # The update is later than expected, look again shortly.
+            target = now + max(self.margin, self.period / 10)
+        elif high - low > 2 * self.margin:
+            target = (low + high) / 2
+        else:
+            target = high + self.margin
+        return max(target - now, self.margin)
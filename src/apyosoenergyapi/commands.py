@@ -0,0 +1,203 @@
+"""OSO Energy Command Queue Module."""
+
+import asyncio
+from datetime import datetime, timezone, timedelta
+
+from aiohttp import ClientError
+from aiohttp.web_exceptions import HTTPError
+
+from .helper.const import OSOEnergyWaterHeaterData, command_groups
+from .helper.map import Map
+
+# Errors that mean the API could not be reached or answered garbage, e.g.
+# an HTML error page; the commands are kept and retried.
+UNREACHABLE = (HTTPError, ClientError, OSError, asyncio.TimeoutError, ValueError)
+
+
+class OSOEnergyCommandQueue:
+    """Per device command queue with last-write-wins coalescing.
+
+    Commands wait `delay` seconds before they are sent. A newer command for
+    the same setting replaces a queued one, see `command_groups`, so rapid
+    changes send only the final value. While the API is unreachable the
+    coalesced commands stay queued, are retried every `retry_interval`
+    seconds and are sent straight away once a device poll succeeds again.
+
+    `submit` returns a future that resolves True/False with the outcome of
+    the request, or None when a newer command replaced it.
+    """
+
+    def __init__(self, session: object = None, delay: float = 0.5, retry_interval: float = 30.0):
+        """Initialise the command queue.
+
+        Args:
+            session (object, optional): Session to interact with OSO Energy. Defaults to None.
+            delay (float, optional): Seconds to collect commands before sending. Defaults to 0.5.
+            retry_interval (float, optional): Seconds between retries while unreachable. Defaults to 30.0.
+        """
+        self.session = session
+        self.delay = delay
+        self.retry_interval = retry_interval
+        self.pending = {}
+        self.tasks = {}
+        self.buffered = set()
+        self.stats = Map({"submitted": 0, "sent": 0, "superseded": 0})
+
+    def submit(self, device: OSOEnergyWaterHeaterData | str, command: str, *args) -> asyncio.Future:
+        """Queue a command, replacing any queued command for the same setting.
+
+        Args:
+            device (OSOEnergyWaterHeaterData | str): Device or device id.
+            command (str): `WaterHeater` command name, e.g. "set_v40_min".
+
+        Raises:
+            KeyError: Unknown command.
+
+        Returns:
+            asyncio.Future: Resolves True/False if the command was sent successfully, None if superseded,
+                or raises the error of a request that failed for another reason than being unreachable.
+        """
+        device_id = getattr(device, "device_id", device)
+        group = command_groups[command]
+        future = asyncio.get_running_loop().create_future()
+
+        commands = self.pending.setdefault(device_id, {})
+        previous = commands.pop(group, None)
+        if previous is not None:
+            self._supersede(previous)
+        commands[group] = (command, args, future)
+        self.stats.submitted += 1
+
+        if device_id not in self.tasks:
+            self.tasks[device_id] = asyncio.create_task(self._run(device_id, self.delay))
+
+        return future
+
+    def resume(self):
+        """Send buffered commands now, called when the API is reachable again."""
+        for device_id in list(self.buffered):
+            task = self.tasks.pop(device_id, None)
+            if task is not None:
+                task.cancel()
+            self.buffered.discard(device_id)
+            self.tasks[device_id] = asyncio.create_task(self._run(device_id, 0))
+
+    def discard(self, device_id: str):
+        """Drop the queued commands of a removed device as superseded.
+
+        Args:
+            device_id (str): The id of the device.
+        """
+        task = self.tasks.pop(device_id, None)
+        if task is not None:
+            task.cancel()
+        self.buffered.discard(device_id)
+        for item in self.pending.pop(device_id, {}).values():
+            self._supersede(item)
+
+    async def close(self):
+        """Stop sending and resolve every queued command as superseded."""
+        tasks = list(self.tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for commands in self.pending.values():
+            for item in commands.values():
+                self._supersede(item)
+        self.pending.clear()
+        self.buffered.clear()
+
+    def _supersede(self, item: tuple):
+        future = item[2]
+        if not future.done():
+            future.set_result(None)
+        self.stats.superseded += 1
+
+    async def _run(self, device_id: str, delay: float):
+        try:
+            while True:
+                await asyncio.sleep(delay)
+                if not await self._flush(device_id):
+                    self.buffered.add(device_id)
+                    delay = self.retry_interval
+                elif device_id in self.pending:
+                    delay = self.delay
+                else:
+                    break
+        finally:
+            if self.tasks.get(device_id) is asyncio.current_task():
+                del self.tasks[device_id]
+
+    async def _flush(self, device_id: str) -> bool:
+        """Send the queued commands of one device.
+
+        Returns:
+            boolean: False if the API was unreachable and commands were requeued.
+        """
+        self.buffered.discard(device_id)
+        commands = list(self.pending.pop(device_id, {}).items())
+        sent = False
+
+        for position, (group, (command, args, future)) in enumerate(commands):
+            try:
+                resp = await self._send(device_id, command, args)
+            except asyncio.CancelledError:
+                # close() or discard() stopped the flush; these commands are
+                # no longer in pending, so resolve them here.
+                for _, item in commands[position:]:
+                    self._supersede(item)
+                raise
+            except UNREACHABLE as exception:
+                await self.session.log.error(exception)
+                self._requeue(device_id, commands[position:])
+                return False
+            except Exception as exception:  # pylint: disable=broad-except
+                # Retrying would fail the same way, so hand the error to
+                # every caller still waiting rather than leave them hanging.
+                await self.session.log.error(exception)
+                for _, (_, _, waiting) in commands[position:]:
+                    if not waiting.done():
+                        waiting.set_exception(exception)
+                break
+
+            self.stats.sent += 1
+            success = resp["original"] == 200
+            sent = sent or success
+            if not future.done():
+                future.set_result(success)
+
+        if sent:
+            try:
+                await self.session.get_devices()
+            except Exception as exception:  # pylint: disable=broad-except
+                await self.session.log.error(exception)
+
+        return True
+
+    def _requeue(self, device_id: str, commands: list):
+        """Put unsent commands back ahead of any submitted meanwhile."""
+        newer = self.pending.get(device_id, {})
+        requeued = {}
+        for group, item in commands:
+            if group in newer:
+                self._supersede(item)
+            else:
+                requeued[group] = item
+        requeued.update(newer)
+        if requeued:
+            self.pending[device_id] = requeued
+
+    async def _send(self, device_id: str, command: str, args: tuple) -> dict:
+        api = self.session.api
+        if command == "set_optimization_mode":
+            return await api.set_optimization_mode(
+                device_id, optimizationOptions=args[0], optimizationSubOptions=args[1]
+            )
+        if command == "set_profile":
+            return await api.set_profile(device_id, hours=args[0])
+        if command == "enable_holiday_mode":
+            period_days = args[0] if args else 365
+            start_date = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+            end_date = (datetime.now(timezone.utc) + timedelta(days=period_days)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+            return await api.enable_holiday_mode(device_id, start_date, end_date)
+        return await getattr(api, command)(device_id, *args)
@@ -0,0 +1,186 @@
+"""OSO Energy Command Convergence Module."""
+
+import asyncio
+import math
+from numbers import Number
+
+from .helper.deadline import remaining
+
+
+def expected_state(command: str, *args) -> dict:
+    """Get the payload fields a command should end up setting.
+
+    Args:
+        command (str): `WaterHeater` command name.
+
+    Raises:
+        KeyError: The command has no known end state.
+
+    Returns:
+        dict: (section, key) to expected value, sections as in `projection.SCHEMA`.
+    """
+    if command == "turn_on":
+        return {("control", "heater"): "on"}
+    if command == "turn_off":
+        return {("control", "heater"): "off"}
+    if command == "set_v40_min":
+        return {("device", "v40Min"): args[0]}
+    if command == "set_profile":
+        hours = args[0].tolist() if hasattr(args[0], "tolist") else list(args[0])
+        return {("device", "profile"): hours}
+    if command == "set_optimization_mode":
+        return {
+            ("device", "optimizationOption"): args[0],
+            ("device", "optimizationSubOption"): args[1],
+        }
+    if command == "enable_holiday_mode":
+        return {("device", "isInPowerSave"): True}
+    if command == "disable_holiday_mode":
+        return {("device", "isInPowerSave"): False}
+    raise KeyError(f"No expected state for {command}")
+
+
+def matches(expected, actual, tolerance: float = 0.5) -> bool:
+    """Compare an expected value with what the device reports.
+
+    Numbers, alone or in lists, match within `tolerance` since the device
+    may round what it stores.
+
+    Args:
+        expected (Any): Expected value.
+        actual (Any): Reported value.
+        tolerance (float, optional): Allowed numeric difference. Defaults to 0.5.
+
+    Returns:
+        boolean: True/False if the values match.
+    """
+    if isinstance(expected, list):
+        return (
+            isinstance(actual, list)
+            and len(expected) == len(actual)
+            and all(matches(e, a, tolerance) for e, a in zip(expected, actual))
+        )
+    if (
+        isinstance(expected, Number) and not isinstance(expected, bool)
+        and isinstance(actual, Number) and not isinstance(actual, bool)
+    ):
+        return math.isclose(expected, actual, abs_tol=tolerance)
+    return expected == actual
+
+
+def reached(target: dict, device: dict, tolerance: float = 0.5) -> bool:
+    """Check a device payload has every expected field value.
+
+    Args:
+        target (dict): (section, key) to expected value, see `expected_state`.
+        device (dict): Device payload.
+        tolerance (float, optional): Allowed numeric difference. Defaults to 0.5.
+
+    Returns:
+        boolean: True/False if the device is in the expected state.
+    """
+    for (section, key), value in target.items():
+        payload = device if section == "device" else (device.get(section) or {})
+        if key not in payload or not matches(value, payload[key], tolerance):
+            return False
+    return True
+
+
+class OSOEnergyConvergence:
+    """Confirm that devices reach the state a command asked for.
+
+    Expectations are checked against every device snapshot the session
+    loads, so confirmation rides on the regular polls instead of extra
+    requests. Each expectation is a future that resolves True when the
+    device matches and False when it times out or a newer command for the
+    same fields replaces it.
+    """
+
+    def __init__(self, session: object = None, tolerance: float = 0.5):
+        """Initialise the tracker.
+
+        Args:
+            session (object, optional): Session to interact with OSO Energy. Defaults to None.
+            tolerance (float, optional): Allowed numeric difference. Defaults to 0.5.
+        """
+        self.session = session
+        self.tolerance = tolerance
+        self.pending = {}
+
+    def expect(self, device_id: str, command: str, *args, timeout: float = None) -> asyncio.Future:
+        """Start tracking the end state of a command.
+
+        Args:
+            device_id (str): The id of the device.
+            command (str): `WaterHeater` command name.
+            timeout (float, optional): Seconds to wait for the state. Defaults to no limit.
+
+        Returns:
+            asyncio.Future: Resolves True/False if the device reached the state.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        target = expected_state(command, *args)
+
+        expectations = self.pending.setdefault(device_id, [])
+        for other_target, other in list(expectations):
+            if other_target.keys() & target.keys():
+                self._resolve(device_id, other, False)
+        expectations.append((target, future))
+
+        if timeout is not None:
+            handle = loop.call_later(timeout, self._resolve, device_id, future, False)
+            future.add_done_callback(lambda _: handle.cancel())
+
+        device = self.session.data.devices.get(device_id)
+        if device is not None and reached(target, device, self.tolerance):
+            self._resolve(device_id, future, True)
+
+        return future
+
+    async def confirm(self, device_id: str, command: str, timeout: float, *args) -> bool:
+        """Wait until a device reports the state a command asked for.
+
+        Args:
+            device_id (str): The id of the device.
+            command (str): `WaterHeater` command name.
+            timeout (float): Seconds to wait, capped by the current deadline.
+
+        Returns:
+            boolean: True/False if the device reached the state in time.
+        """
+        left = remaining()
+        if left is not None:
+            timeout = min(timeout, max(left, 0))
+        return await self.expect(device_id, command, *args, timeout=timeout)
+
+    def check(self, devices: dict):
+        """Resolve the expectations a new snapshot satisfies.
+
+        Args:
+            devices (dict): Device id to device payload.
+        """
+        for device_id in list(self.pending):
+            device = devices.get(device_id)
+            if device is None:
+                continue
+            for target, future in list(self.pending.get(device_id, ())):
+                if reached(target, device, self.tolerance):
+                    self._resolve(device_id, future, True)
+
+    def discard(self, device_id: str):
+        """Drop the expectations of a removed device, resolving them False.
+
+        Args:
+            device_id (str): The id of the device.
+        """
+        for _, future in list(self.pending.get(device_id, ())):
+            self._resolve(device_id, future, False)
+
+    def _resolve(self, device_id: str, future: asyncio.Future, result: bool):
+        expectations = self.pending.get(device_id, [])
+        self.pending[device_id] = [item for item in expectations if item[1] is not future]
+        if not self.pending[device_id]:
+            del self.pending[device_id]
+        if not future.done():
+            future.set_result(result)
@@ -2,6 +2,13 @@
 from typing import Any
 from .helper.logger import Logger
 from .helper.const import OSOTOHA
+from .projection import (
+    OSOEnergyAttributeRecord,
+    compile_projection,
+    extract_attributes,
+    extract_state_attributes,
+    field_mask,
+)
 
 
 class OSOEnergyAttributes:  # pylint: disable=too-many-public-methods
@@ -23,46 +30,100 @@ class OSOEnergyAttributes:  # pylint: disable=too-many-public-methods
         self.session.log = Logger(session)
         self.type = "Attribute"
 
-    async def state_attributes(self, device_id: str) -> dict[str, Any]:
+    async def state_attributes(self, device_id: str, fields: tuple[str, ...] = None) -> dict[str, Any]:
         """Get HS State Attributes.
 
         Args:
             device_id (str): The id of the device
+            fields (tuple[str, ...], optional): Only compute these attributes. Defaults to all.
 
         Returns:
             dict: Set of attributes
         """
-        attr = {}
-
-        if device_id in self.session.data.devices:
-            attr.update({"available": (await self.online_offline(device_id))})
-            attr.update({"power_load": (await self.get_power_consumption(device_id))})
-            attr.update({"volume": (await self.get_volume(device_id))})
-            attr.update({"tapping_capacity": (await self.get_tapping_capacity(device_id))})
-            attr.update({
-                "capacity_mixed_water_40": (await self.get_capacity_mixed_water_40(device_id))
-            })
-            attr.update({"actual_load_kwh": (await self.get_actual_load_kwh(device_id))})
-            attr.update({"heater_state": (await self.get_heater_state(device_id))})
-            attr.update({"heater_mode": (await self.get_heater_mode(device_id))})
-            attr.update({"current_temperature": (await self.get_current_temperature(device_id))})
-            attr.update({"target_temperature": (await self.get_target_temperature(device_id))})
-            attr.update({
-                "target_temperature_low": (await self.get_target_temperature_low(device_id))
-            })
-            attr.update({
-                "target_temperature_high": (await self.get_target_temperature_high(device_id))
-            })
-            attr.update({"min_temperature": (await self.get_min_temperature(device_id))})
-            attr.update({"max_temperature": (await self.get_max_temperature(device_id))})
-            attr.update({"optimization_mode": (await self.get_optimization_mode(device_id))})
-            attr.update({"v40_min": (await self.get_v40_min(device_id))})
-            attr.update({"v40_level_min": (await self.get_v40_level_min(device_id))})
-            attr.update({"v40_level_max": (await self.get_v40_level_max(device_id))})
-            attr.update({"profile": (await self.get_profile(device_id))})
-            attr.update({"isInPowerSave": (await self.get_power_save_bool(device_id))})
-
-        return attr
+        device = self.session.data.devices.get(device_id)
+        if device is None:
+            return {}
+
+        if fields is None:
+            return extract_state_attributes(device)
+        return compile_projection(field_mask(fields), "dict")(device)
+
+    def record(self, device_id: str) -> OSOEnergyAttributeRecord:
+        """Get every attribute of a device in one pass.
+
+        Args:
+            device_id (str): The id of the device
+
+        Returns:
+            OSOEnergyAttributeRecord: The attributes, None if the device is unknown.
+        """
+        device = self.session.data.devices.get(device_id)
+        if device is None:
+            return None
+
+        return extract_attributes(device)
+
+    def read(self, device_id: str, field: str) -> Any:
+        """Get one attribute of a device without awaiting.
+
+        Args:
+            device_id (str): The id of the device
+            field (str): Attribute name, e.g. "current_temperature".
+
+        Raises:
+            KeyError: An unknown attribute was requested.
+
+        Returns:
+            Any: The attribute, None if the device is unknown.
+        """
+        values = self.project(device_id, (field,))
+        return values[0] if values is not None else None
+
+    def project(self, device_id: str, fields: tuple[str, ...]) -> tuple:
+        """Get only the requested attributes of a device.
+
+        Unrequested attributes are never read or allocated.
+
+        Args:
+            device_id (str): The id of the device
+            fields (tuple[str, ...]): Attribute names, e.g. ("current_temperature", "v40_min").
+
+        Raises:
+            KeyError: An unknown attribute was requested.
+
+        Returns:
+            tuple: Named tuple of the requested attributes, None if the device is unknown.
+        """
+        extract = compile_projection(field_mask(fields))
+        device = self.session.data.devices.get(device_id)
+        if device is None:
+            return None
+
+        return extract(device)
+
+    def project_many(self, fields: tuple[str, ...], device_ids: list[str] = None) -> dict[str, tuple]:
+        """Get the requested attributes for many devices.
+
+        Args:
+            fields (tuple[str, ...]): Attribute names, e.g. ("current_temperature", "v40_min").
+            device_ids (list[str], optional): Devices to read. Defaults to every device.
+
+        Raises:
+            KeyError: An unknown attribute was requested.
+
+        Returns:
+            dict: Device id to named tuple of the requested attributes.
+        """
+        extract = compile_projection(field_mask(fields))
+        devices = self.session.data.devices
+        if device_ids is None:
+            return {device_id: extract(device) for device_id, device in devices.items()}
+
+        return {
+            device_id: extract(devices[device_id])
+            for device_id in device_ids
+            if device_id in devices
+        }
 
     async def get_heater_state_bool(self, device_id: str) -> bool:
         """Get state of heating.
@@ -0,0 +1,181 @@
+"""OSO Energy Memory Diagnostics Module."""
+
+import asyncio
+import os
+import sys
+import tracemalloc
+import types
+from collections import deque
+
+from .helper.map import Map
+from .projection import compile_projection
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+SKIP_TYPES = (type, types.ModuleType, types.FunctionType, types.MethodType, types.BuiltinFunctionType)
+
+
+def deep_sizeof(obj, seen: set = None) -> int:
+    """Get the bytes held by an object and everything it references.
+
+    Objects already in `seen` are not counted again, so one `seen` set
+    shared across calls attributes shared data to the first owner.
+
+    Args:
+        obj (Any): Object to measure.
+        seen (set, optional): Ids of objects already counted. Defaults to None.
+
+    Returns:
+        int: Size in bytes.
+    """
+    seen = set() if seen is None else seen
+    size = 0
+    pending = [obj]
+    while pending:
+        item = pending.pop()
+        if id(item) in seen or isinstance(item, SKIP_TYPES):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            pending.extend(item)
+        elif hasattr(item, "__dict__"):
+            pending.append(vars(item))
+        elif hasattr(item, "__slots__"):
+            pending.extend(getattr(item, slot) for slot in item.__slots__ if hasattr(item, slot))
+    return size
+
+
+class OSOEnergyDiagnostics:
+    """Report the memory a session holds and what allocates it.
+
+    `memory_report` measures each long-lived session structure. Shared
+    payloads are counted once, against the first structure listed in
+    `structures`. `trace` compares tracemalloc snapshots taken before and
+    after a number of polls, which points at allocations that keep growing.
+    """
+
+    def __init__(self, session: object = None):
+        """Initialise diagnostics.
+
+        Args:
+            session (object, optional): Session to interact with OSO Energy. Defaults to None.
+        """
+        self.session = session
+        self.polls = 0
+        self.target = None
+        self.top = 20
+        self.library_only = True
+        self.started_tracing = False
+        self.baseline = None
+        self.result = None
+        self.last_trace = None
+
+    @property
+    def tracing(self) -> bool:
+        """Whether a tracemalloc report is being collected."""
+        return self.result is not None
+
+    def structures(self) -> dict:
+        """Get the long-lived structures of the session by name.
+
+        Returns:
+            dict: Name to object.
+        """
+        session = self.session
+        structures = {
+            "device_snapshot": session.data.devices,
+            "entities": [session.devices, session.sensors, session.binary_sensors, session.switches],
+            "device_list": session.device_list,
+            "error_list": session.config.error_list,
+            "energy_history": session.energy.devices,
+            "convergence": session.convergence.pending,
+            "command_queue": session.commands.pending,
+            "cadence": [session.cadence.changes, session.cadence.previous],
+        }
+        if session.exporter is not None:
+            structures["exporter"] = [session.exporter.previous, session.exporter.buffer]
+        return structures
+
+    def memory_report(self) -> Map:
+        """Measure the memory held by each session structure.
+
+        Returns:
+            Map: Name to `bytes` and `items`, plus `total_bytes` and the compiled `projections`.
+        """
+        seen = set()
+        report = Map({"structures": {}, "total_bytes": 0})
+        for name, structure in self.structures().items():
+            size = deep_sizeof(structure, seen)
+            items = (
+                sum(len(part) for part in structure if hasattr(part, "__len__"))
+                if isinstance(structure, list)
+                else len(structure)
+            )
+            report.structures[name] = Map({"bytes": size, "items": items})
+            report.total_bytes += size
+
+        report.projections = compile_projection.cache_info().currsize
+        return report
+
+    def trace(self, polls: int = 10, top: int = 20, library_only: bool = True) -> asyncio.Future:
+        """Report the allocations that grew over the next polls.
+
+        Args:
+            polls (int, optional): Polls to trace. Defaults to 10.
+            top (int, optional): Allocation sites to report. Defaults to 20.
+            library_only (bool, optional): Only report sites inside this library. Defaults to True.
+
+        Returns:
+            asyncio.Future: Resolves to a list of `location`, `size_diff`, `count_diff` Maps.
+        """
+        if self.tracing:
+            return self.result
+
+        self.started_tracing = not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start(25)
+        self.polls = 0
+        self.target = polls
+        self.top = top
+        self.library_only = library_only
+        self.baseline = tracemalloc.take_snapshot()
+        self.result = asyncio.get_running_loop().create_future()
+        return self.result
+
+    def poll_done(self):
+        """Count a finished poll, reporting once enough were traced."""
+        if not self.tracing:
+            return
+        self.polls += 1
+        if self.polls < self.target:
+            return
+
+        current = tracemalloc.take_snapshot()
+        if self.started_tracing:
+            tracemalloc.stop()
+
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        if self.library_only:
+            filters.append(tracemalloc.Filter(True, os.path.join(PACKAGE_DIR, "*")))
+        stats = current.filter_traces(filters).compare_to(
+            self.baseline.filter_traces(filters), "lineno"
+        )
+
+        self.last_trace = [
+            Map(
+                {
+                    "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "size_diff": stat.size_diff,
+                    "count_diff": stat.count_diff,
+                    "size": stat.size,
+                }
+            )
+            for stat in stats[:self.top]
+        ]
+        result, self.result, self.baseline = self.result, None, None
+        if not result.done():
+            result.set_result(self.last_trace)
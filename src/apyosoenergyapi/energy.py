@@ -0,0 +1,196 @@
+"""OSO Energy Energy Accounting Module."""
+
+import time
+from bisect import bisect_right
+
+from .helper.const import OSOTOHA
+from .helper.map import Map
+
+
+class OSOEnergyFleetMeter:
+    """Running energy total across many sessions."""
+
+    def __init__(self):
+        """Initialise the fleet meter."""
+        self.meters = []
+        self.total_kwh = 0.0
+
+    def register(self, meter: object):
+        """Add a session meter to the fleet.
+
+        Args:
+            meter (OSOEnergyMeter): Meter of one account.
+        """
+        if meter not in self.meters:
+            self.meters.append(meter)
+            self.total_kwh += meter.total_kwh
+
+    def window_kwh(self, start: float = None, end: float = None) -> float:
+        """Get the fleet energy used between two times.
+
+        Args:
+            start (float, optional): Epoch seconds. Defaults to the oldest sample.
+            end (float, optional): Epoch seconds. Defaults to now.
+
+        Returns:
+            float: Energy in kWh.
+        """
+        return sum(meter.account_kwh(start, end) for meter in self.meters)
+
+
+class OSOEnergyMeter:
+    """Integrate heater load into kWh on every poll.
+
+    Each poll adds one trapezoid per device, so an update is O(1) per device.
+    Samples further apart than `max_gap` or taken while a device is offline
+    are not integrated across.
+    """
+
+    def __init__(
+        self,
+        session: object = None,
+        history_size: int = 2880,
+        max_gap: float = None,
+        fleet: OSOEnergyFleetMeter = None,
+    ):
+        """Initialise the meter.
+
+        Args:
+            session (object, optional): Session to interact with OSO Energy. Defaults to None.
+            history_size (int, optional): Samples kept per device for window queries. Defaults to 2880.
+            max_gap (float, optional): Longest gap in seconds to integrate over. Defaults to 3 scan intervals.
+            fleet (OSOEnergyFleetMeter, optional): Fleet total to report to. Defaults to None.
+        """
+        self.session = session
+        self.history_size = history_size
+        self.max_gap = max_gap
+        self.fleet = None
+        self.devices = {}
+        self.total_kwh = 0.0
+        if fleet is not None:
+            self.join_fleet(fleet)
+
+    def join_fleet(self, fleet: OSOEnergyFleetMeter):
+        """Report energy to a fleet meter.
+
+        Args:
+            fleet (OSOEnergyFleetMeter): Fleet total to report to.
+        """
+        self.fleet = fleet
+        fleet.register(self)
+
+    def update(self, devices: dict, now: float = None):
+        """Add a sample for every device in a poll.
+
+        Args:
+            devices (dict): Device id to device payload.
+            now (float, optional): Epoch seconds of the poll. Defaults to now.
+        """
+        now = time.time() if now is None else now
+        max_gap = self.max_gap
+        if max_gap is None:
+            max_gap = 3 * self.session.config.scan_interval.total_seconds()
+        connection = OSOTOHA["Hotwater"]["HeaterConnection"]
+
+        for device_id, device in devices.items():
+            online = connection.get(
+                device.get("connectionState", {}).get("connectionState"), False
+            )
+            power = (device.get("data") or {}).get("actualLoadKwh")
+            self.sample(device_id, power if online else None, now, max_gap)
+
+    def sample(self, device_id: str, power_kw: float, now: float, max_gap: float):
+        """Integrate one device sample.
+
+        Args:
+            device_id (str): The id of the device.
+            power_kw (float): Current load in kW, None when unknown or offline.
+            now (float): Epoch seconds of the sample.
+            max_gap (float): Longest gap in seconds to integrate over.
+        """
+        meter = self.devices.get(device_id)
+        if meter is None:
+            meter = Map({
+                "last_time": None,
+                "last_power": None,
+                "total_kwh": 0.0,
+                "times": [],
+                "totals": [],
+            })
+            self.devices[device_id] = meter
+
+        if meter.last_time is not None and now <= meter.last_time:
+            return
+
+        if (
+            power_kw is not None
+            and meter.last_power is not None
+            and now - meter.last_time <= max_gap
+        ):
+            kwh = (meter.last_power + power_kw) / 2 * (now - meter.last_time) / 3600
+            meter.total_kwh += kwh
+            self.total_kwh += kwh
+            if self.fleet is not None:
+                self.fleet.total_kwh += kwh
+
+        meter.last_time = now
+        meter.last_power = None if power_kw is None else float(power_kw)
+        meter.times.append(now)
+        meter.totals.append(meter.total_kwh)
+        if len(meter.times) > 2 * self.history_size:
+            del meter.times[:-self.history_size]
+            del meter.totals[:-self.history_size]
+
+    @staticmethod
+    def _total_at(meter: Map, moment: float) -> float:
+        """Interpolate the running total of a device at a time."""
+        times = meter.times
+        index = bisect_right(times, moment)
+        if index == 0:
+            return meter.totals[0]
+        if index == len(times):
+            return meter.totals[-1]
+
+        before, after = times[index - 1], times[index]
+        low, high = meter.totals[index - 1], meter.totals[index]
+        return low + (high - low) * (moment - before) / (after - before)
+
+    def device_kwh(self, device_id: str, start: float = None, end: float = None) -> float:
+        """Get the energy a device used.
+
+        Without a window the running total is returned. Windows are limited to
+        the retained history.
+
+        Args:
+            device_id (str): The id of the device.
+            start (float, optional): Epoch seconds. Defaults to the oldest sample.
+            end (float, optional): Epoch seconds. Defaults to now.
+
+        Returns:
+            float: Energy in kWh.
+        """
+        meter = self.devices.get(device_id)
+        if meter is None or not meter.times:
+            return 0.0
+        if start is None and end is None:
+            return meter.total_kwh
+
+        start = meter.times[0] if start is None else start
+        end = meter.times[-1] if end is None else end
+        if end <= start:
+            return 0.0
+        return self._total_at(meter, end) - self._total_at(meter, start)
+
+    def account_kwh(self, start: float = None, end: float = None) -> float:
+        """Get the energy all devices of the session used.
+
+        Args:
+            start (float, optional): Epoch seconds. Defaults to the oldest sample.
+            end (float, optional): Epoch seconds. Defaults to now.
+
+        Returns:
+            float: Energy in kWh.
+        """
+        if start is None and end is None:
+            return self.total_kwh
+        return sum(self.device_kwh(device_id, start, end) for device_id in self.devices)
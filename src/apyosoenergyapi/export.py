@@ -0,0 +1,214 @@
+"""OSO Energy Telemetry Export Module."""
+
+import asyncio
+import csv
+import json
+import os
+import time
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+EXTENSIONS = {"ndjson": "ndjson", "csv": "csv", "parquet": "parquet"}
+
+
+def flatten(device: dict, prefix: str = "") -> dict:
+    """Flatten a device payload into dotted column names.
+
+    Args:
+        device (dict): Device payload.
+        prefix (str, optional): Prefix for nested keys. Defaults to "".
+
+    Returns:
+        dict: Flat record, lists are stored as JSON strings.
+    """
+    flat = {}
+    for key, value in device.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, list):
+            flat[name] = json.dumps(value)
+        else:
+            flat[name] = value
+    return flat
+
+
+class OSOEnergyExporter:
+    """Append device payloads from every poll to rolling files.
+
+    Records are buffered on the event loop and written in batches from an
+    executor, so large writes never block other tasks. A new file is
+    started when the current one reaches `max_bytes` or `max_age`.
+
+    Attach it with `session.exporter = OSOEnergyExporter(session, path)`.
+    """
+
+    def __init__(
+        self,
+        session: object = None,
+        directory: str = ".",
+        fmt: str = "ndjson",
+        changed_only: bool = True,
+        batch_size: int = 500,
+        flush_interval: float = 10.0,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_age: float = 3600.0,
+        prefix: str = "osoenergy",
+        executor: object = None,
+    ):
+        """Initialise the exporter.
+
+        Args:
+            session (object, optional): Session to interact with OSO Energy. Defaults to None.
+            directory (str, optional): Directory for the export files. Defaults to ".".
+            fmt (str, optional): "ndjson", "csv" or "parquet". Defaults to "ndjson".
+            changed_only (bool, optional): Only export devices that changed. Defaults to True.
+            batch_size (int, optional): Records buffered before a write. Defaults to 500.
+            flush_interval (float, optional): Longest time in seconds records stay buffered. Defaults to 10.0.
+            max_bytes (int, optional): Rotate files at this size. Defaults to 64 MiB.
+            max_age (float, optional): Rotate files after this many seconds. Defaults to 3600.0.
+            prefix (str, optional): File name prefix. Defaults to "osoenergy".
+            executor (object, optional): Executor for writes. Defaults to the loop default.
+
+        Raises:
+            ValueError: Unknown format, or parquet without pyarrow installed.
+        """
+        if fmt not in EXTENSIONS:
+            raise ValueError(f"Unknown export format {fmt}")
+        if fmt == "parquet" and pa is None:
+            raise ValueError("Parquet export needs pyarrow installed")
+
+        self.session = session
+        self.directory = directory
+        self.fmt = fmt
+        self.changed_only = changed_only
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.prefix = prefix
+        self.executor = executor
+        self.previous = {}
+        self.buffer = []
+        self.last_flush = time.monotonic()
+        self.write_lock = asyncio.Lock()
+        self.file = None
+        self.file_path = None
+        self.file_opened = None
+        self.columns = None
+        self.writer = None
+        self.files = []
+
+    async def export(self, devices: dict, now: float = None):
+        """Buffer the devices of one poll and write when a batch is due.
+
+        Args:
+            devices (dict): Device id to device payload.
+            now (float, optional): Epoch seconds of the poll. Defaults to now.
+        """
+        now = time.time() if now is None else now
+        for device_id, device in devices.items():
+            if self.changed_only and self.previous.get(device_id) == device:
+                continue
+            self.previous[device_id] = device
+            self.buffer.append({"timestamp": now, "deviceId": device_id, **device})
+
+        if (
+            len(self.buffer) >= self.batch_size
+            or time.monotonic() - self.last_flush >= self.flush_interval
+        ):
+            await self.flush()
+
+    async def flush(self):
+        """Write all buffered records."""
+        self.last_flush = time.monotonic()
+        if not self.buffer:
+            return
+
+        rows, self.buffer = self.buffer, []
+        async with self.write_lock:
+            await asyncio.get_running_loop().run_in_executor(self.executor, self._write, rows)
+
+    async def close(self):
+        """Write remaining records and close the current file."""
+        await self.flush()
+        async with self.write_lock:
+            await asyncio.get_running_loop().run_in_executor(self.executor, self._close_file)
+
+    def _close_file(self):
+        if self.writer is not None and self.fmt == "parquet":
+            self.writer.close()
+        if self.file is not None:
+            self.file.close()
+        self.file = None
+        self.writer = None
+        self.columns = None
+
+    def _open_file(self):
+        self._close_file()
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        path = os.path.join(self.directory, f"{self.prefix}-{stamp}.{EXTENSIONS[self.fmt]}")
+        counter = 1
+        while os.path.exists(path):
+            path = os.path.join(self.directory, f"{self.prefix}-{stamp}-{counter}.{EXTENSIONS[self.fmt]}")
+            counter += 1
+
+        self.file_path = path
+        self.file_opened = time.monotonic()
+        self.files.append(path)
+        if self.fmt != "parquet":
+            self.file = open(path, "a", encoding="utf-8", newline="")
+
+    def _rotate_due(self) -> bool:
+        if self.file_path is None or (self.file is None and self.writer is None):
+            return True
+        if time.monotonic() - self.file_opened >= self.max_age:
+            return True
+        try:
+            return os.path.getsize(self.file_path) >= self.max_bytes
+        except OSError:
+            return True
+
+    def _write(self, rows: list[dict]):
+        if self._rotate_due():
+            self._open_file()
+
+        if self.fmt == "ndjson":
+            self.file.write(
+                "".join(json.dumps(row, separators=(",", ":"), default=str) + "\n" for row in rows)
+            )
+            self.file.flush()
+        elif self.fmt == "csv":
+            self._write_csv([flatten(row) for row in rows])
+        else:
+            self._write_parquet([flatten(row) for row in rows])
+
+    def _write_csv(self, rows: list[dict]):
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+        if self.columns is not None and not set(columns) <= set(self.columns):
+            self._open_file()
+        if self.columns is None:
+            self.columns = columns
+            self.writer = csv.DictWriter(self.file, fieldnames=self.columns)
+            self.writer.writeheader()
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def _write_parquet(self, rows: list[dict]):
+        table = pa.Table.from_pylist(rows)
+        if self.writer is not None:
+            try:
+                if not set(table.column_names) <= set(self.writer.schema.names):
+                    raise KeyError("new columns")
+                table = pa.Table.from_pylist(rows, schema=self.writer.schema)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, KeyError):
+                self._open_file()
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.file_path, table.schema)
+        self.writer.write_table(table)
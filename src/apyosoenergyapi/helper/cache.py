@@ -0,0 +1,134 @@
+"""OSO Energy bounded entity cache."""
+
+import time
+from collections import OrderedDict
+
+
+class OSOEnergyCache(OrderedDict):
+    """Dictionary with optional LRU size and TTL limits.
+
+    Without limits it behaves like a plain dict. With `max_size` the least
+    recently read or written entry is dropped when full; with `ttl` entries
+    not written for that many seconds read as missing and are dropped,
+    including from `keys()`, `values()` and `items()`.
+
+    Recency is tracked apart from the dict's own order, so reading entries
+    while iterating the cache never reorders it.
+    """
+
+    def __init__(self, max_size: int = None, ttl: float = None, on_evict=None):
+        """Initialise the cache.
+
+        Args:
+            max_size (int, optional): Most entries to keep. Defaults to no limit.
+            ttl (float, optional): Seconds an entry stays valid after a write. Defaults to no limit.
+            on_evict (callable, optional): Called with each key dropped by a limit. Defaults to None.
+        """
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self.written = {}
+        self.recency = OrderedDict()
+
+    def __setitem__(self, key, value):
+        """Store an entry and apply the size limit."""
+        super().__setitem__(key, value)
+        self.written[key] = time.monotonic()
+        self._touch(key)
+        self._trim()
+
+    def __getitem__(self, key):
+        """Get an entry, treating expired ones as missing."""
+        if self._expired(key):
+            self._evict(key)
+            raise KeyError(key)
+        value = super().__getitem__(key)
+        self._touch(key)
+        return value
+
+    def __delitem__(self, key):
+        """Remove an entry."""
+        super().__delitem__(key)
+        self.written.pop(key, None)
+        self.recency.pop(key, None)
+
+    def __iter__(self):
+        """Iterate the keys of entries that have not expired."""
+        if self.ttl is None:
+            return super().__iter__()
+        return iter([key for key in super().__iter__() if not self._expired(key)])
+
+    def __contains__(self, key) -> bool:
+        """Check for an entry that has not expired."""
+        return super().__contains__(key) and not self._expired(key)
+
+    def get(self, key, default=None):
+        """Get an entry, treating expired ones as missing."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        """Get the keys of entries that have not expired."""
+        self.prune()
+        return super().keys()
+
+    def values(self):
+        """Get the entries that have not expired."""
+        self.prune()
+        return super().values()
+
+    def items(self):
+        """Get the key and entry pairs that have not expired."""
+        self.prune()
+        return super().items()
+
+    def pop(self, key, *default):
+        """Remove and return an entry."""
+        self.written.pop(key, None)
+        self.recency.pop(key, None)
+        return super().pop(key, *default)
+
+    def clear(self):
+        """Remove every entry."""
+        super().clear()
+        self.written.clear()
+        self.recency.clear()
+
+    def prune(self) -> list:
+        """Drop every expired entry and any beyond `max_size`.
+
+        Returns:
+            list: Keys dropped.
+        """
+        expired = [key for key in list(super().keys()) if self._expired(key)]
+        for key in expired:
+            self._evict(key)
+        return expired + self._trim()
+
+    def _trim(self) -> list:
+        dropped = []
+        if self.max_size is not None:
+            while len(self) > self.max_size:
+                key = next(iter(self.recency))
+                self._evict(key)
+                dropped.append(key)
+        return dropped
+
+    def _touch(self, key):
+        self.recency[key] = None
+        self.recency.move_to_end(key)
+
+    def _expired(self, key) -> bool:
+        return (
+            self.ttl is not None
+            and key in self.written
+            and time.monotonic() - self.written[key] > self.ttl
+        )
+
+    def _evict(self, key):
+        del self[key]
+        if self.on_evict is not None:
+            self.on_evict(key)
@@ -71,6 +71,70 @@ switch_commands = {
 }
 
 
+# Projection attribute read by each entity type, see projection.SCHEMA.
+binary_sensor_fields = {
+    "POWER_SAVE": "isInPowerSave",
+    "EXTRA_ENERGY": "extra_energy_bool",
+    "HEATER_STATE": "heater_state_bool",
+}
+
+sensor_fields = {
+    "POWER_LOAD": "actual_load_kwh",
+    "VOLUME": "volume",
+    "TAPPING_CAPACITY": "tapping_capacity",
+    "CAPACITY_MIXED_WATER_40": "capacity_mixed_water_40",
+    "HEATER_MODE": "heater_mode",
+    "OPTIMIZATION_MODE": "optimization_mode",
+    "V40_MIN": "v40_min",
+    "V40_LEVEL_MIN": "v40_level_min",
+    "V40_LEVEL_MAX": "v40_level_max",
+    "PROFILE": "profile",
+    "TEMPERATURE_ONE": "temperature_one",
+    "TEMPERATURE_LOW": "temperature_low",
+    "TEMPERATURE_MID": "temperature_mid",
+    "TEMPERATURE_TOP": "temperature_top",
+}
+
+switch_fields = {
+    "HOLIDAY_MODE": "isInPowerSave",
+}
+
+# Entities created for each water heater besides the heater itself:
+# (entity type, name suffix, osoEnergyType, control key that must be present)
+device_entities = (
+    ("sensor", " Heater Mode", "HEATER_MODE", None),
+    ("sensor", " Optimization Mode", "OPTIMIZATION_MODE", None),
+    ("sensor", " Profile", "PROFILE", None),
+    ("sensor", " Volume", "VOLUME", None),
+    ("sensor", " Power Load", "POWER_LOAD", None),
+    ("sensor", " Tapping Capacity", "TAPPING_CAPACITY", None),
+    ("sensor", " Capacity Mixed Water 40", "CAPACITY_MIXED_WATER_40", None),
+    ("sensor", " V40 Min", "V40_MIN", None),
+    ("sensor", " V40 Level Min", "V40_LEVEL_MIN", None),
+    ("sensor", " V40 Level Max", "V40_LEVEL_MAX", None),
+    ("sensor", " Temperature One", "TEMPERATURE_ONE", "currentTemperatureOne"),
+    ("sensor", " Temperature Low", "TEMPERATURE_LOW", "currentTemperatureLow"),
+    ("sensor", " Temperature Mid", "TEMPERATURE_MID", "currentTemperatureMid"),
+    ("sensor", " Temperature Top", "TEMPERATURE_TOP", "currentTemperatureTop"),
+    ("binary_sensor", " Power Save", "POWER_SAVE", None),
+    ("binary_sensor", " Extra Energy", "EXTRA_ENERGY", None),
+    ("binary_sensor", " Heater State", "HEATER_STATE", None),
+    ("switch", " Holiday Mode", "HOLIDAY_MODE", None),
+)
+
+# Commands that overwrite the same setting share a group; the command queue
+# only sends the latest command of each group.
+command_groups = {
+    "turn_on": "power",
+    "turn_off": "power",
+    "set_v40_min": "v40_min",
+    "set_optimization_mode": "optimization_mode",
+    "set_profile": "profile",
+    "enable_holiday_mode": "holiday_mode",
+    "disable_holiday_mode": "holiday_mode",
+}
+
+
 class OSOEnergyEntityBase:
     device_id: str
     device_type:str
@@ -79,6 +143,7 @@ class OSOEnergyEntityBase:
     ha_type: str
     available: bool
     online: bool
+    stale: bool = False
 
 class OSOEnergyWaterHeaterData(OSOEnergyEntityBase):
     """Water heater object containing the device data"""
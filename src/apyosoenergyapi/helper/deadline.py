@@ -0,0 +1,46 @@
+"""OSO Energy deadline helpers.
+
+A deadline set with `deadline` applies to every API call made inside it,
+including calls made from tasks created inside it, so a command and the
+refresh that follows it share one latency budget.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+DEADLINE: ContextVar[float | None] = ContextVar("osoenergy_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float = None):
+    """Limit everything inside the block to a latency budget.
+
+    Nested deadlines never extend an outer one.
+
+    Args:
+        seconds (float, optional): Budget in seconds, None keeps any outer deadline. Defaults to None.
+    """
+    if seconds is None:
+        yield
+        return
+
+    expires = time.monotonic() + seconds
+    current = DEADLINE.get()
+    token = DEADLINE.set(expires if current is None else min(current, expires))
+    try:
+        yield
+    finally:
+        DEADLINE.reset(token)
+
+
+def remaining() -> float | None:
+    """Get the seconds left before the current deadline.
+
+    Returns:
+        float: Seconds left, None when no deadline is set.
+    """
+    expires = DEADLINE.get()
+    if expires is None:
+        return None
+    return expires - time.monotonic()
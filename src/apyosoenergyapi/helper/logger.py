@@ -21,6 +21,10 @@ class Logger:
 
     async def error_check(self, n_id, error_type):
         """Error has occurred."""
+        self.record_error(n_id, error_type)
+
+    def record_error(self, n_id, error_type):
+        """Error has occurred, without awaiting."""
         message = None
 
         if error_type is False:
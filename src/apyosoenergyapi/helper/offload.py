@@ -0,0 +1,52 @@
+"""OSO Energy executor offload helpers.
+
+Functions here run inside an executor, so they are module level to stay
+picklable for process pools.
+"""
+
+import copy
+import json
+import time
+
+
+def timed_call(func, *args):
+    """Run a function and measure how long it took.
+
+    Args:
+        func (callable): Function to run.
+
+    Returns:
+        tuple: The result and the elapsed seconds.
+    """
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def decode_json(body: bytes):
+    """Decode a response body like `ClientResponse.json`.
+
+    Args:
+        body (bytes): Raw response body.
+
+    Returns:
+        Any: Decoded JSON, None for an empty body.
+    """
+    if not body.strip():
+        return None
+    return json.loads(body)
+
+
+def build_device_map(devices: list[dict]) -> dict[str, dict]:
+    """Index `/1/Device/All` payloads by device id.
+
+    Args:
+        devices (list[dict]): Device payloads.
+
+    Returns:
+        dict: Device id to a private copy of the payload.
+    """
+    tmp_devices = {}
+    for a_device in devices:
+        tmp_devices.update({a_device["deviceId"]: a_device})
+    return copy.deepcopy(tmp_devices)
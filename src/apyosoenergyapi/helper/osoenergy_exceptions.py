@@ -31,3 +31,19 @@ class NoSubscriptionKey(Exception):
     Args:
         Exception (object): Exception object to invoke
     """
+
+
+class OSOEnergyInvalidProfile(Exception):
+    """Invalid 24 hour profile.
+
+    Args:
+        Exception (object): Exception object to invoke
+    """
+
+
+class OSOEnergyInvalidCommand(Exception):
+    """Command value outside the device limits.
+
+    Args:
+        Exception (object): Exception object to invoke
+    """
@@ -0,0 +1,132 @@
+"""OSO Energy snapshot code."""
+
+import asyncio
+import json
+import os
+from datetime import datetime
+
+from .const import (
+    OSOEnergyBinarySensorData,
+    OSOEnergySensorData,
+    OSOEnergySwitchData,
+    OSOEnergyWaterHeaterData,
+)
+
+SNAPSHOT_VERSION = 1
+
+ENTITY_CLASSES = {
+    "binary_sensor": OSOEnergyBinarySensorData,
+    "sensor": OSOEnergySensorData,
+    "water_heater": OSOEnergyWaterHeaterData,
+    "switch": OSOEnergySwitchData,
+}
+
+
+class OSOEnergySnapshot:
+    """OSO Energy snapshot class.
+
+    Persists the last device map and entity list to `config.file` so a
+    restarted session can return entities before the API has answered.
+    """
+
+    def __init__(self, session: object = None):
+        """Initialise the snapshot.
+
+        Args:
+            session (object, optional): Interact with OSO Energy. Defaults to None.
+        """
+        self.session = session
+        self.retry_interval = None
+
+    def load(self) -> bool:
+        """Load the snapshot file into the session.
+
+        Returns:
+            boolean: True/False if a usable snapshot was loaded.
+        """
+        path = self.session.config.file
+        if not path:
+            return False
+
+        try:
+            with open(path, "rb") as snapshot_file:
+                snapshot = json.loads(snapshot_file.read())
+            if snapshot.get("version") != SNAPSHOT_VERSION or not snapshot.get("devices"):
+                return False
+
+            device_list = {}
+            for entity_type, entities in snapshot.get("entities", {}).items():
+                entity_class = ENTITY_CLASSES[entity_type]
+                device_list[entity_type] = []
+                for values in entities:
+                    entity = entity_class()
+                    entity.__dict__.update(values)
+                    entity.stale = True
+                    device_list[entity_type].append(entity)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as exception:
+            self.session.logger.warning(f"Unable to load snapshot {path} - {exception}")
+            return False
+
+        self.session.data.devices = snapshot["devices"]
+        self.session.device_list.update(device_list)
+        self.session.config.last_update = datetime.fromtimestamp(snapshot["saved"])
+        self.session.config.stale = True
+        return True
+
+    def save(self) -> bool:
+        """Write the current device map and entity list to the snapshot file.
+
+        The file is replaced atomically so a crash never leaves a partial snapshot.
+
+        Returns:
+            boolean: True/False if the snapshot was written.
+        """
+        path = self.session.config.file
+        if not path or not self.session.data.devices:
+            return False
+
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "saved": self.session.config.last_update.timestamp(),
+            "devices": self.session.data.devices,
+            "entities": {
+                entity_type: [
+                    {key: value for key, value in vars(entity).items() if key != "stale"}
+                    for entity in entities
+                ]
+                for entity_type, entities in self.session.device_list.items()
+            },
+        }
+
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "wb") as snapshot_file:
+                snapshot_file.write(json.dumps(snapshot, separators=(",", ":")).encode())
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as exception:
+            self.session.logger.warning(f"Unable to save snapshot {path} - {exception}")
+            return False
+
+        return True
+
+    async def refresh(self) -> bool:
+        """Reconcile a warm-started session with the live API.
+
+        The entities returned from the snapshot are updated in place, so
+        callers holding them see `stale` cleared. A failed refresh is retried
+        through `revalidate` every `retry_interval` seconds, by default the
+        scan interval, until it succeeds or the session is closed.
+
+        Returns:
+            boolean: True once the live refresh was successful.
+        """
+        while not await self.session.revalidate():
+            interval = self.retry_interval
+            if interval is None:
+                interval = self.session.config.scan_interval.total_seconds()
+            await asyncio.sleep(interval)
+
+        self.session.reconcile_devices()
+        self.session.config.stale = False
+        self.save()
+        return True
@@ -11,6 +11,7 @@ from apyosoenergyapi.sensor import Sensor
 from apyosoenergyapi.binary_sensor import BinarySensor
 from apyosoenergyapi.switch import Switch
 
+from .bulk import OSOEnergyBulk
 from .session import OSOEnergySession
 from .waterheater import WaterHeater
 from .device_attributes import OSOEnergyAttributes
@@ -106,6 +107,7 @@ class OSOEnergy(OSOEnergySession):
         self.sensor = Sensor(self.session)
         self.binary_sensor = BinarySensor(self.session)
         self.switch = Switch(self.session)
+        self.bulk = OSOEnergyBulk(self.session)
         self.logger = logger
         if debug:
             sys.settrace(trace_debug)
@@ -0,0 +1,231 @@
+"""OSO Energy Profile Module."""
+
+import json
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from .helper.const import OSOTOHA
+from .helper.osoenergy_exceptions import OSOEnergyInvalidProfile
+
+HOURS = 24
+
+
+@lru_cache(maxsize=1024)
+def _utc_hours_for_local_day(tz_name: str, day: date) -> np.ndarray:
+    """UTC hour that each local hour of `day` falls in."""
+    tz = ZoneInfo(tz_name)
+    index = [
+        datetime(day.year, day.month, day.day, hour, tzinfo=tz).astimezone(timezone.utc).hour
+        for hour in range(HOURS)
+    ]
+    return np.array(index, dtype=np.intp)
+
+
+@lru_cache(maxsize=1024)
+def _local_hours_for_utc_day(tz_name: str, day: date) -> np.ndarray:
+    """Local hour that each UTC hour of `day` falls in."""
+    tz = ZoneInfo(tz_name)
+    start = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    index = [(start + timedelta(hours=hour)).astimezone(tz).hour for hour in range(HOURS)]
+    return np.array(index, dtype=np.intp)
+
+
+def _as_matrix(profiles) -> np.ndarray:
+    """Stack profiles into an (N, 24) float array."""
+    matrix = np.asarray(
+        [np.asarray(profile, dtype=np.float64) for profile in profiles], dtype=np.float64
+    ).reshape(-1, HOURS)
+    return matrix
+
+
+class OSOEnergyProfile:
+    """24 hour temperature profile (UTC) backed by a NumPy array."""
+
+    def __init__(self, values):
+        """Initialise the profile.
+
+        Args:
+            values (array): 24 temperatures, one per UTC hour.
+
+        Raises:
+            OSOEnergyInvalidProfile: The values are not 24 numbers.
+        """
+        try:
+            self.values = np.asarray(values, dtype=np.float64)
+        except (TypeError, ValueError) as exception:
+            raise OSOEnergyInvalidProfile(exception) from exception
+
+        if self.values.shape != (HOURS,):
+            raise OSOEnergyInvalidProfile(
+                f"Profile must have {HOURS} hours, got shape {self.values.shape}"
+            )
+
+    @classmethod
+    def from_device(cls, session: object, device_id: str):
+        """Get the cached profile of a device.
+
+        Args:
+            session (object): Session to interact with OSO Energy.
+            device_id (str): The id of the device
+
+        Returns:
+            OSOEnergyProfile: The device profile, None when unknown.
+        """
+        values = session.data.devices.get(device_id, {}).get("profile")
+        if values is None:
+            return None
+        return cls(values)
+
+    @classmethod
+    def from_local(cls, values, tz: str, day: date = None):
+        """Build a UTC profile from local hour temperatures.
+
+        Args:
+            values (array): 24 temperatures, one per local hour.
+            tz (str): IANA timezone name.
+            day (date, optional): UTC day the profile applies to. Defaults to today.
+
+        Returns:
+            OSOEnergyProfile: Profile in UTC.
+        """
+        day = day or datetime.now(timezone.utc).date()
+        local = cls(values).values
+        return cls(local[_local_hours_for_utc_day(getattr(tz, "key", tz), day)])
+
+    def to_local(self, tz: str, day: date = None) -> np.ndarray:
+        """Rotate the profile into local hours.
+
+        The rotation is worked out per hour so days with a DST change map
+        every local hour to the UTC hour it actually falls in.
+
+        Args:
+            tz (str): IANA timezone name.
+            day (date, optional): Local day to rotate for. Defaults to today.
+
+        Returns:
+            ndarray: 24 temperatures, one per local hour.
+        """
+        tz_name = getattr(tz, "key", tz)
+        day = day or datetime.now(ZoneInfo(tz_name)).date()
+        return self.values[_utc_hours_for_local_day(tz_name, day)]
+
+    def validate(self, min_temp: float = None, max_temp: float = None):
+        """Check every hour is within the device limits.
+
+        Args:
+            min_temp (float, optional): Lowest allowed temperature. Defaults to DeviceConstants minTemp.
+            max_temp (float, optional): Highest allowed temperature. Defaults to DeviceConstants maxTemp.
+
+        Raises:
+            OSOEnergyInvalidProfile: One or more hours are out of range.
+
+        Returns:
+            OSOEnergyProfile: The validated profile.
+        """
+        invalid = invalid_hours(self.values, min_temp, max_temp)[0]
+        if invalid.any():
+            raise OSOEnergyInvalidProfile(
+                f"Profile hours {np.flatnonzero(invalid).tolist()} are outside "
+                f"the allowed temperature range"
+            )
+        return self
+
+    def tolist(self) -> list[float]:
+        """Get the profile as a list.
+
+        Returns:
+            list: 24 temperatures (UTC).
+        """
+        return self.values.tolist()
+
+    def to_json(self) -> str:
+        """Serialise the profile as the API request body.
+
+        Returns:
+            str: JSON body for the profile endpoint.
+        """
+        return json.dumps({"hours": self.values.tolist()})
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        """Expose the profile to NumPy."""
+        return self.values if dtype is None else self.values.astype(dtype)
+
+    def __eq__(self, other) -> bool:
+        """Compare profiles hour by hour."""
+        if isinstance(other, OSOEnergyProfile):
+            other = other.values
+        try:
+            return bool(np.array_equal(self.values, np.asarray(other, dtype=np.float64)))
+        except (TypeError, ValueError):
+            return False
+
+    def __repr__(self) -> str:
+        """Represent the profile."""
+        return f"OSOEnergyProfile({self.values.tolist()})"
+
+
+def invalid_hours(profiles, min_temp: float = None, max_temp: float = None) -> np.ndarray:
+    """Find out of range hours for many profiles at once.
+
+    Args:
+        profiles (array): Profiles to check, one per row.
+        min_temp (float, optional): Lowest allowed temperature. Defaults to DeviceConstants minTemp.
+        max_temp (float, optional): Highest allowed temperature. Defaults to DeviceConstants maxTemp.
+
+    Returns:
+        ndarray: (N, 24) boolean mask of invalid hours.
+    """
+    constants = OSOTOHA["Hotwater"]["DeviceConstants"]
+    min_temp = constants["minTemp"] if min_temp is None else min_temp
+    max_temp = constants["maxTemp"] if max_temp is None else max_temp
+
+    matrix = _as_matrix(profiles) if not isinstance(profiles, np.ndarray) else profiles.reshape(-1, HOURS)
+    return ~((matrix >= min_temp) & (matrix <= max_temp))
+
+
+def changed_profiles(session: object, profiles: dict) -> dict[str, OSOEnergyProfile]:
+    """Keep only profiles that differ from the cached device profiles.
+
+    Args:
+        session (object): Session to interact with OSO Energy.
+        profiles (dict): Device id to desired profile.
+
+    Returns:
+        dict: Device id to profile for the devices that need updating.
+    """
+    if not profiles:
+        return {}
+
+    device_ids = list(profiles)
+    wanted = _as_matrix(profiles[device_id] for device_id in device_ids)
+    cached = np.full_like(wanted, np.nan)
+    for row, device_id in enumerate(device_ids):
+        values = session.data.devices.get(device_id, {}).get("profile")
+        if values is not None and len(values) == HOURS:
+            cached[row] = values
+
+    differs = np.any(wanted != cached, axis=1)
+    return {
+        device_ids[row]: OSOEnergyProfile(wanted[row])
+        for row in np.flatnonzero(differs)
+    }
+
+
+def serialize_profiles(profiles: dict) -> dict[str, str]:
+    """Serialise many profiles to API request bodies.
+
+    Args:
+        profiles (dict): Device id to profile.
+
+    Returns:
+        dict: Device id to JSON body for the profile endpoint.
+    """
+    device_ids = list(profiles)
+    rows = _as_matrix(profiles[device_id] for device_id in device_ids).tolist()
+    return {
+        device_id: json.dumps({"hours": row})
+        for device_id, row in zip(device_ids, rows)
+    }
@@ -0,0 +1,184 @@
+"""OSO Energy Profiling Module."""
+
+import asyncio
+import cProfile
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+
+MODES = {"pstats": "pstats", "collapsed": "collapsed"}
+
+
+class OSOEnergyProfiler:
+    """Profile a number of poll cycles of a running session.
+
+    "pstats" mode runs cProfile over the event loop thread, so everything
+    the loop executes is covered: `get_devices`, `create_devices` and
+    entity refreshes through `Sensor` and `WaterHeater`. "collapsed" mode
+    samples the loop thread's stack from a helper thread every `interval`
+    seconds and writes one `frame;frame;frame count` line per stack, ready
+    for flamegraph tools, at a much lower overhead.
+
+    A run ends after `cycles` calls to `get_devices` or on `stop()`, and
+    can be toggled at runtime, e.g. from a signal handler.
+    """
+
+    def __init__(self, session: object = None, directory: str = ".", prefix: str = "osoenergy-profile"):
+        """Initialise the profiler.
+
+        Args:
+            session (object, optional): Session to interact with OSO Energy. Defaults to None.
+            directory (str, optional): Directory for profile files. Defaults to ".".
+            prefix (str, optional): File name prefix. Defaults to "osoenergy-profile".
+        """
+        self.session = session
+        self.directory = directory
+        self.prefix = prefix
+        self.mode = None
+        self.cycles = None
+        self.completed = 0
+        self.interval = 0.005
+        self.include_idle = False
+        self.profile = None
+        self.samples = None
+        self.sampler = None
+        self.stopping = threading.Event()
+        self.files = []
+
+    @property
+    def active(self) -> bool:
+        """Whether a profiling run is in progress."""
+        return self.mode is not None
+
+    def start(
+        self,
+        cycles: int = 10,
+        mode: str = "pstats",
+        interval: float = 0.005,
+        include_idle: bool = False,
+    ):
+        """Start profiling from the event loop thread.
+
+        Args:
+            cycles (int, optional): Poll cycles to profile, None until `stop()`. Defaults to 10.
+            mode (str, optional): "pstats" or "collapsed". Defaults to "pstats".
+            interval (float, optional): Seconds between samples in collapsed mode. Defaults to 0.005.
+            include_idle (bool, optional): Keep samples of the loop waiting for I/O. Defaults to False.
+
+        Raises:
+            ValueError: Unknown mode.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode {mode}")
+        if self.active:
+            return
+
+        self.mode = mode
+        self.cycles = cycles
+        self.completed = 0
+        self.interval = interval
+        self.include_idle = include_idle
+
+        if mode == "pstats":
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        else:
+            self.samples = Counter()
+            self.stopping.clear()
+            self.sampler = threading.Thread(
+                target=self._sample,
+                args=(threading.get_ident(),),
+                name="osoenergy-profiler",
+                daemon=True,
+            )
+            self.sampler.start()
+
+    def stop(self) -> str | None:
+        """Stop profiling and write the result.
+
+        Returns:
+            str: Path of the profile file, None when no run was active.
+        """
+        if not self.active:
+            return None
+
+        if self.mode == "pstats":
+            self.profile.disable()
+        else:
+            self.stopping.set()
+            self.sampler.join()
+            self.sampler = None
+
+        path = self._path()
+        if self.mode == "pstats":
+            self.profile.dump_stats(path)
+            self.profile = None
+        else:
+            with open(path, "w", encoding="utf-8") as file:
+                for stack, count in self.samples.most_common():
+                    file.write(f"{stack} {count}\n")
+            self.samples = None
+
+        self.mode = None
+        self.files.append(path)
+        return path
+
+    def toggle(self, **kwargs) -> str | None:
+        """Start a run, or stop the current one.
+
+        Returns:
+            str: Path of the profile file when a run was stopped.
+        """
+        if self.active:
+            return self.stop()
+        self.start(**kwargs)
+        return None
+
+    def install_signal_handler(self, signum: int = None, **kwargs):
+        """Toggle profiling when the process receives a signal.
+
+        Must be called from the event loop thread, e.g. `kill -USR2 <pid>`
+        then starts a run and a second signal ends it early.
+
+        Args:
+            signum (int, optional): Signal to listen for. Defaults to SIGUSR2.
+        """
+        signum = signal.SIGUSR2 if signum is None else signum
+        asyncio.get_running_loop().add_signal_handler(signum, lambda: self.toggle(**kwargs))
+
+    def cycle_done(self):
+        """Count a finished poll cycle, stopping once enough were profiled."""
+        if not self.active:
+            return
+        self.completed += 1
+        if self.cycles is not None and self.completed >= self.cycles:
+            path = self.stop()
+            self.session.logger.info(f"Profile of {self.completed} poll cycles written to {path}")
+
+    def _path(self) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        path = os.path.join(self.directory, f"{self.prefix}-{stamp}.{MODES[self.mode]}")
+        counter = 1
+        while os.path.exists(path):
+            path = os.path.join(self.directory, f"{self.prefix}-{stamp}-{counter}.{MODES[self.mode]}")
+            counter += 1
+        return path
+
+    def _sample(self, thread_id: int):
+        while not self.stopping.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)  # pylint: disable=protected-access
+            if frame is None:
+                return
+            if not self.include_idle and frame.f_code.co_name == "select":
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
@@ -0,0 +1,196 @@
+"""OSO Energy Attribute Projection Module."""
+
+from collections import namedtuple
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+from .helper.const import OSOTOHA
+
+SAME = object()
+REQUIRED = object()
+
+# Where each attribute lives in a device payload and how it is mapped:
+# name: (section, key, default, OSOTOHA mapping, mapping default)
+# Sections are "device" for the payload root, "control", "data" and
+# "connection" for the nested objects. A mapping default of SAME falls back
+# to the raw value, like `mapping.get(value, value)`. A REQUIRED default
+# yields None when the key is missing instead of mapping a default.
+SCHEMA = {
+    "available": ("connection", "connectionState", None, "HeaterConnection", False),
+    "power_load": ("device", "powerConsumption", 0, None, None),
+    "volume": ("device", "volume", 0, None, None),
+    "tapping_capacity": ("data", "tappingCapacitykWh", 0, None, None),
+    "capacity_mixed_water_40": ("data", "capacityMixedWater40", 0, None, None),
+    "actual_load_kwh": ("data", "actualLoadKwh", 0, None, None),
+    "heater_state": ("control", "heater", 0, "HeaterState", "OFF"),
+    "heater_mode": ("control", "mode", None, "HeaterMode", SAME),
+    "current_temperature": ("control", "currentTemperature", 0, None, None),
+    "target_temperature": ("control", "targetTemperature", 0, None, None),
+    "target_temperature_low": ("control", "targetTemperatureLow", 0, None, None),
+    "target_temperature_high": ("control", "targetTemperatureHigh", 0, None, None),
+    "min_temperature": ("control", "minTemperature", 0, None, None),
+    "max_temperature": ("control", "maxTemperature", 0, None, None),
+    "optimization_mode": ("device", "optimizationOption", REQUIRED, "HeaterOptimizationMode", SAME),
+    "v40_min": ("device", "v40Min", None, None, None),
+    "v40_level_min": ("device", "v40LevelMin", None, None, None),
+    "v40_level_max": ("device", "v40LevelMax", None, None, None),
+    "profile": ("device", "profile", None, None, None),
+    "isInPowerSave": ("device", "isInPowerSave", False, "HeaterPowerSaveModeBool", False),
+    "current_operation": ("control", "heater", None, "HeaterState", SAME),
+    "heater_state_bool": ("control", "heater", 0, "HeaterStateBool", False),
+    "power_save": ("device", "isInPowerSave", False, "HeaterPowerSaveMode", False),
+    "extra_energy": ("device", "isInExtraEnergy", False, "HeaterExtraEnergyMode", False),
+    "extra_energy_bool": ("device", "isInExtraEnergy", False, "HeaterExtraEnergyModeBool", False),
+    "sub_optimization_mode": ("device", "optimizationSubOption", REQUIRED, "HeaterSubOptimizationMode", SAME),
+    "temperature_one": ("control", "currentTemperatureOne", None, None, None),
+    "temperature_low": ("control", "currentTemperatureLow", None, None, None),
+    "temperature_mid": ("control", "currentTemperatureMid", None, None, None),
+    "temperature_top": ("control", "currentTemperatureTop", None, None, None),
+}
+
+# Attributes returned by `OSOEnergyAttributes.state_attributes`, in order.
+STATE_ATTRIBUTES = (
+    "available",
+    "power_load",
+    "volume",
+    "tapping_capacity",
+    "capacity_mixed_water_40",
+    "actual_load_kwh",
+    "heater_state",
+    "heater_mode",
+    "current_temperature",
+    "target_temperature",
+    "target_temperature_low",
+    "target_temperature_high",
+    "min_temperature",
+    "max_temperature",
+    "optimization_mode",
+    "v40_min",
+    "v40_level_min",
+    "v40_level_max",
+    "profile",
+    "isInPowerSave",
+)
+
+SECTIONS = {
+    "device": None,
+    "control": 'control = device.get("control") or {}',
+    "data": 'data = device.get("data") or {}',
+    "connection": 'connection = device.get("connectionState") or {}',
+}
+
+
+class OSOEnergyAttributeRecord(NamedTuple):
+    """Every attribute of a water heater, extracted in one pass."""
+
+    available: bool
+    power_load: float
+    volume: float
+    tapping_capacity: float
+    capacity_mixed_water_40: float
+    actual_load_kwh: float
+    heater_state: str
+    heater_mode: str
+    current_temperature: float
+    target_temperature: float
+    target_temperature_low: float
+    target_temperature_high: float
+    min_temperature: float
+    max_temperature: float
+    optimization_mode: str
+    v40_min: float
+    v40_level_min: float
+    v40_level_max: float
+    profile: list[float]
+    isInPowerSave: bool
+    current_operation: str
+    heater_state_bool: bool
+    power_save: str
+    extra_energy: str
+    extra_energy_bool: bool
+    sub_optimization_mode: Any
+    temperature_one: float
+    temperature_low: float
+    temperature_mid: float
+    temperature_top: float
+
+
+def _expression(name: str) -> str:
+    """Build the Python expression reading one attribute."""
+    section, key, default, mapping, mapping_default = SCHEMA[name]
+    if default is REQUIRED:
+        value = f"{section}[{key!r}]"
+    else:
+        value = f"{section}.get({key!r}, {default!r})"
+
+    if mapping is None:
+        expression = value
+    elif mapping_default is SAME:
+        expression = f"{mapping}.get({value}, {value})"
+    else:
+        expression = f"{mapping}.get({value}, {mapping_default!r})"
+
+    if default is REQUIRED:
+        return f"({expression} if {key!r} in {section} else None)"
+    return expression
+
+
+def field_mask(fields) -> tuple[str, ...]:
+    """Normalise a field set to a hashable, ordered mask.
+
+    Args:
+        fields (Iterable[str] | str): Attribute names.
+
+    Returns:
+        tuple[str, ...]: Unique attribute names in the order given.
+    """
+    if isinstance(fields, str):
+        return (fields,)
+    return tuple(dict.fromkeys(fields))
+
+
+@lru_cache(maxsize=None)
+def compile_projection(fields: tuple[str, ...], output: str = "tuple"):
+    """Compile an extractor for a set of attributes.
+
+    The extractor is generated as straight-line code that reads each nested
+    section of the payload once, so no lookups are repeated and missing
+    fields fall back to their defaults without raising.
+
+    Args:
+        fields (tuple[str, ...]): Attribute names, see `SCHEMA`.
+        output (str, optional): "tuple" for a named tuple or "dict". Defaults to "tuple".
+
+    Raises:
+        KeyError: An unknown attribute was requested.
+
+    Returns:
+        function: Callable taking a device payload.
+    """
+    for name in fields:
+        if name not in SCHEMA:
+            raise KeyError(f"Unknown attribute {name}")
+
+    namespace = dict(OSOTOHA["Hotwater"])
+    if output == "dict":
+        body = "{" + ", ".join(f"{name!r}: {_expression(name)}" for name in fields) + "}"
+    else:
+        if fields == OSOEnergyAttributeRecord._fields:
+            namespace["Record"] = OSOEnergyAttributeRecord
+        else:
+            namespace["Record"] = namedtuple("OSOEnergyAttributes", fields)
+        body = "Record(" + ", ".join(_expression(name) for name in fields) + ")"
+
+    sections = {SCHEMA[name][0] for name in fields}
+    lines = ["def extract(device):"]
+    lines += [f"    {SECTIONS[section]}" for section in SECTIONS if section in sections and SECTIONS[section]]
+    lines.append(f"    return {body}")
+
+    exec("\n".join(lines), namespace)  # pylint: disable=exec-used
+    extract = namespace["extract"]
+    extract.record = namespace.get("Record")
+    return extract
+
+
+extract_attributes = compile_projection(OSOEnergyAttributeRecord._fields)
+extract_state_attributes = compile_projection(STATE_ATTRIBUTES, "dict")
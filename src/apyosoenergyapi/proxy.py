@@ -0,0 +1,112 @@
+"""OSO Energy Caching Proxy Module."""
+
+import asyncio
+from datetime import datetime
+
+from aiohttp import ClientError, web
+
+from .helper.const import HTTP_BAD_GATEWAY, HTTP_UNAUTHORIZED
+
+
+class OSOEnergyProxy:
+    """Serve one upstream poller to many local consumers.
+
+    The proxy answers `/1/Device/All` from the session cache and forwards
+    every other call upstream, so an `API` pointed at it with
+    `update_base_url` behaves like one talking to OSO Energy directly.
+    """
+
+    def __init__(self, session: object = None, host: str = "127.0.0.1", port: int = 8080):
+        """Initialise the proxy.
+
+        Args:
+            session (object, optional): Session polling OSO Energy. Defaults to None.
+            host (str, optional): Interface to bind. Defaults to "127.0.0.1".
+            port (int, optional): Port to bind. Defaults to 8080.
+        """
+        self.session = session
+        self.host = host
+        self.port = port
+        self.runner = None
+        self.poll_task = None
+        self.base_url = None
+        self.requests = {"cached": 0, "forwarded": 0, "rejected": 0}
+
+    def _authorized(self, request: web.Request) -> bool:
+        """Only serve consumers that know the subscription key."""
+        return request.headers.get("Ocp-Apim-Subscription-Key") == self.session.subscription_key
+
+    async def _devices(self, request: web.Request) -> web.Response:
+        if not self._authorized(request):
+            self.requests["rejected"] += 1
+            return web.json_response({"message": "Unauthorized"}, status=HTTP_UNAUTHORIZED)
+
+        self.requests["cached"] += 1
+        headers = {}
+        if self.session.config.last_update is not None:
+            age = (datetime.now() - self.session.config.last_update).total_seconds()
+            headers["Age"] = str(max(0, int(age)))
+        return web.json_response(list(self.session.data.devices.values()), headers=headers)
+
+    async def _forward(self, request: web.Request) -> web.Response:
+        if not self._authorized(request):
+            self.requests["rejected"] += 1
+            return web.json_response({"message": "Unauthorized"}, status=HTTP_UNAUTHORIZED)
+
+        self.requests["forwarded"] += 1
+        data = await request.read() if request.can_read_body else None
+        url = self.session.api.base_url + request.path_qs
+        try:
+            resp = await self.session.api.request(request.method.lower(), url, data=data)
+        except (OSError, RuntimeError, ValueError, ClientError, asyncio.TimeoutError) as exception:
+            self.session.logger.error(f"Proxy could not forward {request.method} {request.path} - {exception}")
+            return web.json_response({"message": str(exception)}, status=HTTP_BAD_GATEWAY)
+
+        if request.method != "GET" and resp["original"] == 200:
+            await self.refresh()
+
+        return web.json_response(resp["parsed"], status=resp["original"])
+
+    async def refresh(self) -> bool:
+        """Refresh the cached devices from upstream.
+
+        Returns:
+            boolean: True/False if the refresh was successful.
+        """
+        async with self.session.update_lock:
+            return await self.session.get_devices()
+
+    async def _poll(self):
+        """Poll upstream every scan interval."""
+        while True:
+            await asyncio.sleep(self.session.config.scan_interval.total_seconds())
+            await self.refresh()
+
+    async def start(self) -> str:
+        """Start polling upstream and serving consumers.
+
+        Returns:
+            str: Base url for consumers to pass to `API.update_base_url`.
+        """
+        await self.refresh()
+        self.poll_task = asyncio.create_task(self._poll())
+
+        app = web.Application()
+        app.router.add_get("/1/Device/All", self._devices)
+        app.router.add_route("*", "/1/{tail:.*}", self._forward)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, self.host, self.port)
+        await site.start()
+        self.base_url = f"http://{self.host}:{self.runner.addresses[0][1]}"
+        return self.base_url
+
+    async def stop(self):
+        """Stop serving and polling."""
+        if self.poll_task is not None:
+            self.poll_task.cancel()
+            await asyncio.gather(self.poll_task, return_exceptions=True)
+            self.poll_task = None
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
@@ -1,6 +1,6 @@
 """OSO Energy Sensor Module."""
 
-from .helper.const import sensor_commands, OSOEnergySensorData
+from .helper.const import sensor_fields, OSOEnergySensorData
 
 
 class OSOEnergySensor:
@@ -26,9 +26,8 @@ class Sensor(OSOEnergySensor):
         """
         self.session = session
 
-    async def get_sensor(self, device: OSOEnergySensorData) -> OSOEnergySensorData:
-        # pylint: disable=eval-used
-        """Get updated sensor data.
+    def read_sensor(self, device: OSOEnergySensorData) -> OSOEnergySensorData:
+        """Get updated sensor data from the cached devices without awaiting.
 
         Args:
             device (OSOEnergySensorData): Device to update.
@@ -36,7 +35,11 @@ class Sensor(OSOEnergySensor):
         Returns:
             OSOEnergySensorData: Updated device.
         """
-        device.online = await self.session.attr.online_offline(device.device_id)
+        field = sensor_fields.get(device.osoEnergyType)
+        values = self.session.attr.project(
+            device.device_id, ("available", field) if field else ("available",)
+        )
+        device.online = values[0] if values is not None else False
         if device.online:
             self.session.helper.device_recovered(device.device_id)
             dev_data = OSOEnergySensorData()
@@ -47,16 +50,24 @@ class Sensor(OSOEnergySensor):
             dev_data.device_id = device.device_id
             dev_data.device_type = device.device_type
             dev_data.device_name = device.device_name
-            dev_data.available = await self.session.attr.online_offline(device.device_id)
+            dev_data.available = device.online
 
-            if dev_data.osoEnergyType in sensor_commands:
-                code = sensor_commands.get(dev_data.osoEnergyType)
-                dev_data.state = await eval(code)
+            if field:
+                dev_data.state = values[1]
 
             self.session.sensors.update({device.device_id: dev_data})
             return self.session.sensors[device.device_id]
 
-        await self.session.log.error_check(
-            device.device_id, device.online
-        )
+        self.session.log.record_error(device.device_id, device.online)
         return device
+
+    async def get_sensor(self, device: OSOEnergySensorData) -> OSOEnergySensorData:
+        """Get updated sensor data.
+
+        Args:
+            device (OSOEnergySensorData): Device to update.
+
+        Returns:
+            OSOEnergySensorData: Updated device.
+        """
+        return self.read_sensor(device)
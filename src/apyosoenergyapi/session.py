@@ -1,9 +1,9 @@
 """OSO Energy Session Module."""
 import asyncio
-import copy
+import concurrent.futures
 import operator
+import random
 import time
-import traceback
 from datetime import datetime, timedelta
 
 from aiohttp.web import HTTPException
@@ -11,15 +11,26 @@ from apyosoenergyapi import API
 from apyosoenergyapi.helper.osoenergy_helper import OSOEnergyHelper
 from typing import Any
 
+from .cadence import OSOEnergyCadence
+from .commands import OSOEnergyCommandQueue
+from .convergence import OSOEnergyConvergence
 from .device_attributes import OSOEnergyAttributes
-from .helper.const import OSOTOHA, OSOEnergyBinarySensorData, OSOEnergySensorData, OSOEnergySwitchData, OSOEnergyWaterHeaterData
+from .diagnostics import OSOEnergyDiagnostics
+from .energy import OSOEnergyMeter
+from .helper.const import OSOTOHA, device_entities, OSOEnergyBinarySensorData, OSOEnergySensorData, OSOEnergySwitchData, OSOEnergyWaterHeaterData
 from .helper.osoenergy_exceptions import (
     OSOEnergyApiError,
     OSOEnergyReauthRequired,
     OSOEnergyUnknownConfiguration,
 )
+from .helper.deadline import remaining
+from .helper.cache import OSOEnergyCache
 from .helper.logger import Logger
 from .helper.map import Map
+from .helper.offload import build_device_map, timed_call
+from .helper.snapshot import OSOEnergySnapshot
+from .profiler import OSOEnergyProfiler
+from .shared_cache import OSOEnergySharedCache, SharedDevices
 
 
 class OSOEnergySession:
@@ -50,14 +61,35 @@ class OSOEnergySession:
         self.api = API(osoenergy_session=self, websession=websession)
         self.attr = OSOEnergyAttributes(self)
         self.log = Logger(self)
+        self.snapshot = OSOEnergySnapshot(self)
+        self.snapshot_task = None
+        self.energy = OSOEnergyMeter(self)
+        self.shared_cache = None
+        self.exporter = None
+        self.export_tasks = set()
+        self.convergence = OSOEnergyConvergence(self)
+        self.commands = OSOEnergyCommandQueue(self)
+        self.cadence = OSOEnergyCadence(self)
+        self.profiler = OSOEnergyProfiler(self)
+        self.diagnostics = OSOEnergyDiagnostics(self)
+        self.offload_stats = Map({"calls": 0, "bytes": 0, "saved_seconds": 0.0})
         self.update_lock = asyncio.Lock()
+        self.revalidate_task = None
+        self.poll_task = None
+        self.poll_stats = Map({"polls": 0, "skipped": 0, "failed": 0})
         self.config = Map(
             {
                 "error_list": {},
                 "file": False,
+                "last_error": None,
+                "last_failure": None,
                 "last_updated": datetime.now(),
+                "offload_executor": None,
+                "offload_threshold": None,
                 "scan_interval": timedelta(seconds=30),
                 "sensors": False,
+                "stale": False,
+                "user_email": None,
             }
         )
         self.data = Map(
@@ -65,10 +97,16 @@ class OSOEnergySession:
                 "devices": {},
             }
         )
-        self.devices = {}
-        self.sensors = {}
-        self.binary_sensors = {}
-        self.switches = {}
+        self.devices = OSOEnergyCache()
+        self.sensors = OSOEnergyCache()
+        self.binary_sensors = OSOEnergyCache()
+        self.switches = OSOEnergyCache()
+        self.removal_listeners = []
+        self.entity_listeners = []
+        self.entity_index = {}
+        self.entity_signatures = {}
+        self.discovered = False
+        self.discovered_devices = None
         self.device_list = {
             "binary_sensor": [],
             "sensor": [],
@@ -80,9 +118,9 @@ class OSOEnergySession:
         """Update the scan interval.
 
         Args:
-            new_interval (int): New interval for polling.
+            new_interval (timedelta | int | float): New interval for polling, numbers in seconds.
         """
-        if isinstance(new_interval, int):
+        if isinstance(new_interval, (int, float)):
             new_interval = timedelta(seconds=new_interval)
 
         interval = new_interval
@@ -106,10 +144,15 @@ class OSOEnergySession:
     async def update_data(self):
         """Get latest data for OSO Energy - rate limiting.
 
+        Waiting for another update to finish counts against the current
+        deadline, see `OSOEnergyApiAsync.deadline`.
+
         Returns:
             boolean: True/False if update was successful
         """
-        await self.update_lock.acquire()
+        if not await self._acquire_update_lock(remaining()):
+            return False
+
         updated = False
         try:
             next_update = self.config.last_update + self.config.scan_interval
@@ -121,6 +164,289 @@ class OSOEnergySession:
 
         return updated
 
+    async def _acquire_update_lock(self, timeout: float | None) -> bool:
+        """Wait up to `timeout` seconds for `update_lock`.
+
+        `wait_for(lock.acquire())` can take the lock and still time out
+        before Python 3.12, leaking it. Here a lock taken after giving up
+        is released again.
+
+        Args:
+            timeout (float | None): Seconds to wait, None to wait for as long as it takes.
+
+        Returns:
+            boolean: True if the lock is now held by the caller.
+        """
+        acquire = asyncio.ensure_future(self.update_lock.acquire())
+        try:
+            await asyncio.wait({acquire}, timeout=timeout)
+        except asyncio.CancelledError:
+            acquire.add_done_callback(self._release_abandoned_lock)
+            acquire.cancel()
+            raise
+        if acquire.done():
+            return True
+        acquire.add_done_callback(self._release_abandoned_lock)
+        acquire.cancel()
+        return False
+
+    def _release_abandoned_lock(self, acquire: asyncio.Future):
+        """Release `update_lock` if an abandoned acquire still took it."""
+        if not acquire.cancelled():
+            self.update_lock.release()
+
+    def data_age(self) -> float | None:
+        """Get the age of the device snapshot.
+
+        Returns:
+            float: Seconds since the last successful update, None before the first.
+        """
+        if not self.data.devices or self.config.last_update is None:
+            return None
+        return (datetime.now() - self.config.last_update).total_seconds()
+
+    async def read_devices(self, max_age: float = None) -> Map:
+        """Get the device snapshot without waiting on a refresh when possible.
+
+        A snapshot no older than `max_age` is returned as is. An older one is
+        returned straight away while a single background refresh runs, and
+        stays available with its age when the API cannot be reached. Only
+        the very first read waits for the API.
+
+        Args:
+            max_age (float, optional): Acceptable age in seconds. Defaults to the scan interval.
+
+        Returns:
+            Map: `devices`, their `age` in seconds, `stale`, `revalidating`, `last_error` and `last_failure`.
+        """
+        max_age = self.config.scan_interval.total_seconds() if max_age is None else max_age
+        age = self.data_age()
+
+        if age is None:
+            await self.revalidate()
+            age = self.data_age()
+        elif age > max_age:
+            self.revalidate_in_background()
+
+        return Map(
+            {
+                "devices": self.data.devices,
+                "age": age,
+                "stale": age is None or age > max_age or self.config.stale,
+                "revalidating": self.revalidate_task is not None and not self.revalidate_task.done(),
+                "last_error": self.config.last_error,
+                "last_failure": self.config.last_failure,
+            }
+        )
+
+    async def revalidate(self) -> bool:
+        """Refresh the devices, reusing a refresh that finished while waiting.
+
+        Any failure keeps the current snapshot and is recorded in
+        `config.last_error` and `config.last_failure`.
+
+        Returns:
+            boolean: True/False if the devices were refreshed successfully.
+        """
+        previous = self.config.last_update
+        try:
+            async with self.update_lock:
+                if self.data.devices and self.config.last_update != previous:
+                    return True
+                updated = await self.get_devices()
+        except Exception as exception:  # pylint: disable=broad-except
+            self.logger.error(f"Refreshing devices failed - {exception}")
+            self.config.last_error = exception
+            self.config.last_failure = datetime.now()
+            return False
+        if updated:
+            self.config.stale = False
+        return updated
+
+    def revalidate_in_background(self):
+        """Start a background refresh, joining one already in progress."""
+        if self.revalidate_task is None or self.revalidate_task.done():
+            self.revalidate_task = asyncio.create_task(self.revalidate())
+            self.revalidate_task.add_done_callback(self._log_task_exception)
+
+    def _log_task_exception(self, task: asyncio.Task):
+        """Log the error a background task ended with, so it is never reported as unhandled."""
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error(f"Background task {task.get_name()} failed - {task.exception()}")
+
+    def _export(self, devices: dict):
+        """Hand a poll's devices to the exporter in its own task.
+
+        Export writes and their errors stay off the poll, so a full disk
+        neither fails the refresh nor holds the update lock.
+        """
+        task = asyncio.create_task(self.exporter.export(devices))
+        self.export_tasks.add(task)
+        task.add_done_callback(self.export_tasks.discard)
+        task.add_done_callback(self._log_task_exception)
+
+    def start_polling(self, interval: float = None, jitter: float = 0.1, phase_lock: bool = False):
+        """Refresh the devices on a schedule in a background task.
+
+        Each wait is the interval randomised by +/- `jitter`, and the first
+        one is spread over a whole interval, so many sessions started
+        together do not poll in step. A tick is skipped while another
+        refresh still holds `update_lock`.
+
+        With `phase_lock` the schedule follows the backend's own update
+        cadence once `cadence` has locked on to it, see `OSOEnergyCadence`.
+
+        Args:
+            interval (float, optional): Seconds between polls. Defaults to the scan interval.
+            jitter (float, optional): Fraction of the interval to randomise by. Defaults to 0.1.
+            phase_lock (bool, optional): Poll just after expected backend updates. Defaults to False.
+        """
+        if self.poll_task is None or self.poll_task.done():
+            self.poll_task = asyncio.create_task(self._poll(interval, jitter, phase_lock))
+
+    async def _poll(self, interval: float, jitter: float, phase_lock: bool):
+        """Run the schedule started by `start_polling` until cancelled.
+
+        A failing refresh counts as a failed poll and is recorded in
+        `config.last_error`; it never ends the schedule.
+
+        Args:
+            interval (float): Seconds between polls, None for the scan interval.
+            jitter (float): Fraction of the interval to randomise by.
+            phase_lock (bool): Poll just after expected backend updates.
+        """
+        delay = random.uniform(0, interval or self.config.scan_interval.total_seconds())
+        while True:
+            await asyncio.sleep(delay)
+            period = interval or self.config.scan_interval.total_seconds()
+            delay = period * random.uniform(1 - jitter, 1 + jitter)
+
+            if self.update_lock.locked():
+                self.poll_stats.skipped += 1
+                continue
+
+            try:
+                async with self.update_lock:
+                    updated = await self.get_devices()
+            except Exception as exception:  # pylint: disable=broad-except
+                self.logger.error(f"Background poll failed - {exception}")
+                self.config.last_error = exception
+                self.config.last_failure = datetime.now()
+                updated = False
+            self.poll_stats.polls += 1
+            if updated:
+                self.config.stale = False
+                if phase_lock:
+                    self.cadence.observe(self.data.devices)
+            else:
+                self.poll_stats.failed += 1
+
+            locked = self.cadence.next_delay() if phase_lock else None
+            if locked is not None:
+                delay = locked + random.uniform(0, self.cadence.margin * jitter)
+
+    async def stop_polling(self):
+        """Stop the background poller."""
+        if self.poll_task is not None:
+            self.poll_task.cancel()
+            await asyncio.gather(self.poll_task, return_exceptions=True)
+            self.poll_task = None
+
+    async def close(self):
+        """Stop background work and release the session's resources.
+
+        Queued commands are dropped, pending exports are written and the
+        connection pool is closed when the session created it.
+        """
+        await self.stop_polling()
+        tasks = [task for task in (self.revalidate_task, self.snapshot_task) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.revalidate_task = None
+        self.snapshot_task = None
+
+        await self.commands.close()
+        await asyncio.gather(*self.export_tasks, return_exceptions=True)
+        if self.exporter is not None:
+            await self.exporter.close()
+        if self.shared_cache is not None:
+            self.shared_cache.close()
+            self.shared_cache = None
+        if self.api.owns_websession:
+            await self.api.websession.close()
+
+    def add_removal_listener(self, callback) -> callable:
+        """Get told when a device disappears from the account.
+
+        Args:
+            callback (callable): Called with the id of each removed device.
+
+        Returns:
+            callable: Call to remove the listener again.
+        """
+        self.removal_listeners.append(callback)
+        return lambda: self.removal_listeners.remove(callback)
+
+    def set_cache_limits(self, max_size: int = None, ttl: float = None):
+        """Bound the entity caches.
+
+        Args:
+            max_size (int, optional): Most entities kept per cache. Defaults to no limit.
+            ttl (float, optional): Seconds an entity is kept after its last refresh. Defaults to no limit.
+        """
+        for cache in (self.devices, self.sensors, self.binary_sensors, self.switches):
+            cache.max_size = max_size
+            cache.ttl = ttl
+            cache.prune()
+
+    def evict_devices(self, device_ids):
+        """Forget everything held for devices removed upstream.
+
+        Args:
+            device_ids (Iterable[str]): Ids of the removed devices.
+        """
+        device_ids = set(device_ids)
+        for device_id in device_ids:
+            for cache in (self.devices, self.sensors, self.binary_sensors, self.switches):
+                cache.pop(device_id, None)
+            self.config.error_list.pop(device_id, None)
+            self.energy.devices.pop(device_id, None)
+            self.convergence.discard(device_id)
+            self.commands.discard(device_id)
+            if self.exporter is not None:
+                self.exporter.previous.pop(device_id, None)
+
+        for device_id in device_ids:
+            self.logger.info(f"Device {device_id} was removed from the account")
+            for callback in list(self.removal_listeners):
+                callback(device_id)
+
+    async def offload(self, func, *args, size: int = 0):
+        """Run CPU heavy work in `config.offload_executor`.
+
+        Every call and its payload bytes are counted in `offload_stats`.
+        Pure Python work in a thread still holds the GIL and stalls the
+        event loop, so only time spent in a process executor is added to
+        `saved_seconds`.
+
+        Args:
+            func (callable): Picklable function to run.
+            size (int, optional): Payload bytes handed to the function. Defaults to 0.
+
+        Returns:
+            Any: The function result.
+        """
+        executor = self.config.offload_executor
+        result, elapsed = await asyncio.get_running_loop().run_in_executor(
+            executor, timed_call, func, *args
+        )
+        self.offload_stats.calls += 1
+        self.offload_stats.bytes += size
+        if isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+            self.offload_stats.saved_seconds += elapsed
+        return result
+
     async def get_user_email(self):
         """Get user email address
         
@@ -149,15 +475,43 @@ class OSOEnergySession:
     async def get_devices(self):
         """Get latest device list for the user.
 
+        Shared cache readers load the poller's snapshot instead of calling
+        the API; either way the poll is reported to the profiler and the
+        allocation tracer.
+
         Raises:
             HTTPException: HTTP error has occured updating the devices.
 
         Returns:
             boolean: True/False if update was successful.
         """
+        try:
+            return await self._get_devices()
+        finally:
+            if self.profiler.active:
+                self.profiler.cycle_done()
+            if self.diagnostics.tracing:
+                self.diagnostics.poll_done()
+
+    async def _get_devices(self) -> bool:
         get_devices_successful = False
         api_resp_d = None
 
+        previous = self.data.devices
+        if (
+            self.shared_cache is not None
+            and not self.shared_cache.is_poller()
+            and self.shared_cache.load()
+        ):
+            if self.data.devices is not previous:
+                removed = previous.keys() - self.data.devices.keys()
+                if removed:
+                    self.evict_devices(removed)
+            self.convergence.check(self.data.devices)
+            if self.discovered:
+                self.discover_devices()
+            return True
+
         try:
             api_resp_d = await self.api.get_devices()
             if operator.contains(str(api_resp_d["original"]), "20") is False:
@@ -167,16 +521,35 @@ class OSOEnergySession:
                 raise OSOEnergyApiError
 
             api_resp_p = api_resp_d["parsed"]
-            tmp_devices = {}
-            for a_device in api_resp_p:
-                tmp_devices.update({a_device["deviceId"]: a_device})
-
-            if len(tmp_devices) > 0:
-                self.data.devices = copy.deepcopy(tmp_devices)
+            threshold = self.config.offload_threshold
+            if threshold is not None and api_resp_d.get("size", 0) >= threshold:
+                tmp_devices = await self.offload(build_device_map, api_resp_p, size=api_resp_d["size"])
+            else:
+                tmp_devices = build_device_map(api_resp_p)
+
+            # An empty list is an account without heaters, so the last
+            # heater being removed is evicted like any other.
+            removed = self.data.devices.keys() - tmp_devices.keys()
+            self.data.devices = tmp_devices
+            if removed:
+                self.evict_devices(removed)
+            if self.discovered:
+                self.discover_devices()
+            self.energy.update(self.data.devices)
+            self.convergence.check(self.data.devices)
+            if self.shared_cache is not None and self.shared_cache.poller:
+                self.shared_cache.publish(self.data.devices)
+            if self.exporter is not None:
+                self._export(self.data.devices)
 
             self.config.last_update = datetime.now()
             get_devices_successful = True
-        except (OSError, RuntimeError, OSOEnergyApiError, ConnectionError, HTTPException):
+            self.config.last_error = None
+            if self.commands.buffered:
+                self.commands.resume()
+        except (OSError, RuntimeError, OSOEnergyApiError, ConnectionError, HTTPException) as exception:
+            self.config.last_error = exception
+            self.config.last_failure = datetime.now()
             get_devices_successful = False
 
         return get_devices_successful
@@ -185,8 +558,24 @@ class OSOEnergySession:
         # pylint: disable=unused-variable
         """Start session to the OSO Energy platform.
 
+        When `snapshot_file` is configured and a snapshot exists, the stored
+        entities are returned straight away marked as stale and the live API
+        is reconciled in the background.
+
         Args:
             config (dict, optional): Configuration for Home Assistant to use. Defaults to {}.
+                api_key (str): OSO Energy user subscription key.
+                sensors (bool): Running as a Home Assistant custom component, kept in `config.sensors`.
+                    Replaces detecting it from the call stack. Defaults to False.
+                snapshot_file (str): Path of the warm start snapshot.
+                shared_cache (str): Path of the host wide shared device cache.
+                user_details (bool): Load the user email alongside the devices.
+                offload_threshold (int): Payload bytes above which decoding runs in an executor.
+                offload_executor (Executor): Executor for offloaded work. Defaults to the loop default.
+                poll (bool): Refresh the devices in a background task, see `start_polling`.
+                phase_lock (bool): Align background polls with backend updates.
+                cache_size (int): Most entities kept per entity cache.
+                cache_ttl (float): Seconds an entity is kept after its last refresh.
 
         Raises:
             OSOEnergyUnknownConfiguration: Unknown configuration identifed.
@@ -195,29 +584,49 @@ class OSOEnergySession:
         Returns:
             list: List of devices
         """
-        custom_component = False
-        for file, line, function_name, text in traceback.extract_stack():
-            if "/custom_components/" in file:
-                custom_component = True
-
-        self.config.sensors = custom_component
         await self.update_interval(30)
 
         if config != {}:
-            if config["api_key"] is not None and not self.config.file:
+            self.config.sensors = config.get("sensors", self.config.sensors)
+            self.config.file = config.get("snapshot_file", self.config.file)
+            self.config.offload_threshold = config.get(
+                "offload_threshold", self.config.offload_threshold
+            )
+            self.config.offload_executor = config.get(
+                "offload_executor", self.config.offload_executor
+            )
+            if config.get("shared_cache") and self.shared_cache is None:
+                self.shared_cache = OSOEnergySharedCache(self, config["shared_cache"])
+            if config.get("api_key") is not None:
                 await self.update_subscription_key(config["api_key"])
             elif not self.config.file:
                 raise OSOEnergyUnknownConfiguration
+            if config.get("cache_size") is not None or config.get("cache_ttl") is not None:
+                self.set_cache_limits(config.get("cache_size"), config.get("cache_ttl"))
+            if config.get("poll", False):
+                self.start_polling(phase_lock=config.get("phase_lock", False))
+
+        if self.snapshot.load():
+            self.snapshot_task = asyncio.create_task(self.snapshot.refresh())
+            self.snapshot_task.add_done_callback(self._log_task_exception)
+            return self.device_list
 
         try:
-            await self.get_devices()
+            if config.get("user_details", False):
+                self.config.user_email = (
+                    await asyncio.gather(self.get_user_email(), self.get_devices())
+                )[0]
+            else:
+                await self.get_devices()
         except HTTPException:
             return HTTPException
 
-        if self.data.devices == {}:
+        if not self.data.devices:
             raise OSOEnergyReauthRequired
 
-        return await self.create_devices()
+        device_list = await self.create_devices()
+        self.snapshot.save()
+        return device_list
 
     async def create_devices(self) -> dict[str, list[OSOEnergyWaterHeaterData | OSOEnergySensorData | OSOEnergyBinarySensorData]]:
         """Create list of devices.
@@ -229,59 +638,155 @@ class OSOEnergySession:
         self.device_list["sensor"] = []
         self.device_list["water_heater"] = []
         self.device_list["switch"] = []
+        self.entity_index = {}
+        self.entity_signatures = {}
+        self.discovered = True
+        self.discovered_devices = None
 
-        for a_device in self.data["devices"]:
-            device = self.data.devices[a_device]
-            self.add_device("water_heater", device)
-
-            self.add_sensor("sensor", device, haName=" Heater Mode", osoEnergyType="HEATER_MODE")
-            self.add_sensor("sensor", device, haName=" Optimization Mode", osoEnergyType="OPTIMIZATION_MODE")
-            self.add_sensor("sensor", device, haName=" Profile", osoEnergyType="PROFILE")
-            self.add_sensor("sensor", device, haName=" Volume", osoEnergyType="VOLUME")
-            self.add_sensor("sensor", device, haName=" Power Load", osoEnergyType="POWER_LOAD")
-            self.add_sensor(
-                "sensor",
-                device,
-                haName=" Tapping Capacity",
-                osoEnergyType="TAPPING_CAPACITY"
-            )
-            self.add_sensor(
-                "sensor",
-                device,
-                haName=" Capacity Mixed Water 40",
-                osoEnergyType="CAPACITY_MIXED_WATER_40"
-            )
-            self.add_sensor("sensor", device, haName=" V40 Min", osoEnergyType="V40_MIN")
-            self.add_sensor("sensor", device, haName=" V40 Level Min", osoEnergyType="V40_LEVEL_MIN")
-            self.add_sensor("sensor", device, haName=" V40 Level Max", osoEnergyType="V40_LEVEL_MAX")
-            if(device.get("control", {}).get("currentTemperatureOne") is not None):
-                self.add_sensor("sensor", device, haName=" Temperature One", osoEnergyType="TEMPERATURE_ONE")
-            if(device.get("control", {}).get("currentTemperatureLow") is not None):
-                self.add_sensor("sensor", device, haName=" Temperature Low", osoEnergyType="TEMPERATURE_LOW")
-            if(device.get("control", {}).get("currentTemperatureMid") is not None):
-                self.add_sensor("sensor", device, haName=" Temperature Mid", osoEnergyType="TEMPERATURE_MID")
-            if(device.get("control", {}).get("currentTemperatureTop") is not None):
-                self.add_sensor("sensor", device, haName=" Temperature Top", osoEnergyType="TEMPERATURE_TOP")
-
-            self.add_binary_sensor("binary_sensor", device, haName=" Power Save", osoEnergyType="POWER_SAVE")
-            self.add_binary_sensor("binary_sensor", device, haName=" Extra Energy", osoEnergyType="EXTRA_ENERGY")
-            self.add_binary_sensor("binary_sensor", device, haName=" Heater State", osoEnergyType="HEATER_STATE")
-
-            self.add_switch("switch", device, haName=" Holiday Mode", osoEnergyType="HOLIDAY_MODE")
-
+        self.discover_devices()
         return self.device_list
 
-    def add_device(self, entity_type: str, data: dict):
+    def discover_devices(self) -> Map:
+        """Bring `device_list` in line with the device snapshot.
+
+        Only heaters that were added or removed, or whose optional
+        temperature sensors appeared or disappeared, are touched, so the
+        work per poll does not grow with unchanged heaters. A shared cache
+        snapshot is only checked when its generation changed, using the
+        readings published alongside each device, so readers only decode
+        the heaters they create entities for.
+
+        Returns:
+            Map: Entities `added` and `removed`, also sent to the entity listeners.
+        """
+        devices = self.data.devices
+        add = {"sensor": self.add_sensor, "binary_sensor": self.add_binary_sensor, "switch": self.add_switch}
+        added = []
+        removed = []
+
+        if devices is self.discovered_devices:
+            return Map({"added": added, "removed": removed})
+        self.discovered_devices = devices
+        shared = isinstance(devices, SharedDevices)
+
+        for device_id in self.entity_index.keys() - devices.keys():
+            self.entity_signatures.pop(device_id, None)
+            removed.extend(self.entity_index.pop(device_id).values())
+
+        for device_id in devices:
+            if shared:
+                reported = devices.reported(device_id)
+                signature = tuple(key is None or key in reported for _, _, _, key in device_entities)
+            else:
+                control = devices[device_id].get("control") or {}
+                signature = tuple(
+                    key is None or control.get(key) is not None
+                    for _, _, _, key in device_entities
+                )
+            if self.entity_signatures.get(device_id) == signature:
+                continue
+
+            self.entity_signatures[device_id] = signature
+            device = devices[device_id]
+            entities = self.entity_index.setdefault(device_id, {})
+            identity = self.entity_identity(device)
+            if ("water_heater", None) not in entities:
+                entities[("water_heater", None)] = self.add_device("water_heater", device, identity)
+                added.append(entities[("water_heater", None)])
+
+            for (entity_type, ha_name, oso_energy_type, _), wanted in zip(device_entities, signature):
+                key = (entity_type, oso_energy_type)
+                if wanted and key not in entities:
+                    entities[key] = add[entity_type](entity_type, device, ha_name, oso_energy_type, identity)
+                    added.append(entities[key])
+                elif not wanted and key in entities:
+                    removed.append(entities.pop(key))
+
+        if removed:
+            retired = {id(entity) for entity in removed}
+            for entity_type in {entity.ha_type for entity in removed}:
+                self.device_list[entity_type] = [
+                    entity for entity in self.device_list[entity_type] if id(entity) not in retired
+                ]
+
+        delta = Map({"added": added, "removed": removed})
+        if added or removed:
+            for callback in list(self.entity_listeners):
+                callback(delta)
+        return delta
+
+    def reconcile_devices(self) -> Map:
+        """Take over the entities already in `device_list`, e.g. from a snapshot.
+
+        Entities that still match a heater are kept as the same objects,
+        refreshed in place and no longer marked stale; missing ones are
+        created and ones the heaters no longer report are retired.
+
+        Returns:
+            Map: Entities `added` and `removed`, see `discover_devices`.
+        """
+        suffixes = {(entity_type, oso_energy_type): ha_name for entity_type, ha_name, oso_energy_type, _ in device_entities}
+        suffixes[("water_heater", None)] = ""
+
+        self.entity_index = {}
+        for entity_type, entities in self.device_list.items():
+            for entity in entities:
+                key = ("water_heater", None) if entity_type == "water_heater" else (entity_type, entity.osoEnergyType)
+                self.entity_index.setdefault(entity.device_id, {})[key] = entity
+        self.entity_signatures = {}
+        self.discovered = True
+        self.discovered_devices = None
+
+        delta = self.discover_devices()
+        for device_id, entities in self.entity_index.items():
+            display_name, online = self.entity_identity(self.data.devices[device_id])
+            for key, entity in entities.items():
+                entity.ha_name = display_name + suffixes.get(key, "")
+                entity.device_name = display_name
+                entity.online = online
+                entity.stale = False
+        return delta
+
+    def add_entity_listener(self, callback) -> callable:
+        """Get told about entities created or retired after a poll.
+
+        Args:
+            callback (callable): Called with a Map of `added` and `removed` entities.
+
+        Returns:
+            callable: Call to remove the listener again.
+        """
+        self.entity_listeners.append(callback)
+        return lambda: self.entity_listeners.remove(callback)
+
+    @staticmethod
+    def entity_identity(data: dict) -> tuple[str, bool]:
+        """Get the display name and connection status shared by a heater's entities.
+
+        Args:
+            data (dict): Device payload.
+
+        Returns:
+            tuple: Display name and whether the heater is online.
+        """
+        display_name = data.get("deviceName", "Water Heater")
+        connection_status = data.get("connectionState", {}).get("connectionState", "Unknown")
+        online = OSOTOHA["Hotwater"]["HeaterConnection"].get(connection_status, False)
+        return display_name, online
+
+    def add_device(self, entity_type: str, data: dict, identity: tuple = None):
         """Add entity to the list.
 
         Args:
             entity_type (str): Type of entity
             data (dict): Information to create entity.
+            identity (tuple, optional): Display name and online status, see `entity_identity`. Defaults to None.
+
+        Returns:
+            object: The created entity.
         """
         result = OSOEnergyWaterHeaterData()
-        display_name = data.get("deviceName", "Water Heater")
-        connection_status = data.get("connectionState", {}).get("connectionState", "Unknown")
-        online = OSOTOHA["Hotwater"]["HeaterConnection"].get(connection_status, False)
+        display_name, online = identity or self.entity_identity(data)
 
         try:
             result.ha_name = display_name
@@ -297,20 +802,22 @@ class OSOEnergySession:
             self.logger.error(exception)
 
         self.device_list[entity_type].append(result)
+        return result
 
-    def add_sensor(self, entity_type: str, data: dict, haName: str, osoEnergyType: str):
+    def add_sensor(self, entity_type: str, data: dict, haName: str, osoEnergyType: str, identity: tuple = None):
         """Add entity to the list.
 
         Args:
             entity_type (str): Type of entity
             data (dict): Information to create entity.
             haName (str): Sensor name for HA
+            identity (tuple, optional): Display name and online status, see `entity_identity`. Defaults to None.
 
+        Returns:
+            object: The created entity.
         """
         result = OSOEnergySensorData()
-        display_name = data.get("deviceName", "Water Heater")
-        connection_status = data.get("connectionState", {}).get("connectionState", "Unknown")
-        online = OSOTOHA["Hotwater"]["HeaterConnection"].get(connection_status, False)
+        display_name, online = identity or self.entity_identity(data)
 
         try:
             result.ha_name = display_name + haName
@@ -325,20 +832,22 @@ class OSOEnergySession:
             self.logger.error(exception)
 
         self.device_list[entity_type].append(result)
+        return result
 
-    def add_binary_sensor(self, entity_type: str, data: dict, haName: str, osoEnergyType: str):
+    def add_binary_sensor(self, entity_type: str, data: dict, haName: str, osoEnergyType: str, identity: tuple = None):
         """Add entity to the list.
 
         Args:
             entity_type (str): Type of entity
             data (dict): Information to create entity.
             haName (str): Sensor name for HA
+            identity (tuple, optional): Display name and online status, see `entity_identity`. Defaults to None.
 
+        Returns:
+            object: The created entity.
         """
         result = OSOEnergyBinarySensorData()
-        display_name = data.get("deviceName", "Water Heater")
-        connection_status = data.get("connectionState", {}).get("connectionState", "Unknown")
-        online = OSOTOHA["Hotwater"]["HeaterConnection"].get(connection_status, False)
+        display_name, online = identity or self.entity_identity(data)
 
         try:
             result.ha_name = display_name + haName
@@ -353,20 +862,22 @@ class OSOEnergySession:
             self.logger.error(exception)
 
         self.device_list[entity_type].append(result)
+        return result
 
-    def add_switch(self, entity_type: str, data: dict, haName: str, osoEnergyType: str):
+    def add_switch(self, entity_type: str, data: dict, haName: str, osoEnergyType: str, identity: tuple = None):
         """Add switch to the list.
 
         Args:
             entity_type (str): Type of entity
             data (dict): Information to create entity.
             haName (str): Sensor name for HA
+            identity (tuple, optional): Display name and online status, see `entity_identity`. Defaults to None.
 
+        Returns:
+            object: The created entity.
         """
         result = OSOEnergySwitchData()
-        display_name = data.get("deviceName", "Water Heater")
-        connection_status = data.get("connectionState", {}).get("connectionState", "Unknown")
-        online = OSOTOHA["Hotwater"]["HeaterConnection"].get(connection_status, False)
+        display_name, online = identity or self.entity_identity(data)
 
         try:
             result.ha_name = display_name + haName
@@ -381,6 +892,7 @@ class OSOEnergySession:
             self.logger.error(exception)
 
         self.device_list[entity_type].append(result)
+        return result
 
     @staticmethod
     def epochTime(date_time: any, pattern: str, action: str):
@@ -0,0 +1,243 @@
+"""OSO Energy Shared Memory Cache Module."""
+
+import json
+import mmap
+import os
+import struct
+import time
+from collections.abc import Mapping
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+MAGIC = b"OSOC"
+VERSION = 2
+# magic, version, generation, published, index length, data length
+HEADER = struct.Struct("<4sIQdQQ")
+GENERATION = struct.Struct("<Q")
+GENERATION_OFFSET = 8
+MIN_SIZE = 64 * 1024
+# Reads run on the event loop, so a write in progress is retried a few
+# times without sleeping and the previous snapshot is kept otherwise.
+READ_RETRIES = 3
+
+
+class SharedDevices(Mapping):
+    """Read-only device map over one published snapshot.
+
+    The snapshot bytes are copied once; devices are only decoded when
+    they are first looked up.
+    """
+
+    def __init__(self, index: dict, data: bytes, generation: int):
+        """Initialise the device map.
+
+        Args:
+            index (dict): Device id to [offset, length, reported control keys] within `data`.
+            data (bytes): Concatenated device payloads.
+            generation (int): Generation of the snapshot.
+        """
+        self.index = index
+        self.data = data
+        self.generation = generation
+        self.decoded = {}
+
+    def __getitem__(self, device_id: str) -> dict:
+        """Decode one device on first access."""
+        device = self.decoded.get(device_id)
+        if device is None:
+            offset, length, _ = self.index[device_id]
+            device = json.loads(self.data[offset:offset + length])
+            self.decoded[device_id] = device
+        return device
+
+    def reported(self, device_id: str) -> list[str]:
+        """Get the `control` readings a device reports, without decoding it.
+
+        Args:
+            device_id (str): The id of the device.
+
+        Returns:
+            list: `control` keys with a value.
+        """
+        return self.index[device_id][2]
+
+    def __contains__(self, device_id) -> bool:
+        """Check a device is in the snapshot without decoding it."""
+        return device_id in self.index
+
+    def __iter__(self):
+        """Iterate device ids."""
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        """Number of devices in the snapshot."""
+        return len(self.index)
+
+
+class OSOEnergySharedCache:
+    """Share one poller's device snapshot with every process on a host.
+
+    The process holding the file lock polls the API and publishes each
+    snapshot into a memory-mapped file. Other processes map the same file
+    and read it without any HTTP calls. A generation counter that is odd
+    while a write is in progress lets readers detect torn reads and retry.
+    """
+
+    def __init__(self, session: object = None, path: str = None):
+        """Initialise the shared cache.
+
+        Args:
+            session (object, optional): Session to interact with OSO Energy. Defaults to None.
+            path (str, optional): File backing the shared snapshot. Defaults to None.
+
+        Raises:
+            RuntimeError: File locking is not available on this platform.
+        """
+        if fcntl is None:
+            raise RuntimeError("The shared device cache needs fcntl file locking")
+
+        self.session = session
+        self.path = path
+        self.poller = False
+        self.generation = 0
+        self.lock_fd = os.open(f"{path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self.map = None
+        self._remap()
+
+    def _remap(self):
+        """Map the whole backing file, growing it to the minimum size."""
+        size = os.fstat(self.fd).st_size
+        if size < MIN_SIZE:
+            os.ftruncate(self.fd, MIN_SIZE)
+            size = MIN_SIZE
+        if self.map is not None:
+            self.map.close()
+        self.map = mmap.mmap(self.fd, size)
+
+    def is_poller(self) -> bool:
+        """Check whether this process is the elected poller.
+
+        Readers try to take the lock on every call so a new poller is
+        elected as soon as the old one exits.
+
+        Returns:
+            boolean: True/False if this process polls the API.
+        """
+        if not self.poller:
+            try:
+                fcntl.flock(self.lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                self.poller = True
+            except BlockingIOError:
+                self.poller = False
+        return self.poller
+
+    def publish(self, devices: dict):
+        """Publish a device snapshot for the other processes.
+
+        Args:
+            devices (dict): Device id to device payload.
+        """
+        index = {}
+        blobs = []
+        offset = 0
+        for device_id, device in devices.items():
+            blob = json.dumps(device, separators=(",", ":")).encode()
+            control = device.get("control") or {}
+            reported = [key for key, value in control.items() if value is not None]
+            index[device_id] = [offset, len(blob), reported]
+            blobs.append(blob)
+            offset += len(blob)
+        index_bytes = json.dumps(index, separators=(",", ":")).encode()
+        data = b"".join(blobs)
+
+        needed = HEADER.size + len(index_bytes) + len(data)
+        if needed > len(self.map):
+            os.ftruncate(self.fd, max(needed * 2, MIN_SIZE))
+            self._remap()
+
+        generation = GENERATION.unpack_from(self.map, GENERATION_OFFSET)[0]
+        if generation % 2:
+            generation += 1
+        GENERATION.pack_into(self.map, GENERATION_OFFSET, generation + 1)
+        start = HEADER.size
+        self.map[start:start + len(index_bytes)] = index_bytes
+        start += len(index_bytes)
+        self.map[start:start + len(data)] = data
+        HEADER.pack_into(
+            self.map, 0, MAGIC, VERSION, generation + 1, time.time(), len(index_bytes), len(data)
+        )
+        GENERATION.pack_into(self.map, GENERATION_OFFSET, generation + 2)
+        self.generation = generation + 2
+
+    def read(self) -> SharedDevices:
+        """Read the latest consistent snapshot.
+
+        Returns:
+            SharedDevices: Snapshot, None when nothing has been published yet
+                or a write was still in progress.
+        """
+        for _ in range(READ_RETRIES):
+            if os.fstat(self.fd).st_size != len(self.map):
+                self._remap()
+
+            before = GENERATION.unpack_from(self.map, GENERATION_OFFSET)[0]
+            if before == 0:
+                return None
+            if before % 2:
+                continue
+
+            magic, version, _, published, index_len, data_len = HEADER.unpack_from(self.map, 0)
+            start = HEADER.size
+            if (
+                magic != MAGIC
+                or version != VERSION
+                or start + index_len + data_len > len(self.map)
+            ):
+                continue
+            index_bytes = self.map[start:start + index_len]
+            data = self.map[start + index_len:start + index_len + data_len]
+
+            if GENERATION.unpack_from(self.map, GENERATION_OFFSET)[0] == before:
+                snapshot = SharedDevices(json.loads(index_bytes), data, before)
+                snapshot.published = published
+                return snapshot
+
+        return None
+
+    def load(self) -> bool:
+        """Load the shared snapshot into the session.
+
+        The previous snapshot is kept while the poller is writing, the
+        next load picks up the new one.
+
+        Returns:
+            boolean: True/False if a snapshot was available.
+        """
+        current = GENERATION.unpack_from(self.map, GENERATION_OFFSET)[0]
+        if current == self.generation and self.session.data.devices:
+            return True
+
+        snapshot = self.read()
+        if snapshot is None:
+            return self.generation != 0
+
+        self.generation = snapshot.generation
+        self.session.data.devices = snapshot
+        self.session.config.last_update = datetime.fromtimestamp(snapshot.published)
+        return True
+
+    def close(self):
+        """Release the lock and unmap the snapshot."""
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        if self.poller:
+            fcntl.flock(self.lock_fd, fcntl.LOCK_UN)
+            self.poller = False
+        os.close(self.fd)
+        os.close(self.lock_fd)
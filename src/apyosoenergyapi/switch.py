@@ -1,8 +1,6 @@
 """OSO Energy Switch Module."""
 
-from aiohttp.web_exceptions import HTTPError
-from .helper.const import switch_commands, OSOEnergySwitchData
-from datetime import datetime, timezone, timedelta
+from .helper.const import switch_fields, OSOEnergySwitchData
 
 class OSOEnergySwitch:
     """OSO Energy Switch Code.
@@ -13,51 +11,32 @@ class OSOEnergySwitch:
 
     switchType = "Switch"
 
-    async def enable_holiday_mode(self, device: OSOEnergySwitchData, period_days: int = 365):
-        """Enable holiday mode for device.
+    async def enable_holiday_mode(self, device: OSOEnergySwitchData, period_days: int = 365, timeout: float = None, confirm: float = None):
+        """Enable holiday mode for device, see `WaterHeater.enable_holiday_mode`.
 
         Args:
             device (OSOEnergySwitchData): Device to enable holiday mode for.
             period_days (int, optional): Number of days to enable holiday mode for. Defaults to 365.
+            timeout (float, optional): Seconds for the command and refresh together. Defaults to None.
+            confirm (float, optional): Seconds to wait for the device to report the new state. Defaults to None.
 
         Returns:
             boolean: return True/False if enabling holiday mode was successful.
         """
-        final = False
-        try:
-            start_date = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-            end_date = (datetime.now(timezone.utc) + timedelta(days=period_days)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-            resp = await self.session.api.enable_holiday_mode(device.device_id, start_date, end_date)
-            if resp["original"] == 200:
-                final = True
-                await self.session.get_devices()
-
-        except HTTPError as exception:
-            await self.session.log.error(exception)
-
-        return final
-    
-    async def disable_holiday_mode(self, device: OSOEnergySwitchData):
-        """Disable holiday mode for device.
+        return await self.session.hotwater.enable_holiday_mode(device, period_days, timeout, confirm)
+
+    async def disable_holiday_mode(self, device: OSOEnergySwitchData, timeout: float = None, confirm: float = None):
+        """Disable holiday mode for device, see `WaterHeater.disable_holiday_mode`.
 
         Args:
             device (OSOEnergySwitchData): Device to disable holiday mode for.
+            timeout (float, optional): Seconds for the command and refresh together. Defaults to None.
+            confirm (float, optional): Seconds to wait for the device to report the new state. Defaults to None.
 
         Returns:
             boolean: return True/False if disabling holiday mode was successful.
         """
-        final = False
-
-        try:
-            resp = await self.session.api.disable_holiday_mode(device.device_id)
-            if resp["original"] == 200:
-                final = True
-                await self.session.get_devices()
-
-        except HTTPError as exception:
-            await self.session.log.error(exception)
-
-        return final
+        return await self.session.hotwater.disable_holiday_mode(device, timeout, confirm)
 
 class Switch(OSOEnergySwitch):
     """Home Assistant switch code.
@@ -74,9 +53,8 @@ class Switch(OSOEnergySwitch):
         """
         self.session = session
 
-    async def get_switch(self, device: OSOEnergySwitchData) -> OSOEnergySwitchData:
-        # pylint: disable=eval-used
-        """Get updated switch data.
+    def read_switch(self, device: OSOEnergySwitchData) -> OSOEnergySwitchData:
+        """Get updated switch data from the cached devices without awaiting.
 
         Args:
             device (OSOEnergySwitchData): Device to update.
@@ -84,7 +62,11 @@ class Switch(OSOEnergySwitch):
         Returns:
             OSOEnergySwitchData: Updated device.
         """
-        device.online = await self.session.attr.online_offline(device.device_id)
+        field = switch_fields.get(device.osoEnergyType)
+        values = self.session.attr.project(
+            device.device_id, ("available", field) if field else ("available",)
+        )
+        device.online = values[0] if values is not None else False
         if device.online:
             self.session.helper.device_recovered(device.device_id)
             dev_data = OSOEnergySwitchData()
@@ -95,15 +77,24 @@ class Switch(OSOEnergySwitch):
             dev_data.device_id = device.device_id
             dev_data.device_type = device.device_type
             dev_data.device_name = device.device_name
-            dev_data.available = await self.session.attr.online_offline(device.device_id)
+            dev_data.available = device.online
 
-            if dev_data.osoEnergyType in switch_commands:
-                code = switch_commands.get(dev_data.osoEnergyType)
-                dev_data.state = await eval(code)
+            if field:
+                dev_data.state = values[1]
 
             self.session.switches.update({device.device_id: dev_data})
             return self.session.switches[device.device_id]
 
-        await self.session.log.error_check(
-            device.device_id, device.online)
-        return device
\ No newline at end of file
+        self.session.log.record_error(device.device_id, device.online)
+        return device
+
+    async def get_switch(self, device: OSOEnergySwitchData) -> OSOEnergySwitchData:
+        """Get updated switch data.
+
+        Args:
+            device (OSOEnergySwitchData): Device to update.
+
+        Returns:
+            OSOEnergySwitchData: Updated device.
+        """
+        return self.read_switch(device)
@@ -0,0 +1,230 @@
+"""OSO Energy Synchronous Client Module."""
+
+import asyncio
+import concurrent.futures
+import threading
+from array import array
+from numbers import Number
+
+from aiohttp import ClientSession
+
+from .helper.const import OSOEnergyWaterHeaterData
+from .osoenergy import OSOEnergy
+
+
+class OSOEnergySyncClient:
+    """Blocking OSO Energy client for synchronous code.
+
+    One event loop runs in a background thread for the lifetime of the
+    client and owns the session and its connection pool. Commands are
+    handed to that loop and waited on with a timeout. Entity reads also run
+    on the loop, because they update the session's entity caches; only the
+    raw `devices` map, which is swapped rather than modified, is read from
+    the calling thread.
+    """
+
+    def __init__(self, subscription_key: str, timeout: float = 30.0, base_url: str = None):
+        """Initialise the client and start its event loop thread.
+
+        Args:
+            subscription_key (str): OSO Energy user subscription key.
+            timeout (float, optional): Default seconds to wait for a call. Defaults to 30.0.
+            base_url (str, optional): Override the API base url. Defaults to None.
+        """
+        self.timeout = timeout
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, name="osoenergy-loop", daemon=True)
+        self.thread.start()
+        self.session = self.call(self._create(subscription_key, base_url))
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    async def _create(self, subscription_key: str, base_url: str) -> OSOEnergy:
+        session = OSOEnergy(subscription_key, ClientSession())
+        if base_url:
+            session.api.update_base_url(base_url)
+        return session
+
+    def call(self, coroutine, timeout: float = None):
+        """Run a coroutine on the client loop and wait for its result.
+
+        Args:
+            coroutine (coroutine): Coroutine to run.
+            timeout (float, optional): Seconds to wait. Defaults to `self.timeout`.
+
+        Raises:
+            RuntimeError: Called from the client loop thread itself.
+            TimeoutError: The call did not finish in time and was cancelled.
+
+        Returns:
+            Any: The coroutine result.
+        """
+        if threading.current_thread() is self.thread:
+            coroutine.close()
+            raise RuntimeError("OSOEnergySyncClient.call cannot be used from its own loop")
+
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        try:
+            return future.result(self.timeout if timeout is None else timeout)
+        except concurrent.futures.TimeoutError as exception:
+            future.cancel()
+            raise TimeoutError("OSO Energy call timed out") from exception
+
+    def start_session(self, config: dict = None, timeout: float = None) -> dict:
+        """Start the session, see `OSOEnergySession.start_session`.
+
+        Args:
+            config (dict, optional): Session configuration. Defaults to None.
+            timeout (float, optional): Seconds to wait. Defaults to `self.timeout`.
+
+        Returns:
+            dict: Entities by type.
+        """
+        return self.call(self.session.start_session(config or {}), timeout)
+
+    def refresh(self, timeout: float = None) -> bool:
+        """Refresh the device snapshot now.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Defaults to `self.timeout`.
+
+        Returns:
+            boolean: True/False if the refresh was successful.
+        """
+        async def refresh():
+            async with self.session.update_lock:
+                return await self.session.get_devices()
+
+        return self.call(refresh(), timeout)
+
+    def start_polling(self, interval: float = None, jitter: float = 0.1, phase_lock: bool = False):
+        """Refresh the snapshot in the background, see `OSOEnergySession.start_polling`.
+
+        Args:
+            interval (float, optional): Seconds between polls. Defaults to the scan interval.
+            jitter (float, optional): Fraction of the interval to randomise by. Defaults to 0.1.
+            phase_lock (bool, optional): Poll just after expected backend updates. Defaults to False.
+        """
+        async def start():
+            self.session.start_polling(interval, jitter, phase_lock)
+
+        self.call(start())
+
+    @property
+    def devices(self) -> dict:
+        """Latest device snapshot, read without a lock.
+
+        The session swaps in a new map on each refresh, so the returned
+        map is never modified while it is being read.
+        """
+        return self.session.data.devices
+
+    def read(self, func, *args, timeout: float = None):
+        """Run a non-blocking session read on the client loop.
+
+        Args:
+            func (callable): Function to call with `args`.
+            timeout (float, optional): Seconds to wait. Defaults to `self.timeout`.
+
+        Returns:
+            Any: The function result.
+        """
+        async def read():
+            return func(*args)
+
+        return self.call(read(), timeout)
+
+    def project(self, device_id: str, fields: tuple[str, ...], timeout: float = None) -> tuple:
+        """Get selected attributes of a device from the latest snapshot.
+
+        Args:
+            device_id (str): The id of the device
+            fields (tuple[str, ...]): Attribute names.
+            timeout (float, optional): Seconds to wait. Defaults to `self.timeout`.
+
+        Returns:
+            tuple: Named tuple of the requested attributes, None if the device is unknown.
+        """
+        return self.read(self.session.attr.project, device_id, fields, timeout=timeout)
+
+    def read_water_heater(self, device: OSOEnergyWaterHeaterData, timeout: float = None) -> OSOEnergyWaterHeaterData:
+        """Get a water heater from the latest snapshot.
+
+        Args:
+            device (OSOEnergyWaterHeaterData): Device to update.
+            timeout (float, optional): Seconds to wait. Defaults to `self.timeout`.
+
+        Returns:
+            OSOEnergyWaterHeaterData: Updated device.
+        """
+        return self.read(self.session.hotwater.read_water_heater, device, timeout=timeout)
+
+    def command(self, name: str, device: OSOEnergyWaterHeaterData, *args, timeout: float = None, **kwargs) -> bool:
+        """Run a water heater command and wait for it.
+
+        Args:
+            name (str): `WaterHeater` method, e.g. "set_v40_min".
+            device (OSOEnergyWaterHeaterData): Device to send the command to.
+            timeout (float, optional): Seconds to wait, also the deadline of the command. Defaults to `self.timeout`.
+
+        Returns:
+            boolean: return True/False if the command was successful.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        return self.call(
+            getattr(self.session.hotwater, name)(device, *args, timeout=timeout, **kwargs), timeout
+        )
+
+    def turn_on(self, device: OSOEnergyWaterHeaterData, full_utilization: bool, timeout: float = None) -> bool:
+        """Turn device on."""
+        return self.command("turn_on", device, full_utilization, timeout=timeout)
+
+    def turn_off(self, device: OSOEnergyWaterHeaterData, full_utilization: bool, timeout: float = None) -> bool:
+        """Turn device off."""
+        return self.command("turn_off", device, full_utilization, timeout=timeout)
+
+    def set_v40_min(self, device: OSOEnergyWaterHeaterData, v40min: float, timeout: float = None) -> bool:
+        """Set V40 Min levels for device."""
+        return self.command("set_v40_min", device, v40min, timeout=timeout)
+
+    def set_optimization_mode(self, device: OSOEnergyWaterHeaterData, option: Number, sub_option: Number, timeout: float = None) -> bool:
+        """Set heater optimization mode."""
+        return self.command("set_optimization_mode", device, option, sub_option, timeout=timeout)
+
+    def set_profile(self, device: OSOEnergyWaterHeaterData, profile: array, timeout: float = None) -> bool:
+        """Set heater profile."""
+        return self.command("set_profile", device, profile, timeout=timeout)
+
+    def enable_holiday_mode(self, device: OSOEnergyWaterHeaterData, period_days: int = 365, timeout: float = None) -> bool:
+        """Enable holiday mode for device."""
+        return self.command("enable_holiday_mode", device, period_days, timeout=timeout)
+
+    def disable_holiday_mode(self, device: OSOEnergyWaterHeaterData, timeout: float = None) -> bool:
+        """Disable holiday mode for device."""
+        return self.command("disable_holiday_mode", device, timeout=timeout)
+
+    def close(self):
+        """Stop polling, close the connection pool and stop the loop thread."""
+        if not self.loop.is_running():
+            return
+
+        async def close():
+            await self.session.close()
+            await self.session.api.websession.close()
+
+        try:
+            self.call(close())
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            self.loop.close()
+
+    def __enter__(self):
+        """Use the client as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the client."""
+        self.close()
@@ -3,7 +3,10 @@
 from array import array
 from numbers import Number
 from aiohttp.web_exceptions import HTTPError
+from .convergence import expected_state, reached
 from .helper.const import OSOTOHA, OSOEnergyWaterHeaterData
+from .helper.osoenergy_exceptions import OSOEnergyInvalidCommand, OSOEnergyInvalidProfile
+from .profile import OSOEnergyProfile
 from datetime import datetime, timezone, timedelta
 
 
@@ -38,169 +41,276 @@ class OSOWaterHeater:
 
         return final
 
-    async def turn_on(self, device: OSOEnergyWaterHeaterData, full_utilization: bool):
+    async def check_command(self, device: OSOEnergyWaterHeaterData, command: str, *args) -> bool | None:
+        """Decide a command locally from the cached device state.
+
+        Args:
+            device (OSOEnergyWaterHeaterData): Device the command is for.
+            command (str): Command name, e.g. "set_v40_min".
+
+        Returns:
+            boolean: True if the device already has the target state, False if the
+            value is out of range, None if the command has to be sent.
+        """
+        device_data = self.session.data.devices.get(device.device_id)
+
+        try:
+            if command == "set_profile":
+                OSOEnergyProfile(args[0]).validate()
+            elif command == "set_v40_min" and device_data is not None:
+                low = device_data.get("v40LevelMin")
+                high = device_data.get("v40LevelMax")
+                if (low is not None and args[0] < low) or (high is not None and args[0] > high):
+                    raise OSOEnergyInvalidCommand(
+                        f"V40 Min {args[0]} is outside {low} - {high} for {device.device_id}"
+                    )
+        except (OSOEnergyInvalidCommand, OSOEnergyInvalidProfile) as exception:
+            await self.session.log.error(exception)
+            return False
+
+        if device_data is None or command in ("turn_on", "turn_off"):
+            return None
+        if command == "enable_holiday_mode" and self.holiday_days.get(device.device_id) != (args[0] if args else 365):
+            # Already on, but not known to be for the requested period.
+            return None
+        if reached(expected_state(command, *args), device_data, 0):
+            return True
+        return None
+
+    async def turn_on(self, device: OSOEnergyWaterHeaterData, full_utilization: bool, timeout: float = None, confirm: float = None):
         """Turn device on.
 
         Args:
             device (OSOEnergyWaterHeaterData): Device to turn on.
             full_utilization (bool): Fully utilize device.
+            timeout (float, optional): Seconds for the command and refresh together. Defaults to None.
+            confirm (float, optional): Seconds to wait for the device to report the new state. Defaults to None.
 
         Returns:
             boolean: return True/False if turn on was successful.
         """
         final = False
 
-        try:
-            resp = await self.session.api.turn_on(device.device_id, full_utilization)
-            if resp["original"] == 200:
-                final = True
-                await self.session.get_devices()
+        with self.session.api.deadline(timeout):
+            try:
+                resp = await self.session.api.turn_on(device.device_id, full_utilization)
+                if resp["original"] == 200:
+                    final = True
+                    await self.session.get_devices()
+                    if confirm is not None:
+                        final = await self.session.convergence.confirm(
+                            device.device_id, "turn_on", confirm
+                        )
 
-        except HTTPError as exception:
-            await self.session.log.error(exception)
+            except HTTPError as exception:
+                await self.session.log.error(exception)
 
         return final
 
-    async def turn_off(self, device: OSOEnergyWaterHeaterData, full_utilization: bool):
+    async def turn_off(self, device: OSOEnergyWaterHeaterData, full_utilization: bool, timeout: float = None, confirm: float = None):
         """Turn device off.
 
         Args:
             device (OSOEnergyWaterHeaterData): Device to turn off.
             full_utilization (bool): Fully utilize device.
+            timeout (float, optional): Seconds for the command and refresh together. Defaults to None.
+            confirm (float, optional): Seconds to wait for the device to report the new state. Defaults to None.
 
         Returns:
             boolean: return True/False if turn off was successful.
         """
         final = False
 
-        try:
-            resp = await self.session.api.turn_off(device.device_id, full_utilization)
-            if resp["original"] == 200:
-                final = True
-                await self.session.get_devices()
+        with self.session.api.deadline(timeout):
+            try:
+                resp = await self.session.api.turn_off(device.device_id, full_utilization)
+                if resp["original"] == 200:
+                    final = True
+                    await self.session.get_devices()
+                    if confirm is not None:
+                        final = await self.session.convergence.confirm(
+                            device.device_id, "turn_off", confirm
+                        )
 
-        except HTTPError as exception:
-            await self.session.log.error(exception)
+            except HTTPError as exception:
+                await self.session.log.error(exception)
 
         return final
 
-    async def set_v40_min(self, device: OSOEnergyWaterHeaterData, v40min: float):
+    async def set_v40_min(self, device: OSOEnergyWaterHeaterData, v40min: float, timeout: float = None, confirm: float = None):
         """Set V40 Min levels for device.
 
         Args:
             device (OSOEnergyWaterHeaterData): Device to turn off.
             v40Min (float): quantity of water at 40°C.
+            timeout (float, optional): Seconds for the command and refresh together. Defaults to None.
+            confirm (float, optional): Seconds to wait for the device to report the new state. Defaults to None.
 
         Returns:
             boolean: return True/False if setting the V40Min was successful.
         """
+        local = await self.check_command(device, "set_v40_min", v40min)
+        if local is not None:
+            return local
+
         final = False
 
-        try:
-            resp = await self.session.api.set_v40_min(device.device_id, v40min)
-            if resp["original"] == 200:
-                final = True
-                await self.session.get_devices()
+        with self.session.api.deadline(timeout):
+            try:
+                resp = await self.session.api.set_v40_min(device.device_id, v40min)
+                if resp["original"] == 200:
+                    final = True
+                    await self.session.get_devices()
+                    if confirm is not None:
+                        final = await self.session.convergence.confirm(
+                            device.device_id, "set_v40_min", confirm, v40min
+                        )
 
-        except HTTPError as exception:
-            await self.session.log.error(exception)
+            except HTTPError as exception:
+                await self.session.log.error(exception)
 
         return final
 
-    async def set_optimization_mode(self, device: OSOEnergyWaterHeaterData, option: Number, sub_option: Number):
+    async def set_optimization_mode(self, device: OSOEnergyWaterHeaterData, option: Number, sub_option: Number, timeout: float = None, confirm: float = None):
         """Set heater optimization mode.
 
         Args:
             device (OSOEnergyWaterHeaterData): Device to turn off.
             option (Number): heater optimization option.
             sub_option (Number): heater optimization sub option.
+            timeout (float, optional): Seconds for the command and refresh together. Defaults to None.
+            confirm (float, optional): Seconds to wait for the device to report the new state. Defaults to None.
 
         Returns:
             boolean: return True/False if setting the optimization mode was successful.
         """
+        local = await self.check_command(device, "set_optimization_mode", option, sub_option)
+        if local is not None:
+            return local
+
         final = False
 
-        try:
-            resp = await self.session.api.set_optimization_mode(
-                device.device_id,
-                optimizationOptions=option,
-                optimizationSubOptions=sub_option
-            )
-            if resp["original"] == 200:
-                final = True
-                await self.session.get_devices()
-
-        except HTTPError as exception:
-            await self.session.log.error(exception)
+        with self.session.api.deadline(timeout):
+            try:
+                resp = await self.session.api.set_optimization_mode(
+                    device.device_id,
+                    optimizationOptions=option,
+                    optimizationSubOptions=sub_option
+                )
+                if resp["original"] == 200:
+                    final = True
+                    await self.session.get_devices()
+                    if confirm is not None:
+                        final = await self.session.convergence.confirm(
+                            device.device_id, "set_optimization_mode", confirm, option, sub_option
+                        )
+
+            except HTTPError as exception:
+                await self.session.log.error(exception)
 
         return final
 
-    async def set_profile(self, device: OSOEnergyWaterHeaterData, profile: array):
+    async def set_profile(self, device: OSOEnergyWaterHeaterData, profile: array | OSOEnergyProfile, timeout: float = None, confirm: float = None):
         """Set heater profile.
 
         Args:
             device (OSOEnergyWaterHeaterData): Device to set profile to.
-            profile (array): array of temperatures for 24 hours (UTC).
+            profile (array | OSOEnergyProfile): array of temperatures for 24 hours (UTC).
+            timeout (float, optional): Seconds for the command and refresh together. Defaults to None.
+            confirm (float, optional): Seconds to wait for the device to report the new state. Defaults to None.
 
         Returns:
             boolean: return True/False if setting the profile was successful.
         """
+        local = await self.check_command(device, "set_profile", profile)
+        if local is not None:
+            return local
+
         final = False
 
-        try:
-            resp = await self.session.api.set_profile(device.device_id, hours=profile)
-            if resp["original"] == 200:
-                final = True
-                await self.session.get_devices()
+        with self.session.api.deadline(timeout):
+            try:
+                resp = await self.session.api.set_profile(device.device_id, hours=profile)
+                if resp["original"] == 200:
+                    final = True
+                    await self.session.get_devices()
+                    if confirm is not None:
+                        final = await self.session.convergence.confirm(
+                            device.device_id, "set_profile", confirm, profile
+                        )
 
-        except HTTPError as exception:
-            await self.session.log.error(exception)
+            except HTTPError as exception:
+                await self.session.log.error(exception)
 
         return final
     
-    async def enable_holiday_mode(self, device: OSOEnergyWaterHeaterData, period_days: int = 365):
+    async def enable_holiday_mode(self, device: OSOEnergyWaterHeaterData, period_days: int = 365, timeout: float = None, confirm: float = None):
         """Enable holiday mode for device.
 
         Args:
             device (OSOEnergyWaterHeaterData): Device to enable holiday mode for.
             period_days (int, optional): Number of days to enable holiday mode for. Defaults to 365.
+            timeout (float, optional): Seconds for the command and refresh together. Defaults to None.
+            confirm (float, optional): Seconds to wait for the device to report the new state. Defaults to None.
 
         Returns:
             boolean: return True/False if enabling holiday mode was successful.
         """
+        local = await self.check_command(device, "enable_holiday_mode", period_days)
+        if local is not None:
+            return local
+
         final = False
-        try:
-            start_date = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-            end_date = (datetime.now(timezone.utc) + timedelta(days=period_days)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-            resp = await self.session.api.enable_holiday_mode(device.device_id, start_date, end_date)
-            if resp["original"] == 200:
-                final = True
-                await self.session.get_devices()
-
-        except HTTPError as exception:
-            await self.session.log.error(exception)
+        with self.session.api.deadline(timeout):
+            try:
+                start_date = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+                end_date = (datetime.now(timezone.utc) + timedelta(days=period_days)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+                resp = await self.session.api.enable_holiday_mode(device.device_id, start_date, end_date)
+                if resp["original"] == 200:
+                    final = True
+                    self.holiday_days[device.device_id] = period_days
+                    await self.session.get_devices()
+                    if confirm is not None:
+                        final = await self.session.convergence.confirm(
+                            device.device_id, "enable_holiday_mode", confirm
+                        )
+
+            except HTTPError as exception:
+                await self.session.log.error(exception)
 
         return final
     
-    async def disable_holiday_mode(self, device: OSOEnergyWaterHeaterData):
+    async def disable_holiday_mode(self, device: OSOEnergyWaterHeaterData, timeout: float = None, confirm: float = None):
         """Disable holiday mode for device.
 
         Args:
             device (OSOEnergyWaterHeaterData): Device to disable holiday mode for.
+            timeout (float, optional): Seconds for the command and refresh together. Defaults to None.
+            confirm (float, optional): Seconds to wait for the device to report the new state. Defaults to None.
 
         Returns:
             boolean: return True/False if disabling holiday mode was successful.
         """
-        final = False
+        local = await self.check_command(device, "disable_holiday_mode")
+        if local is not None:
+            return local
 
-        try:
-            resp = await self.session.api.disable_holiday_mode(device.device_id)
-            if resp["original"] == 200:
-                final = True
-                await self.session.get_devices()
+        final = False
 
-        except HTTPError as exception:
-            await self.session.log.error(exception)
+        with self.session.api.deadline(timeout):
+            try:
+                resp = await self.session.api.disable_holiday_mode(device.device_id)
+                if resp["original"] == 200:
+                    final = True
+                    self.holiday_days.pop(device.device_id, None)
+                    await self.session.get_devices()
+                    if confirm is not None:
+                        final = await self.session.convergence.confirm(
+                            device.device_id, "disable_holiday_mode", confirm
+                        )
+
+            except HTTPError as exception:
+                await self.session.log.error(exception)
 
         return final
 
@@ -219,9 +329,10 @@ class WaterHeater(OSOWaterHeater):
             session (object, optional): Session to interact with account. Defaults to None.
         """
         self.session = session
+        self.holiday_days = {}
 
-    async def get_water_heater(self, device: OSOEnergyWaterHeaterData) -> OSOEnergyWaterHeaterData:
-        """Update water heater device.
+    def read_water_heater(self, device: OSOEnergyWaterHeaterData) -> OSOEnergyWaterHeaterData:
+        """Update water heater device from the cached devices without awaiting.
 
         Args:
             device (OSOEnergyWaterHeaterData): device to update.
@@ -229,39 +340,49 @@ class WaterHeater(OSOWaterHeater):
         Returns:
             OSOEnergyWaterHeaterData: Updated device.
         """
-        device.online = await self.session.attr.online_offline(device.device_id)
+        record = self.session.attr.record(device.device_id)
+        device.online = record.available if record is not None else False
         if(device.online):
             self.session.helper.device_recovered(device.device_id)
-            
+
             dev_data = OSOEnergyWaterHeaterData()
             dev_data.ha_name = device.ha_name
             dev_data.ha_type = device.ha_type
             dev_data.device_id = device.device_id
             dev_data.device_type = device.device_type
             dev_data.device_name = device.device_name
-            dev_data.current_operation = await self.get_heater_state(device)
-
-            attributes = await self.session.attr.state_attributes(device.device_id)
-
-            dev_data.available = attributes.get("available")
-            dev_data.optimization_mode = attributes.get("optimization_mode")
-            dev_data.heater_state = attributes.get("heater_state")
-            dev_data.heater_mode = attributes.get("heater_mode")
-            dev_data.current_temperature = attributes.get("current_temperature")
-            dev_data.target_temperature = attributes.get("target_temperature")
-            dev_data.target_temperature_low = attributes.get("target_temperature_low")
-            dev_data.target_temperature_high = attributes.get("target_temperature_high")
-            dev_data.min_temperature = attributes.get("min_temperature")
-            dev_data.max_temperature = attributes.get("max_temperature")
-            dev_data.profile = attributes.get("profile")
-            dev_data.power_load = attributes.get("power_load")
-            dev_data.volume = attributes.get("volume")
-            dev_data.isInPowerSave = attributes.get("isInPowerSave", False)
+            dev_data.current_operation = record.current_operation
+            dev_data.available = record.available
+            dev_data.optimization_mode = record.optimization_mode
+            dev_data.heater_state = record.heater_state
+            dev_data.heater_mode = record.heater_mode
+            dev_data.current_temperature = record.current_temperature
+            dev_data.target_temperature = record.target_temperature
+            dev_data.target_temperature_low = record.target_temperature_low
+            dev_data.target_temperature_high = record.target_temperature_high
+            dev_data.min_temperature = record.min_temperature
+            dev_data.max_temperature = record.max_temperature
+            dev_data.profile = record.profile
+            dev_data.power_load = record.power_load
+            dev_data.volume = record.volume
+            dev_data.isInPowerSave = record.isInPowerSave
 
             self.session.devices.update({device.device_id: dev_data})
             return self.session.devices[device.device_id]
 
-        await self.session.log.error_check(
-            device.device_id, device.online
-        )
+        self.session.log.record_error(device.device_id, device.online)
         return device
+
+    async def get_water_heater(self, device: OSOEnergyWaterHeaterData, max_age: float = None) -> OSOEnergyWaterHeaterData:
+        """Update water heater device.
+
+        Args:
+            device (OSOEnergyWaterHeaterData): device to update.
+            max_age (float, optional): Refresh in the background when the data is older, see `read_devices`. Defaults to None.
+
+        Returns:
+            OSOEnergyWaterHeaterData: Updated device.
+        """
+        if max_age is not None:
+            await self.session.read_devices(max_age)
+        return self.read_water_heater(device)
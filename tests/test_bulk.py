@@ -0,0 +1,118 @@
+"""Tests for bulk commands."""
+
+import asyncio
+import json
+
+from apyosoenergyapi import OSOEnergy
+from apyosoenergyapi.helper.osoenergy_exceptions import OSOEnergyInvalidCommand, OSOEnergyInvalidProfile
+
+
+def make_session(sent: list) -> OSOEnergy:
+    """Session whose API fails for device "bad" with a non-HTTP error."""
+    session = OSOEnergy("K")
+
+    async def set_v40_min(device_id, v40min):
+        if device_id == "bad":
+            raise json.JSONDecodeError("Expecting value", "<html>", 0)
+        sent.append(device_id)
+        return {"original": 200}
+
+    async def set_profile(device_id, **kwargs):
+        sent.append(device_id)
+        return {"original": 200}
+
+    async def get_devices():
+        return True
+
+    session.api.set_v40_min = set_v40_min
+    session.api.set_profile = set_profile
+    session.get_devices = get_devices
+    return session
+
+
+def test_one_failing_device_keeps_the_other_results():
+    """A non-HTTP error is reported for its device only."""
+    sent = []
+
+    async def run():
+        session = make_session(sent)
+        result = await session.bulk.set_v40_min(["a", "bad", "b"], 200)
+        await session.close()
+        return result
+
+    result = asyncio.run(run())
+    assert result.results == {"a": True, "bad": False, "b": True}
+    assert isinstance(result.errors["bad"], json.JSONDecodeError)
+    assert sorted(sent) == ["a", "b"]
+
+
+def test_invalid_profiles_are_not_sent():
+    """Bulk profiles are validated before anything is sent."""
+    sent = []
+
+    async def run():
+        session = make_session(sent)
+        shared = await session.bulk.set_profile(["a", "b"], [200] * 24)
+        mixed = await session.bulk.set_profiles({"a": [50] * 24, "b": [200] * 24})
+        await session.close()
+        return shared, mixed
+
+    shared, mixed = asyncio.run(run())
+    assert shared.results == {"a": False, "b": False}
+    assert isinstance(shared.errors["a"], OSOEnergyInvalidProfile)
+    assert mixed.results == {"a": True, "b": False}
+    assert isinstance(mixed.errors["b"], OSOEnergyInvalidProfile)
+    assert sent == ["a"]
+
+
+def test_bulk_setters_are_checked_like_single_commands():
+    """Out of range and already applied values are decided without a request."""
+    sent = []
+
+    async def run():
+        session = make_session(sent)
+        session.data.devices = {
+            "a": {"deviceId": "a", "v40Min": 200.0, "v40LevelMin": 150.0, "v40LevelMax": 350.0},
+            "b": {"deviceId": "b", "v40Min": 250.0, "v40LevelMin": 150.0, "v40LevelMax": 300.0},
+            "c": {"deviceId": "c", "v40Min": 250.0, "v40LevelMin": 150.0, "v40LevelMax": 400.0},
+        }
+        result = await session.bulk.set_v40_min(["a", "b", "c"], 320)
+        await session.close()
+        return result
+
+    result = asyncio.run(run())
+    assert result.results == {"a": True, "b": False, "c": True}
+    assert isinstance(result.errors["b"], OSOEnergyInvalidCommand)
+    assert sorted(sent) == ["a", "c"]
+
+    sent.clear()
+
+    async def unchanged():
+        session = make_session(sent)
+        session.data.devices = {"a": {"deviceId": "a", "v40Min": 320.0}}
+        result = await session.bulk.set_v40_min(["a"], 320)
+        await session.close()
+        return result
+
+    assert asyncio.run(unchanged()).results == {"a": True}
+    assert sent == []
+
+
+def test_any_2xx_status_is_a_bulk_success():
+    """Bulk results use the same success check as the rest of the client."""
+    async def run():
+        session = OSOEnergy("K")
+
+        async def turn_on(device_id, full_utilization):
+            return {"original": 204}
+
+        async def get_devices():
+            return True
+
+        session.api.turn_on = turn_on
+        session.get_devices = get_devices
+        result = await session.bulk.turn_on(["a"], False)
+        await session.close()
+        return result
+
+    assert asyncio.run(run()).results == {"a": True}
@@ -0,0 +1,111 @@
+"""Tests for the bounded entity cache."""
+
+import asyncio
+
+from apyosoenergyapi import OSOEnergy
+from apyosoenergyapi.benchmark import StandInServer
+from apyosoenergyapi.helper.cache import OSOEnergyCache
+from apyosoenergyapi.shared_cache import OSOEnergySharedCache
+
+
+def test_reads_refresh_the_lru_order():
+    """The least recently used entry is dropped, not the oldest write."""
+    evicted = []
+    cache = OSOEnergyCache(max_size=2, on_evict=evicted.append)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1
+    cache["c"] = 3
+    assert evicted == ["b"]
+    assert list(cache.keys()) == ["a", "c"]
+
+
+def test_views_skip_expired_entries(monkeypatch):
+    """keys, values and items only show entries within the ttl."""
+    now = [100.0]
+    monkeypatch.setattr("apyosoenergyapi.helper.cache.time.monotonic", lambda: now[0])
+    cache = OSOEnergyCache(ttl=10)
+    cache["old"] = 1
+    now[0] += 8
+    cache["new"] = 2
+    now[0] += 5
+    assert "old" not in cache
+    assert list(cache.items()) == [("new", 2)]
+    assert list(cache.values()) == [2]
+    assert len(cache) == 1
+
+
+def test_shared_cache_reader_evicts_removed_devices(tmp_path):
+    """Readers forget devices the poller no longer publishes."""
+    async def run():
+        poller = OSOEnergy("K")
+        reader = OSOEnergy("K")
+        poller.shared_cache = OSOEnergySharedCache(poller, str(tmp_path / "devices"))
+        reader.shared_cache = OSOEnergySharedCache(reader, str(tmp_path / "devices"))
+        assert poller.shared_cache.is_poller()
+        removed = []
+        reader.add_removal_listener(removed.append)
+
+        poller.shared_cache.publish({"a": {"deviceId": "a"}, "b": {"deviceId": "b"}})
+        await reader.get_devices()
+        reader.sensors["b"] = object()
+        reader.config.error_list["b"] = "error"
+
+        poller.shared_cache.publish({"a": {"deviceId": "a"}})
+        await reader.get_devices()
+        await poller.close()
+        await reader.close()
+        return reader, removed
+
+    reader, removed = asyncio.run(run())
+    assert removed == ["b"]
+    assert "b" not in reader.sensors
+    assert "b" not in reader.config.error_list
+
+
+def test_indexing_while_iterating_keeps_the_order():
+    """Reads during iteration neither reorder nor break the walk."""
+    for cache in (OSOEnergyCache(), OSOEnergyCache(max_size=10, ttl=60)):
+        for key in "abc":
+            cache[key] = key.upper()
+        assert cache["a"] == "A"
+        assert {key: cache[key] for key in cache} == {"a": "A", "b": "B", "c": "C"}
+        assert list(cache) == ["a", "b", "c"]
+        repr(cache)
+
+
+def test_limit_set_later_drops_the_least_recently_used():
+    """Entries read before a size limit was set still count as recent."""
+    cache = OSOEnergyCache()
+    for key in "abc":
+        cache[key] = key
+    cache.get("a")
+    cache.max_size = 2
+    assert cache.prune() == ["b"]
+
+
+def test_removing_the_last_heater_evicts_it():
+    """An empty device list still evicts the heaters that were removed."""
+    async def run():
+        server = StandInServer(device_count=1)
+        base_url = await server.start()
+        session = OSOEnergy("K")
+        session.api.update_base_url(base_url)
+        removed = []
+        session.add_removal_listener(removed.append)
+        try:
+            assert await session.get_devices()
+            device_id = next(iter(session.data.devices))
+            session.sensors[device_id] = object()
+
+            server.devices = []
+            assert await session.get_devices()
+            return device_id, removed, session
+        finally:
+            await session.close()
+            await server.stop()
+
+    device_id, removed, session = asyncio.run(run())
+    assert removed == [device_id]
+    assert device_id not in session.sensors
+    assert session.data.devices == {}
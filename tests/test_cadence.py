@@ -0,0 +1,54 @@
+"""Tests for the upstream cadence estimator."""
+
+import asyncio
+
+from apyosoenergyapi import OSOEnergy
+from apyosoenergyapi.benchmark import StandInServer
+from apyosoenergyapi.cadence import OSOEnergyCadence
+
+
+def test_only_telemetry_changes_count():
+    """A setting changed by a command is not a backend update."""
+    cadence = OSOEnergyCadence()
+    device = {"control": {"currentTemperature": 60.0}, "data": {}, "v40Min": 200.0}
+    cadence.observe({"a": device}, now=0)
+    cadence.observe({"a": {**device, "v40Min": 250.0}}, now=10)
+    cadence.observe({"a": {**device, "control": {"currentTemperature": 61.0}}}, now=20)
+    assert cadence.stats.unchanged == 1
+    assert list(cadence.changes) == [(10, 20)]
+
+
+def test_update_timestamps_are_compared_when_configured():
+    """With a timestamp path only that timestamp decides."""
+    cadence = OSOEnergyCadence(timestamp_path=("status", "updated"))
+    cadence.observe({"a": {"status": {"updated": 1}, "control": {"t": 1}}}, now=0)
+    cadence.observe({"a": {"status": {"updated": 1}, "control": {"t": 2}}}, now=10)
+    cadence.observe({"a": {"status": {"updated": 2}, "control": {"t": 2}}}, now=20)
+    assert list(cadence.changes) == [(10, 20)]
+
+
+def test_unscheduled_refreshes_are_not_observed():
+    """Refreshes outside the poll schedule leave the estimate alone."""
+    async def run():
+        server = StandInServer(device_count=1)
+        base_url = await server.start()
+        session = OSOEnergy("K")
+        session.api.update_base_url(base_url)
+        assert await session.get_devices()
+        polls = session.cadence.stats.polls
+        await session.close()
+        await server.stop()
+        return polls
+
+    assert asyncio.run(run()) == 0
+
+
+def test_turning_a_heater_on_or_off_is_not_an_update():
+    """The heater state and mode follow commands, not backend updates."""
+    cadence = OSOEnergyCadence()
+    device = {"control": {"heater": "on", "mode": "auto", "currentTemperature": 60.0}, "data": {}}
+    cadence.observe({"a": device}, now=0)
+    cadence.observe({"a": {**device, "control": {**device["control"], "heater": "off", "mode": "off"}}}, now=10)
+    cadence.observe({"a": {**device, "control": {**device["control"], "heater": "on"}}}, now=20)
+    assert cadence.stats.unchanged == 2
+    assert not cadence.changes
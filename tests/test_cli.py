@@ -0,0 +1,49 @@
+"""Tests for the command line interface."""
+
+import asyncio
+
+from aiohttp import ClientSession
+
+from apyosoenergyapi import __main__ as cli
+from apyosoenergyapi.benchmark import StandInServer
+
+
+def test_proxy_starts_and_serves_cached_devices(monkeypatch):
+    """The proxy subcommand starts against a stand-in and stops cleanly."""
+    records = []
+    monkeypatch.setattr(cli, "_emit", records.append)
+
+    async def run():
+        server = StandInServer(device_count=2)
+        base_url = await server.start()
+        args = cli.parse_args(["--key", "K", "--base-url", base_url, "proxy", "--port", "0", "--interval", "30"])
+        task = asyncio.create_task(args.handler(args))
+        try:
+            for _ in range(100):
+                if records or task.done():
+                    break
+                await asyncio.sleep(0.05)
+            assert not task.done(), task.exception()
+
+            async with ClientSession() as websession:
+                async with websession.get(
+                    records[0]["base_url"] + "/1/Device/All",
+                    headers={"Ocp-Apim-Subscription-Key": "K"},
+                ) as resp:
+                    assert resp.status == 200
+                    assert len(await resp.json()) == 2
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await server.stop()
+
+    asyncio.run(run())
+    assert records[0]["event"] == "proxy_started"
+
+
+def test_documented_usage_parses():
+    """Every usage example in the module docstring is accepted."""
+    for line in cli.__doc__.splitlines():
+        words = line.split()
+        if words[:3] == ["python", "-m", "apyosoenergyapi"]:
+            assert cli.parse_args(words[3:]).handler is not None
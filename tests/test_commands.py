@@ -0,0 +1,75 @@
+"""Tests for the command queue."""
+
+import asyncio
+
+import pytest
+from aiohttp import ServerDisconnectedError
+
+from apyosoenergyapi import OSOEnergy
+
+
+def run_queue(send):
+    """Submit one command with `_send` replaced, returning the queue and future."""
+    async def run():
+        session = OSOEnergy("K")
+        session.get_devices = lambda: asyncio.sleep(0, True)
+        session.commands.delay = 0
+        session.commands._send = send
+        future = session.commands.submit("device", "set_v40_min", 250)
+        await asyncio.sleep(0.05)
+        state = (future, dict(session.commands.pending), set(session.commands.buffered))
+        if not future.done():
+            session.commands.resume()
+            await asyncio.wait([future], timeout=1)
+        await session.close()
+        return state
+
+    return asyncio.run(run())
+
+
+def test_unreachable_command_is_requeued():
+    """A dropped connection keeps the command queued and sends it on resume."""
+    calls = []
+
+    async def send(device_id, command, args):
+        calls.append(command)
+        if len(calls) == 1:
+            raise ServerDisconnectedError()
+        return {"original": 200}
+
+    future, pending, buffered = run_queue(send)
+    assert "device" in pending and buffered == {"device"}
+    assert future.result() is True
+    assert calls == ["set_v40_min", "set_v40_min"]
+
+
+def test_unexpected_error_resolves_the_future():
+    """Any other error reaches the caller instead of leaving it waiting."""
+    async def send(device_id, command, args):
+        raise KeyError(command)
+
+    future, pending, buffered = run_queue(send)
+    assert pending == {} and buffered == set()
+    with pytest.raises(KeyError):
+        future.result()
+
+
+def test_close_during_a_send_resolves_the_command():
+    """Commands already taken off the queue are superseded when closing."""
+    async def run():
+        session = OSOEnergy("K")
+        session.commands.delay = 0
+        started = asyncio.Event()
+
+        async def send(device_id, command, args):
+            started.set()
+            await asyncio.sleep(10)
+
+        session.commands._send = send
+        future = session.commands.submit("device", "set_v40_min", 250)
+        await asyncio.wait_for(started.wait(), 1)
+        await session.close()
+        return future
+
+    future = asyncio.run(run())
+    assert future.done() and future.result() is None
@@ -0,0 +1,162 @@
+"""Tests for the session refresh paths."""
+
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from aiohttp import ServerDisconnectedError
+
+from apyosoenergyapi import OSOEnergy
+from apyosoenergyapi.benchmark import StandInServer
+from apyosoenergyapi.helper.offload import decode_json
+
+
+def test_poller_survives_a_failed_refresh():
+    """A transport error counts as a failed poll and polling carries on."""
+    async def run():
+        session = OSOEnergy("K")
+        calls = []
+
+        async def get_devices():
+            calls.append(None)
+            if len(calls) == 1:
+                raise ServerDisconnectedError()
+            return True
+
+        session.get_devices = get_devices
+        session.start_polling(interval=0.01, jitter=0)
+        for _ in range(100):
+            if session.poll_stats.polls >= 3:
+                break
+            await asyncio.sleep(0.01)
+        await session.close()
+        return session
+
+    session = asyncio.run(run())
+    assert session.poll_stats.polls >= 3
+    assert session.poll_stats.failed == 1
+    assert isinstance(session.config.last_error, ServerDisconnectedError)
+
+
+def test_background_refresh_failure_keeps_the_stale_snapshot():
+    """A non-HTTP error while revalidating is recorded, not raised."""
+    async def run():
+        session = OSOEnergy("K")
+        session.data.devices = {"device": {"deviceId": "device"}}
+        session.config.last_update = datetime.now() - timedelta(minutes=5)
+
+        async def get_devices():
+            raise json.JSONDecodeError("Expecting value", "<html>", 0)
+
+        session.get_devices = get_devices
+        first = await session.read_devices(max_age=60)
+        task = session.revalidate_task
+        await asyncio.gather(task, return_exceptions=True)
+        second = await session.read_devices(max_age=60)
+        await session.close()
+        return task, first, second
+
+    task, first, second = asyncio.run(run())
+    assert first.stale and first.devices == {"device": {"deviceId": "device"}}
+    assert task.result() is False
+    assert isinstance(second.last_error, json.JSONDecodeError)
+    assert second.last_failure is not None
+
+
+def test_update_lock_is_never_leaked_by_a_timed_out_wait():
+    """Giving up on the lock just as it frees up leaves it unlocked."""
+    async def run():
+        session = OSOEnergy("K")
+        loop = asyncio.get_running_loop()
+        lock = session.update_lock
+        for step in range(-5, 6):
+            await lock.acquire()
+            loop.call_later(0.01 + step / 2000, lock.release)
+            if await session._acquire_update_lock(0.01):
+                lock.release()
+            await asyncio.sleep(0.01)
+            assert not lock.locked(), step
+
+        await lock.acquire()
+        waiter = asyncio.create_task(session._acquire_update_lock(None))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        lock.release()
+        await asyncio.gather(waiter, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert not lock.locked()
+        await session.close()
+
+    asyncio.run(run())
+
+
+def test_sensors_option_is_kept_in_config():
+    """The explicit sensors option replaces the call stack detection."""
+    async def run():
+        server = StandInServer(device_count=1)
+        base_url = await server.start()
+        session = OSOEnergy("K")
+        session.api.update_base_url(base_url)
+        default = session.config.sensors
+        await session.start_session({"api_key": "K", "sensors": True})
+        await session.close()
+        await server.stop()
+        return default, session.config.sensors
+
+    assert asyncio.run(run()) == (False, True)
+
+
+def test_export_failure_does_not_fail_the_poll():
+    """An export error is logged by its own task and the refresh still succeeds."""
+    class FailingExporter:
+        previous = {}
+
+        def __init__(self):
+            self.release = asyncio.Event()
+
+        async def export(self, devices):
+            await self.release.wait()
+            raise OSError("No space left on device")
+
+        async def close(self):
+            pass
+
+    async def run():
+        server = StandInServer(device_count=1)
+        base_url = await server.start()
+        session = OSOEnergy("K")
+        session.api.update_base_url(base_url)
+        session.exporter = FailingExporter()
+        try:
+            result = await asyncio.wait_for(session.get_devices(), 5)
+            pending = len(session.export_tasks)
+            session.exporter.release.set()
+            await asyncio.gather(*session.export_tasks, return_exceptions=True)
+            return result, pending, session.config.last_error
+        finally:
+            await session.close()
+            await server.stop()
+
+    assert asyncio.run(run()) == (True, 1, None)
+
+
+def test_offload_only_reports_savings_for_process_executors():
+    """Thread executors count calls and bytes but no saved loop time."""
+    body = json.dumps([{"deviceId": str(i)} for i in range(1000)]).encode()
+
+    async def run(executor):
+        session = OSOEnergy("K")
+        session.config.offload_executor = executor
+        try:
+            await session.offload(decode_json, body, size=len(body))
+        finally:
+            await session.close()
+            executor.shutdown()
+        return session.offload_stats
+
+    threaded = asyncio.run(run(ThreadPoolExecutor(1)))
+    assert (threaded.calls, threaded.bytes, threaded.saved_seconds) == (1, len(body), 0.0)
+    processes = asyncio.run(run(ProcessPoolExecutor(1)))
+    assert (processes.calls, processes.bytes) == (1, len(body))
+    assert processes.saved_seconds > 0
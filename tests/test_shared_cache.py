@@ -0,0 +1,125 @@
+"""Tests for the shared device cache."""
+
+import asyncio
+import time
+
+from apyosoenergyapi import OSOEnergy
+from apyosoenergyapi.shared_cache import GENERATION, GENERATION_OFFSET, OSOEnergySharedCache
+
+
+def device(device_id: str, temperature: float, top: float = None) -> dict:
+    """Heater payload with the given readings."""
+    return {
+        "deviceId": device_id,
+        "deviceName": f"Heater {device_id}",
+        "control": {"currentTemperatureOne": temperature, "currentTemperatureTop": top},
+    }
+
+
+def test_reader_discovery_does_not_decode_unchanged_heaters(tmp_path):
+    """Readers only decode the heaters they create entities for."""
+    async def run():
+        poller = OSOEnergy("K")
+        reader = OSOEnergy("K")
+        poller.shared_cache = OSOEnergySharedCache(poller, str(tmp_path / "devices"))
+        reader.shared_cache = OSOEnergySharedCache(reader, str(tmp_path / "devices"))
+        assert poller.shared_cache.is_poller()
+
+        poller.shared_cache.publish({str(i): device(str(i), 50) for i in range(50)})
+        assert await reader.get_devices()
+        await reader.create_devices()
+        assert len(reader.device_list["sensor"]) == 50 * 11
+
+        poller.shared_cache.publish({str(i): device(str(i), 51) for i in range(50)})
+        await reader.get_devices()
+        decoded_after_update = len(reader.data.devices.decoded)
+
+        devices = {str(i): device(str(i), 52) for i in range(50)}
+        devices["new"] = device("new", 52, top=60)
+        devices["0"] = device("0", 52, top=60)
+        poller.shared_cache.publish(devices)
+        await reader.get_devices()
+        decoded_after_discovery = sorted(reader.data.devices.decoded)
+
+        await poller.close()
+        await reader.close()
+        return decoded_after_update, decoded_after_discovery, reader
+
+    decoded_after_update, decoded_after_discovery, reader = asyncio.run(run())
+    assert decoded_after_update == 0
+    assert decoded_after_discovery == ["0", "new"]
+    assert len(reader.device_list["water_heater"]) == 51
+    assert len(reader.device_list["sensor"]) == 51 * 11 + 2
+
+
+def test_reader_polls_count_towards_a_profile(tmp_path):
+    """Shared cache readers finish profiling runs like pollers do."""
+    async def run():
+        poller = OSOEnergy("K")
+        reader = OSOEnergy("K")
+        poller.shared_cache = OSOEnergySharedCache(poller, str(tmp_path / "devices"))
+        reader.shared_cache = OSOEnergySharedCache(reader, str(tmp_path / "devices"))
+        reader.profiler.directory = str(tmp_path)
+        assert poller.shared_cache.is_poller()
+        poller.shared_cache.publish({"1": device("1", 50)})
+
+        reader.profiler.start(cycles=2)
+        for _ in range(2):
+            assert await reader.get_devices()
+
+        await poller.close()
+        await reader.close()
+        return reader.profiler
+
+    profiler = asyncio.run(run())
+    assert not profiler.active
+    assert len(profiler.files) == 1
+
+
+def test_reader_polls_count_towards_an_allocation_trace(tmp_path):
+    """Shared cache readers finish allocation traces like pollers do."""
+    async def run():
+        poller = OSOEnergy("K")
+        reader = OSOEnergy("K")
+        poller.shared_cache = OSOEnergySharedCache(poller, str(tmp_path / "devices"))
+        reader.shared_cache = OSOEnergySharedCache(reader, str(tmp_path / "devices"))
+        assert poller.shared_cache.is_poller()
+        poller.shared_cache.publish({"1": device("1", 50)})
+
+        result = reader.diagnostics.trace(polls=2)
+        for _ in range(2):
+            assert await reader.get_devices()
+        done = result.done()
+
+        await poller.close()
+        await reader.close()
+        return done
+
+    assert asyncio.run(run())
+
+
+def test_reader_keeps_the_previous_snapshot_during_a_write(tmp_path):
+    """A write in progress never blocks the reader's event loop."""
+    async def run():
+        poller = OSOEnergy("K")
+        reader = OSOEnergy("K")
+        poller.shared_cache = OSOEnergySharedCache(poller, str(tmp_path / "devices"))
+        reader.shared_cache = OSOEnergySharedCache(reader, str(tmp_path / "devices"))
+        assert poller.shared_cache.is_poller()
+        poller.shared_cache.publish({"1": device("1", 50)})
+        assert await reader.get_devices()
+        previous = reader.data.devices
+
+        # Leave the generation odd, as a poller does while writing.
+        GENERATION.pack_into(poller.shared_cache.map, GENERATION_OFFSET, poller.shared_cache.generation + 1)
+        started = time.perf_counter()
+        loaded = await reader.get_devices()
+        elapsed = time.perf_counter() - started
+
+        await poller.close()
+        await reader.close()
+        return loaded, reader.data.devices is previous, elapsed
+
+    loaded, kept, elapsed = asyncio.run(run())
+    assert loaded and kept
+    assert elapsed < 0.05
@@ -0,0 +1,73 @@
+"""Tests for the warm start snapshot."""
+
+import asyncio
+
+from apyosoenergyapi import OSOEnergy
+from apyosoenergyapi.benchmark import StandInServer
+
+
+async def save_snapshot(base_url: str, path: str):
+    """Start a session against the stand-in so it writes a snapshot."""
+    session = OSOEnergy("K")
+    session.api.update_base_url(base_url)
+    await session.start_session({"api_key": "K", "snapshot_file": path})
+    await session.close()
+
+
+def test_refresh_clears_stale_on_the_returned_entities(tmp_path):
+    """The entities handed out at warm start are reconciled in place."""
+    path = str(tmp_path / "snapshot.json")
+
+    async def run():
+        server = StandInServer(device_count=2)
+        base_url = await server.start()
+        await save_snapshot(base_url, path)
+
+        session = OSOEnergy("K")
+        session.api.update_base_url(base_url)
+        device_list = await session.start_session({"api_key": "K", "snapshot_file": path})
+        entities = [entity for entities in device_list.values() for entity in entities]
+        stale_before = all(entity.stale for entity in entities)
+        await session.snapshot_task
+        current = [entity for entities in session.device_list.values() for entity in entities]
+        await session.close()
+        await server.stop()
+        return stale_before, entities, current
+
+    stale_before, entities, current = asyncio.run(run())
+    assert stale_before
+    assert [id(entity) for entity in current] == [id(entity) for entity in entities]
+    assert not any(entity.stale for entity in entities)
+
+
+def test_failed_refresh_is_retried(tmp_path):
+    """A warm start whose first refresh fails keeps trying until it succeeds."""
+    path = str(tmp_path / "snapshot.json")
+
+    async def run():
+        server = StandInServer(device_count=1)
+        base_url = await server.start()
+        await save_snapshot(base_url, path)
+
+        session = OSOEnergy("K")
+        session.api.update_base_url(base_url)
+        session.snapshot.retry_interval = 0.01
+        get_devices = session.get_devices
+        calls = []
+
+        async def flaky_get_devices():
+            calls.append(None)
+            if len(calls) == 1:
+                raise ConnectionResetError()
+            return await get_devices()
+
+        session.get_devices = flaky_get_devices
+        device_list = await session.start_session({"api_key": "K", "snapshot_file": path})
+        refreshed = await asyncio.wait_for(session.snapshot_task, 1)
+        await session.close()
+        await server.stop()
+        return refreshed, len(calls), device_list
+
+    refreshed, calls, device_list = asyncio.run(run())
+    assert refreshed and calls == 2
+    assert not device_list["water_heater"][0].stale
@@ -0,0 +1,73 @@
+"""Tests for the holiday mode switch."""
+
+import asyncio
+
+from apyosoenergyapi import OSOEnergy
+from apyosoenergyapi.helper.const import OSOEnergySwitchData
+
+
+def make_session(sent: list, in_power_save: bool) -> OSOEnergy:
+    """Session with one cached heater and a recording holiday mode API."""
+    session = OSOEnergy("K")
+    session.data.devices = {"a": {"deviceId": "a", "isInPowerSave": in_power_save}}
+
+    async def enable_holiday_mode(device_id, start_date, end_date):
+        sent.append(("enable", device_id))
+        session.data.devices = {"a": {"deviceId": "a", "isInPowerSave": True}}
+        return {"original": 200}
+
+    async def disable_holiday_mode(device_id):
+        sent.append(("disable", device_id))
+        session.data.devices = {"a": {"deviceId": "a", "isInPowerSave": False}}
+        return {"original": 200}
+
+    async def get_devices():
+        return True
+
+    session.api.enable_holiday_mode = enable_holiday_mode
+    session.api.disable_holiday_mode = disable_holiday_mode
+    session.get_devices = get_devices
+    return session
+
+
+def switch(device_id: str) -> OSOEnergySwitchData:
+    """Holiday mode switch entity for a heater."""
+    device = OSOEnergySwitchData()
+    device.device_id = device_id
+    return device
+
+
+def test_switch_skips_holiday_mode_commands_already_in_effect():
+    """The switch shares the water heater's no-op checks."""
+    sent = []
+
+    async def run():
+        session = make_session(sent, in_power_save=False)
+        results = [
+            await session.switch.disable_holiday_mode(switch("a")),
+            await session.switch.enable_holiday_mode(switch("a"), 7),
+            await session.switch.enable_holiday_mode(switch("a"), 7),
+        ]
+        await session.close()
+        return results
+
+    assert asyncio.run(run()) == [True, True, True]
+    assert sent == [("enable", "a")]
+
+
+def test_holiday_mode_is_sent_again_for_a_different_period():
+    """Only a holiday mode for the same period is a no-op."""
+    sent = []
+
+    async def run():
+        session = make_session(sent, in_power_save=True)
+        results = [
+            await session.hotwater.enable_holiday_mode(switch("a"), 7),
+            await session.hotwater.enable_holiday_mode(switch("a"), 14),
+            await session.hotwater.enable_holiday_mode(switch("a"), 14),
+        ]
+        await session.close()
+        return results
+
+    assert asyncio.run(run()) == [True, True, True]
+    assert sent == [("enable", "a"), ("enable", "a")]
@@ -0,0 +1,31 @@
+"""Tests for the synchronous client."""
+
+import threading
+
+from apyosoenergyapi.benchmark import StandInServer
+from apyosoenergyapi.sync_client import OSOEnergySyncClient
+
+
+def test_entity_reads_run_on_the_client_loop():
+    """Reads that touch the entity caches never run on the caller's thread."""
+    with OSOEnergySyncClient("K", timeout=5) as client:
+        server = StandInServer(device_count=1)
+        client.session.api.update_base_url(client.call(server.start()))
+        try:
+            assert client.refresh()
+            device_list = client.call(client.session.create_devices())
+            heater = device_list["water_heater"][0]
+
+            threads = []
+            read_water_heater = client.session.hotwater.read_water_heater
+
+            def recording_read(device):
+                threads.append(threading.current_thread())
+                return read_water_heater(device)
+
+            client.session.hotwater.read_water_heater = recording_read
+            assert client.read_water_heater(heater).device_id == heater.device_id
+            assert client.project(heater.device_id, ("v40_min",)) is not None
+            assert threads == [client.thread]
+        finally:
+            client.call(server.stop())